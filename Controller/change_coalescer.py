@@ -0,0 +1,34 @@
+# Controller/change_coalescer.py
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+class ChangeCoalescer(QObject):
+    """
+    รวมการแจ้งเปลี่ยนแปลงข้อมูลที่มาถี่ ๆ ให้เหลือครั้งเดียวต่อเฟรม
+    - push(project_ids) สะสม id ที่เปลี่ยนลงชุดเดียว
+    - เมื่อครบช่วงเวลา (ค่าเริ่มต้น ~1 เฟรมที่ 60Hz) ยิง flushed(list_of_ids) ครั้งเดียว
+    - push ซ้ำระหว่างรอจะไม่เลื่อนเวลาออกไป (กัน starvation ตอนมี pledge ต่อเนื่อง)
+    """
+
+    flushed = pyqtSignal(list)
+
+    def __init__(self, interval_ms: int = 16, parent=None):
+        super().__init__(parent)
+        self._pending: set = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+
+    def push(self, project_ids):
+        self._pending.update(project_ids)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+        if not self._pending:
+            return
+        ids = sorted(self._pending)
+        self._pending.clear()
+        self.flushed.emit(ids)
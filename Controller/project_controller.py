@@ -1,11 +1,19 @@
 # Controller/project_controller.py
-from PyQt5.QtCore import QObject
+from PyQt5.QtCore import QObject, QTimer
 from Model.basic_model import BasicFundingModel
 from Model.stretch_model import StretchGoalFundingModel
+from Model.ranking import SORT_DEADLINE
+from Model.rejection_log import CHECKPOINT_INTERVAL_S
+from Model.detail_composer import DetailComposer
+from Model.workload import TraceRecorder
+from Controller.change_coalescer import ChangeCoalescer
+from Controller.stats_export_worker import StatsExportWorker
+from Controller.responsiveness_monitor import tracked
 
 from dataclasses import dataclass
 from pathlib import Path
 import csv
+import os
 
 
 class ProjectController(QObject):
@@ -15,6 +23,7 @@ class ProjectController(QObject):
       - mode="stretch" → มี Stretch Goals
     รวมระบบ Login แบบง่าย (อ่านจาก Database/users.csv)
     """
+    STATS_SUMMARY_INTERVAL_MS = 500   # รอบอัปเดตสรุปรวม / leaderboard ของหน้าสถิติตอนมีการเปลี่ยนแปลง
     def __init__(self, main_window, mode: str = "basic"):
         super().__init__()
         self._win = main_window
@@ -23,30 +32,74 @@ class ProjectController(QObject):
         # เลือกโมเดลจากโหมด
         self._model = StretchGoalFundingModel() if self._mode == "stretch" else BasicFundingModel()
 
+        # บันทึก trace การใช้งาน (เปิดด้วย FUNDING_TRACE=<ไฟล์>) ไว้ replay ด้วย python -m Model.workload
+        self._trace = TraceRecorder.from_env()
+        if self._trace:
+            self._trace.attach(self._model)
+
+        # วงเงินสนับสนุนรวมต่อผู้ใช้ (เปิดด้วย FUNDING_USER_LIMIT=<บาท>)
+        limit = os.environ.get("FUNDING_USER_LIMIT")
+        if limit:
+            try:
+                self._model.set_user_pledge_limit(limit)
+            except ValueError as e:
+                self._handle_error(f"FUNDING_USER_LIMIT ไม่ถูกต้อง: {e}")
+
         # paths
         self._db_dir = Path("Database")
-        self._project_csv = self._db_dir / "project.csv"
-        self._pledges_csv = self._db_dir / "pledges.csv"
         self._users_csv = self._db_dir / "users.csv"
 
         # session
         self._current_user = None  # dict: {user_id, username, display_name}
 
-        # signals (model → controller)
-        self._model.dataChanged.connect(self.refresh_list)
+        # รายละเอียดโครงการที่ประกอบแล้ว (LRU) — หน้าแรกของประวัติ pledge มาพร้อมกันเลย
+        self._details = DetailComposer(self._model, recent=self._win.project_detail_view.PAGE_SIZE)
+
+        # การเปลี่ยนแปลงที่เกิดตอนหน้ารายการไม่ได้แสดงอยู่ → patch ตอนกลับมาหน้ารายการ
+        self._stale_list_ids = set()
+
+        # signals (model → controller) — รวมการแจ้งเปลี่ยนถี่ ๆ ให้เหลือครั้งเดียวต่อเฟรม
+        self._coalescer = ChangeCoalescer(parent=self)
+        self._model.projectsChanged.connect(self._coalescer.push)
+        self._model.projectsChanged.connect(self._details.invalidate)   # ทิ้ง cache ทันที ไม่รอ coalescer
+        self._coalescer.flushed.connect(self._on_projects_changed)
         self._model.errorOccurred.connect(self._handle_error)
 
         # signals (view → controller)
         self._win.login_view.loginSubmitted.connect(self._on_login_submitted)               # << login
         self._win.project_list_view.openProjectRequested.connect(self._on_open_project)
         self._win.project_list_view.statsRequested.connect(self.show_statistics)
+        self._win.project_list_view.sortModeChanged.connect(lambda _: self._render_list())
+        self._win.project_list_view.projectSelected.connect(self._on_project_selected)
+        self._win.project_list_view.myPledgesRequested.connect(self.show_my_pledges)
         self._win.project_detail_view.backRequested.connect(self._on_back)
+        self._win.project_detail_view.pledgePageRequested.connect(self._on_pledge_page)
         self._win.statistics_view.backRequested.connect(self._on_back)
+        self._win.my_pledges_view.backRequested.connect(self._on_back)
+        self._win.my_pledges_view.pageRequested.connect(self._on_my_pledge_page)
+        self._win.statistics_view.exportRequested.connect(self._on_export_requested)
+        self._win.statistics_view.exportCancelRequested.connect(self._on_export_cancel)
+
+        # export สถิติที่กำลังทำงานอยู่ (มีได้ทีละงาน)
+        self._export_worker = None
+
+        # สรุปรวม + leaderboard ของหน้าสถิติ: ตอนมี pledge ต่อเนื่อง คำนวณใหม่ไม่เกินหนึ่งครั้งต่อรอบ
+        self._stats_summary_timer = QTimer(self)
+        self._stats_summary_timer.setSingleShot(True)
+        self._stats_summary_timer.setInterval(self.STATS_SUMMARY_INTERVAL_MS)
+        self._stats_summary_timer.timeout.connect(self._refresh_statistics_summary)
+
+        # เขียนสถานะค้างของโมเดล (checkpoint ของ rejections) ตามรอบ แม้ช่วงนั้นจะไม่มีเหตุการณ์ใหม่เข้ามา
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(int(CHECKPOINT_INTERVAL_S * 1000))
+        self._flush_timer.timeout.connect(self._model.flush)
+        self._flush_timer.start()
 
         # เริ่มต้นอยู่หน้า Login (index 0)
         self._win._stack.setCurrentIndex(0)
 
     # ---------------- Authentication ----------------
+    @tracked
     def _on_login_submitted(self, username: str, password: str):
         user = self._find_user(username)
         if not user or user.get("password", "") != password:
@@ -79,110 +132,270 @@ class ProjectController(QObject):
         return True
 
     # ---------------- Actions ----------------
+    @tracked
     def refresh_list(self):
         # ต้องล็อกอินก่อนจึงให้เข้าหน้าหลัก
         if not self._require_login():
             return
-        projects = self._model.list_projects()
-        self._win.project_list_view.render_projects(projects)
+        self._render_list()
+        self._stale_list_ids.clear()
         self._win._stack.setCurrentIndex(1)  # list = index 1
+        if self._trace:
+            self._trace.navigate("list")
+
+    @tracked
+    def _on_projects_changed(self, project_ids: list):
+        """อัปเดตเฉพาะหน้าที่มองเห็นอยู่ และเฉพาะแถวของโครงการที่เปลี่ยน"""
+        if self._current_user is None:
+            return
+        ids = set(project_ids)
+        page = self._win._stack.currentIndex()
 
+        if page == 1:
+            self._patch_list(ids)
+        else:
+            self._stale_list_ids |= ids
+
+        if page == 2 and self._win.project_detail_view.current_project_id in ids:
+            view = self._win.project_detail_view
+            current_page = view.current_page
+            detail = self._details.get(view.current_project_id)
+            if detail:
+                view.render_detail(detail)
+                if current_page:
+                    self._on_pledge_page(detail.project.project_id, current_page)
+
+        if page == 3:
+            # สร้างแถวเฉพาะโครงการที่เปลี่ยน; สรุปรวม / leaderboard ต้องไล่ทุกโครงการ จึงอัปเดตตามรอบของตัวเอง
+            view = self._win.statistics_view
+            if not view.update_project_rows(self._statistics_rows(ids)):
+                view.render_project_rows(self._statistics_rows())
+            if not self._stats_summary_timer.isActive():
+                self._stats_summary_timer.start()
+
+        if page == 4:
+            self._render_my_pledges(self._win.my_pledges_view.current_page)
+
+    def _patch_list(self, ids: set):
+        if not ids:
+            return
+        view = self._win.project_list_view
+        mode = view.sort_mode
+        if mode == SORT_DEADLINE:
+            patched = view.update_projects(self._model.get_projects(ids).values())
+        else:
+            # ลำดับ ranking อาจขยับ — ให้ View เขียนเฉพาะแถวที่ย้ายหรือข้อมูลเปลี่ยน
+            patched = view.reorder_projects(self._model.ranked_projects(mode), ids)
+        if not patched:
+            self._render_list()
+
+    def _render_list(self):
+        """วาดตารางรายการใหม่ทั้งตารางตามโหมดเรียงที่เลือก (โหมดอื่นนอกจาก deadline ใช้ลำดับจาก ranking)"""
+        view = self._win.project_list_view
+        mode = view.sort_mode
+        if mode == SORT_DEADLINE:
+            view.render_projects(self._model.list_projects())
+        else:
+            view.render_projects(self._model.ranked_projects(mode), presorted=True)
+
+    @tracked
     def _on_open_project(self, project_id: str):
         if not self._require_login():
             return
-        proj = self._model.get_project(project_id)
-        if not proj:
+        detail = self._details.get(project_id)
+        if not detail:
             return
-        self._win.project_detail_view.render_project(proj)
+        self._win.project_detail_view.render_detail(detail)
         self._win._stack.setCurrentIndex(2)  # detail = index 2
+        if self._trace:
+            self._trace.navigate("detail", project_id)
+
+    @tracked
+    def _on_project_selected(self, project_id: str):
+        # ประกอบรายละเอียดของแถวที่เลือกและแถวข้างเคียงไว้ก่อนใน thread พื้นหลัง
+        self._details.prefetch([project_id] + self._win.project_list_view.neighbor_ids(project_id))
+
+    @tracked
+    def _on_pledge_page(self, project_id: str, page: int):
+        size = self._win.project_detail_view.PAGE_SIZE
+        total = self._model.pledge_count(project_id)
+        page = max(min(page, (total - 1) // size), 0)
+        pledges = self._model.pledges_for_project(project_id, page * size, size)
+        self._win.project_detail_view.render_pledge_page(pledges, page, total)
 
+    @tracked
     def _on_back(self):
         if not self._require_login():
             return
+        self._patch_list(self._stale_list_ids)
+        self._stale_list_ids.clear()
         self._win._stack.setCurrentIndex(1)  # back to list
+        if self._trace:
+            self._trace.navigate("list")
 
     def _handle_error(self, message: str):
         # TODO: ถ้าต้องการ popup: ใช้ QMessageBox.information(self._win, "ผิดพลาด", message)
         print("Error:", message)
 
+    # ---------------- My pledges ----------------
+    @tracked
+    def show_my_pledges(self):
+        if not self._require_login():
+            return
+        self._render_my_pledges(0)
+        self._win._stack.setCurrentIndex(4)  # my pledges = index 4
+
+    @tracked
+    def _on_my_pledge_page(self, page: int):
+        if not self._require_login():
+            return
+        self._render_my_pledges(page)
+
+    def _render_my_pledges(self, page: int):
+        view = self._win.my_pledges_view
+        user_id = self._current_user["user_id"]
+        summary = self._model.user_pledge_summary(user_id)
+        view.render_summary(self._current_user["display_name"], summary)
+        size = view.PAGE_SIZE
+        total = summary.pledge_count
+        page = max(min(page, (total - 1) // size), 0)
+        pledges = self._model.pledges_for_user(user_id, page * size, size)
+        names = {pid: p.name for pid, p in self._model.get_projects({pl.project_id for pl in pledges}).items()}
+        view.render_pledge_page(pledges, page, total, names)
+
     # ---------------- Statistics ----------------
     @dataclass
     class _ProjectRow:
         project_id: str
         name: str
-        goal_amount: float
-        raised_amount: float
+        goal_cents: int
+        raised_cents: int
         funded: bool
+        percent: int          # 0..100 จาก FundingState
         success_count: int
         rejected_count: int
         unlocked_goals: list  # รายการ SG ที่ปลดล็อก (list[str]) — โหมด basic ให้ []
+        rejected_by_reason: dict  # reason code -> จำนวนครั้ง (จาก rejections.log)
 
+    @tracked
     def show_statistics(self):
         if not self._require_login():
             return
+        self._stats_summary_timer.stop()
+        self._win.statistics_view.render(self._statistics_summary(), self._statistics_rows(), self._model.leaderboard())
+        self._win._stack.setCurrentIndex(3)  # statistics = index 3
+        if self._trace:
+            self._trace.navigate("stats")
 
-        # อ่าน projects
-        projects = []
-        total_rejected = 0
-        if self._project_csv.exists():
-            with self._project_csv.open("r", newline="", encoding="utf-8") as f:
-                for r in csv.DictReader(f):
-                    goal = float(r["goal_amount"])
-                    raised = float(r["raised_amount"])
-                    rejected = int(r.get("rejected_count", "0"))
-                    total_rejected += rejected
-                    projects.append({
-                        "project_id": r["project_id"],
-                        "name": r["name"],
-                        "goal_amount": goal,
-                        "raised_amount": raised,
-                        "rejected_count": rejected,
-                        "funded": (raised >= goal),
-                    })
-
-        # นับ pledges สำเร็จต่อโครงการ
-        per_project_success = {p["project_id"]: 0 for p in projects}
-        total_success = 0
-        if self._pledges_csv.exists():
-            with self._pledges_csv.open("r", newline="", encoding="utf-8") as f:
-                for r in csv.DictReader(f):
-                    pid = r["project_id"]
-                    per_project_success[pid] = per_project_success.get(pid, 0) + 1
-                    total_success += 1
-
-        # (เฉพาะ stretch) ดึงรายการ SG ที่ปลดล็อกจากโมเดล
-        unlocked_map = {p["project_id"]: [] for p in projects}
-        if isinstance(self._model, StretchGoalFundingModel):
-            for p in projects:
-                sgs = self._model.unlocked_goals(p["project_id"])  # DTO list
-                labels = []
-                for sg in sgs:
-                    label = getattr(sg, "description", None) or getattr(sg, "sg_id", "")
-                    if label:
-                        labels.append(str(label))
-                unlocked_map[p["project_id"]] = labels
-
-        # จัด row ส่งให้ view
-        per_project_rows = []
-        for p in projects:
-            per_project_rows.append(self._ProjectRow(
-                project_id=p["project_id"],
-                name=p["name"],
-                goal_amount=p["goal_amount"],
-                raised_amount=p["raised_amount"],
-                funded=p["funded"],
-                success_count=per_project_success.get(p["project_id"], 0),
-                rejected_count=p["rejected_count"],
-                unlocked_goals=unlocked_map.get(p["project_id"], []),
-            ))
+    # ---------------- Export ----------------
+    @tracked
+    def _on_export_requested(self, path: str):
+        if not self._require_login() or self._export_worker is not None:
+            return
+        view = self._win.statistics_view
+        worker = StatsExportWorker(self._model, Path(path), self._mode_label(), parent=self)
+        worker.progressed.connect(view.show_export_progress)
+        worker.completed.connect(self._on_export_completed)
+        worker.failed.connect(self._on_export_failed)
+        worker.finished.connect(worker.deleteLater)
+        self._export_worker = worker
+        view.show_export_started(path)
+        worker.start()
+
+    def shutdown(self):
+        """เรียกตอนปิดโปรแกรม: หยุด export ที่ค้างอยู่ (ลบไฟล์ชั่วคราว) รอ thread จบ เขียนสถานะค้างของโมเดลลงดิสก์ แล้วปิดไฟล์ trace"""
+        self._flush_timer.stop()
+        self._stats_summary_timer.stop()
+        if self._export_worker is not None:
+            self._export_worker.cancel()
+            self._export_worker.wait()
+        self._details.shutdown()
+        self._model.flush()
+        if self._trace:
+            self._trace.close()
+
+    def _on_export_cancel(self):
+        if self._export_worker is not None:
+            self._export_worker.cancel()
+            self._win.statistics_view.show_export_cancelling()
 
-        # summary รวม + ป้ายโหมด
-        summary = {
+    def _on_export_completed(self, result):
+        self._export_worker = None
+        if result.cancelled:
+            self._win.statistics_view.show_export_finished("ยกเลิก export แล้ว")
+            return
+        self._win.statistics_view.show_export_finished(
+            f"export {result.rows:,} โครงการ → {result.path.name} ({result.elapsed_s:.1f} s)"
+        )
+
+    def _on_export_failed(self, message: str):
+        self._export_worker = None
+        self._win.statistics_view.show_export_finished(f"export ไม่สำเร็จ: {message}")
+        self._handle_error(message)
+
+    def _refresh_statistics_summary(self):
+        if self._current_user is None or self._win._stack.currentIndex() != 3:
+            return
+        summary = self._statistics_summary()
+        self._win.statistics_view.render_summary(
+            total_projects=summary["total_projects"],
+            total_success_pledges=summary["total_success_pledges"],
+            total_rejected=summary["total_rejected"],
+            mode_label=summary["mode_label"],
+            rejected_by_reason=summary["rejected_by_reason"],
+        )
+        self._win.statistics_view.render_leaderboard(self._model.leaderboard())
+
+    def _statistics_summary(self) -> dict:
+        # อ่านแบบ bulk จากโมเดล — แต่ละไฟล์ถูกอ่านครั้งเดียว ไม่วนอ่านต่อโครงการ
+        projects = self._model.list_projects()
+        total_success = sum(self._model.pledge_counts_by_project().values())
+        total_rejected = sum(p.rejected_count for p in projects)
+        reasons = self._model.rejections_by_reason()
+        total_by_reason = {}
+        for per in reasons.values():
+            for code, n in per.items():
+                total_by_reason[code] = total_by_reason.get(code, 0) + n
+        # pledge ที่อ้าง project_id ที่ไม่มีอยู่จริงก็นับเป็นการปฏิเสธด้วย
+        known = {p.project_id for p in projects}
+        total_rejected += sum(sum(per.values()) for pid, per in reasons.items() if pid not in known)
+        return {
             "total_projects": len(projects),
             "total_success_pledges": total_success,
             "total_rejected": total_rejected,
-            "mode_label": "Stretch" if isinstance(self._model, StretchGoalFundingModel) else "Basic",
+            "rejected_by_reason": total_by_reason,
+            "mode_label": self._mode_label(),
         }
 
-        self._win.statistics_view.render(summary, per_project_rows)
-        self._win._stack.setCurrentIndex(3)  # statistics = index 3
+    def _statistics_rows(self, project_ids=None) -> list:
+        """แถวต่อโครงการของหน้าสถิติ — ทุกโครงการ หรือเฉพาะ project_ids (รหัสที่ไม่มีอยู่จริงถูกข้าม)"""
+        if project_ids is None:
+            projects = self._model.list_projects()
+            counts = self._model.pledge_counts_by_project()
+            reasons = self._model.rejections_by_reason()
+        else:
+            projects = list(self._model.get_projects(project_ids).values())
+            counts = {p.project_id: self._model.pledge_count(p.project_id) for p in projects}
+            reasons = self._model.rejections_by_reason(counts)
+
+        # funded / % / SG ที่ปลดล็อก มาจาก FundingState ที่โมเดลคำนวณไว้แล้ว (ไม่คำนวณซ้ำที่นี่)
+        states = self._model.funding_states()
+        rows = []
+        for p in projects:
+            state = states.get(p.project_id)
+            rows.append(self._ProjectRow(
+                project_id=p.project_id,
+                name=p.name,
+                goal_cents=p.goal_cents,
+                raised_cents=p.raised_cents,
+                funded=state.funded if state else False,
+                percent=state.percent if state else 0,
+                success_count=counts.get(p.project_id, 0),
+                rejected_count=p.rejected_count,
+                unlocked_goals=list(state.unlocked_goals) if state else [],
+                rejected_by_reason=reasons.get(p.project_id, {}),
+            ))
+        return rows
+
+    def _mode_label(self) -> str:
+        return "Stretch" if isinstance(self._model, StretchGoalFundingModel) else "Basic"
@@ -0,0 +1,165 @@
+# Controller/responsiveness_monitor.py
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+import functools
+import sys
+import threading
+import time
+import traceback
+
+_active = None   # ResponsivenessMonitor ที่ติดตั้งอยู่ (มีได้ตัวเดียวต่อโปรแกรม)
+
+IDLE_ACTION = "(ไม่มี action)"
+
+
+def tracked(fn):
+    """
+    decorator สำหรับเมธอดของ controller: ระหว่างที่เมธอดทำงาน stall ที่เกิดขึ้นจะถูกผูกกับชื่อเมธอดนั้น
+    ถ้าไม่ได้เปิด monitor จะเรียกเมธอดตรง ๆ (ค่าใช้จ่ายแค่เช็ก None)
+    """
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        monitor = _active
+        if monitor is None:
+            return fn(*args, **kwargs)
+        with monitor.track(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+class StallRecord:
+    def __init__(self, when: datetime, duration_ms: float, action: str, stack: str):
+        self.when = when
+        self.duration_ms = duration_ms
+        self.action = action
+        self.stack = stack
+
+
+class ResponsivenessMonitor(QObject):
+    """
+    วัดการค้างของ event loop ของ Qt
+    - heartbeat: QTimer ใน GUI thread ยิงทุก interval_ms แล้วจดเวลาล่าสุด
+    - watchdog: thread แยกคอยดูว่า heartbeat ขาดไปนานเกิน threshold_ms หรือไม่
+      ถ้าเกิน จะจับ Python stack ของ GUI thread (sys._current_frames) ขณะที่ยังค้างอยู่
+    - พอ heartbeat กลับมา บันทึกระยะเวลาที่ค้าง + action ของ controller ที่กำลังทำ (จาก track/tracked)
+      ลงไฟล์ log และยิง stallDetected ให้ overlay
+    """
+
+    stallDetected = pyqtSignal(object)   # StallRecord
+
+    def __init__(self, log_path: Path = Path("responsiveness.log"), threshold_ms: int = 200, interval_ms: int = 50, parent=None):
+        super().__init__(parent)
+        self._log_path = log_path
+        self._threshold_s = threshold_ms / 1000
+        self._interval_s = interval_ms / 1000
+        self._gui_ident = threading.get_ident()
+        self._lock = threading.Lock()
+        self._actions: list = []          # action ที่ซ้อนกันอยู่ (ในสุดอยู่ท้าย)
+        self._last_beat = time.monotonic()
+        self._captured = None             # (action, stack) ที่ watchdog จับได้ระหว่างค้างรอบนี้
+        self._stop = threading.Event()
+        self._watchdog = None
+
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.by_action: dict = {}         # action -> (จำนวนครั้ง, รวม ms)
+        self.recent: list = []            # StallRecord ล่าสุดไม่เกิน 20 รายการ
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._beat)
+
+    # ---------------- Lifecycle ----------------
+    def start(self):
+        global _active
+        _active = self
+        self._last_beat = time.monotonic()
+        self._timer.start()
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="ui-watchdog", daemon=True)
+        self._watchdog.start()
+        self._log(f"{datetime.now().isoformat(timespec='seconds')} เริ่มเฝ้าดู (threshold {self._threshold_s * 1000:.0f} ms)")
+
+    def stop(self):
+        global _active
+        self._timer.stop()
+        self._stop.set()
+        if _active is self:
+            _active = None
+        lines = [f"{datetime.now().isoformat(timespec='seconds')} สรุป: ค้าง {self.count} ครั้ง "
+                 f"รวม {self.total_ms:.0f} ms สูงสุด {self.max_ms:.0f} ms"]
+        for action, (n, ms) in sorted(self.by_action.items(), key=lambda kv: -kv[1][1]):
+            lines.append(f"    {action}: {n} ครั้ง รวม {ms:.0f} ms")
+        self._log("\n".join(lines))
+
+    # ---------------- Action tracking ----------------
+    @contextmanager
+    def track(self, action: str):
+        with self._lock:
+            self._actions.append(action)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._actions.pop()
+
+    def _current_action(self) -> str:
+        with self._lock:
+            return " > ".join(self._actions) if self._actions else IDLE_ACTION
+
+    # ---------------- Heartbeat (GUI thread) ----------------
+    def _beat(self):
+        now = time.monotonic()
+        gap = now - self._last_beat
+        self._last_beat = now
+        with self._lock:
+            captured, self._captured = self._captured, None
+        if captured is None and gap < self._threshold_s + self._interval_s:
+            return
+        action, stack = captured or (IDLE_ACTION, "")
+        self._record(StallRecord(datetime.now(), max(gap - self._interval_s, 0.0) * 1000, action, stack))
+
+    def _record(self, stall: StallRecord):
+        self.count += 1
+        self.total_ms += stall.duration_ms
+        self.max_ms = max(self.max_ms, stall.duration_ms)
+        n, ms = self.by_action.get(stall.action, (0, 0.0))
+        self.by_action[stall.action] = (n + 1, ms + stall.duration_ms)
+        self.recent = (self.recent + [stall])[-20:]
+        self._log(f"{stall.when.isoformat(timespec='seconds')} ค้าง {stall.duration_ms:.0f} ms action={stall.action}\n"
+                  + "".join(f"    {line}\n" for line in stall.stack.rstrip().splitlines()))
+        self.stallDetected.emit(stall)
+
+    # ---------------- Watchdog (thread แยก) ----------------
+    def _watch(self):
+        while not self._stop.wait(self._interval_s):
+            if time.monotonic() - self._last_beat < self._threshold_s:
+                continue
+            with self._lock:
+                if self._captured is not None:
+                    continue   # จับไปแล้วสำหรับการค้างรอบนี้
+            frame = sys._current_frames().get(self._gui_ident)
+            stack = "".join(traceback.format_stack(frame)) if frame is not None else ""
+            action = self._current_action()
+            with self._lock:
+                if self._captured is None:
+                    self._captured = (action, stack)
+
+    def attach_overlay(self, overlay):
+        """ต่อ overlay (View.diagnostics_overlay.DiagnosticsOverlay) ให้อัปเดตทุกครั้งที่พบการค้าง"""
+        self.stallDetected.connect(lambda _stall: overlay.update_stats(
+            count=self.count, total_ms=self.total_ms, max_ms=self.max_ms,
+            by_action=self.by_action, recent=self.recent,
+        ))
+
+    def _log(self, text: str):
+        try:
+            with self._log_path.open("a", encoding="utf-8") as f:
+                f.write(text.rstrip("\n") + "\n")
+        except OSError:
+            pass
@@ -0,0 +1,40 @@
+# Controller/stats_export_worker.py
+from PyQt5.QtCore import QThread, pyqtSignal
+from pathlib import Path
+import threading
+
+from Model.stats_export import export_statistics
+
+
+class StatsExportWorker(QThread):
+    """
+    รัน Model.stats_export.export_statistics ใน thread แยก (GUI ไม่ค้างระหว่างเขียนไฟล์ใหญ่)
+    - progressed(done, total) ทุก chunk → ต่อเข้ากับ progress bar ของ StatisticsView
+    - cancel() ขอหยุด: ตัว export เช็กระหว่าง chunk แล้วลบไฟล์ชั่วคราวทิ้ง (completed ยังถูกยิงพร้อม cancelled=True)
+    signal ข้าม thread ไปหา slot ใน GUI thread เป็น queued connection อัตโนมัติ
+    """
+
+    progressed = pyqtSignal(int, int)
+    completed = pyqtSignal(object)   # ExportResult
+    failed = pyqtSignal(str)
+
+    def __init__(self, model, path: Path, mode_label: str, parent=None):
+        super().__init__(parent)
+        self._model = model
+        self._path = path
+        self._mode_label = mode_label
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            result = export_statistics(
+                self._model, self._path, mode_label=self._mode_label,
+                progress=self.progressed.emit, cancelled=self._cancel.is_set,
+            )
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        self.completed.emit(result)
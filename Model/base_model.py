@@ -0,0 +1,519 @@
+# Model/base_model.py
+from __future__ import annotations
+from typing import Dict, List, Mapping, Optional, Iterable
+from datetime import date, datetime, timedelta
+import csv
+import os
+import threading
+from pathlib import Path
+from PyQt5.QtCore import QObject, pyqtSignal
+from Model.csv_io import append_rows
+from Model.bulk_import import PROJECT_HEADERS, TIER_HEADERS, validate_batch, write_batch, recover_batch
+from Model.csv_loader import gc_paused, read_tuples
+from Model.money import Amount, to_cents, parse_cents, format_cents
+from Model.pledge_store import PLEDGE_HEADERS, PledgeStore, PledgeRecord, ClaimedTier, UserPledgeSummary
+from Model.funding_state import FundingState
+from Model.snapshot import FundingSnapshot, RewardTierDTO, replace_dto
+from Model.ranking import RankingEngine, WINDOWS, SORT_DEADLINE
+from Model.state_cache import StateCache, rows_codec
+from Model.rejection_log import (
+    RejectionLog, PledgeRejected, REASON_EXPIRED, REASON_BELOW_MINIMUM,
+    REASON_QUOTA_FULL, REASON_UNKNOWN_PROJECT, REASON_UNKNOWN_TIER, REASON_INVALID_AMOUNT, REASON_USER_LIMIT,
+)
+
+# --- โครงสร้างข้อมูลแบบเบา ๆ สำหรับ View/Controller ใช้ ---
+class ProjectDTO:
+    def __init__(self, project_id: str, name: str, goal_cents: int, deadline: date, raised_cents: int, rejected_count: int):
+        self.project_id = project_id
+        self.name = name
+        self.goal_cents = goal_cents        # จำนวนเงินทั้งหมดเป็นสตางค์ (int) ดู Model/money.py
+        self.deadline = deadline
+        self.raised_cents = raised_cents
+        self.rejected_count = rejected_count
+
+    # หน่วยบาทแบบ float ไว้แสดงผลเท่านั้น — คำนวณ/เปรียบเทียบให้ใช้ *_cents
+    @property
+    def goal_amount(self) -> float:
+        return self.goal_cents / 100
+
+    @property
+    def raised_amount(self) -> float:
+        return self.raised_cents / 100
+
+
+# รูปแถวของตารางใน StateCache (เปลี่ยนเมื่อไรต้องเพิ่ม FORMAT_VERSION ใน Model/state_cache.py)
+PROJECT_CODEC = rows_codec(
+    lambda p: [p.project_id, p.name, p.goal_cents, p.deadline.isoformat(), p.raised_cents, p.rejected_count],
+    lambda r: ProjectDTO(r[0], r[1], int(r[2]), date.fromisoformat(r[3]), int(r[4]), int(r[5])),
+    key="project_id",
+)
+TIER_CODEC = rows_codec(
+    lambda t: [t.project_id, t.tier_id, t.title, t.minimum_cents, t.quota_left],
+    lambda r: RewardTierDTO(r[0], r[1], r[2], int(r[3]), int(r[4])),
+    key="project_id", grouped=True,
+)
+
+
+class FundingModelBase(QObject):
+    """
+    ส่วนที่โมเดลทั้งสองโหมดใช้ร่วมกัน (snapshot, pledge, นำเข้า, ranking, การอ่าน/เขียน CSV)
+    คลาสลูกกำหนด:
+      MODE         : "basic" / "stretch" — คำนำหน้าชื่อตารางใน StateCache
+      WITH_GOALS   : มี Stretch Goal หรือไม่ (ใช้ตอนนำเข้าแบบกลุ่ม)
+      CSV_HEADERS  : ไฟล์ที่ต้องมี + header
+      _load_goals() / _goals_after_raise() / _imported_goals() : จุดต่อของ Stretch Goal (โหมด basic ไม่มี)
+    """
+
+    dataChanged = pyqtSignal()
+    projectsChanged = pyqtSignal(list)   # list[project_id] ที่ได้รับผลกระทบ
+    errorOccurred = pyqtSignal(str)
+    pledgeRejected = pyqtSignal(str, str)   # (project_id, reason code)
+
+    MODE = "basic"
+    WITH_GOALS = False
+    CSV_HEADERS: Dict[str, List[str]] = {
+        "project.csv": PROJECT_HEADERS,
+        "reward_tiers.csv": TIER_HEADERS,
+        "pledges.csv": PLEDGE_HEADERS,
+    }
+
+    def __init__(self, db_dir: Path = Path("Database")):
+        super().__init__()
+        self.db_dir = db_dir
+        # การนำเข้าที่ commit แล้วแต่สลับไฟล์ไม่ครบ (โปรแกรมตายกลางคัน) → ทำต่อให้ครบก่อนอ่านอะไร
+        recover_batch(db_dir)
+        # ตารางที่ parse แล้วจากการเปิดโปรแกรมครั้งก่อน — ไฟล์ไหนไม่เปลี่ยนก็ไม่ต้องอ่าน CSV นั้นอีก
+        self._cache = StateCache(db_dir)
+        self._ensure_headers()
+        self._rejections = RejectionLog(db_dir)
+        self._pledges = PledgeStore(db_dir, cache=self._cache)
+        # ผู้เขียนต้องถือ _write_lock; ผู้อ่านแค่หยิบ self._snapshot (สลับทั้งก้อนแบบ copy-on-write)
+        self._write_lock = threading.Lock()
+        with gc_paused():
+            self._snapshot = self._load_snapshot()
+        self._ranking: Optional[RankingEngine] = None   # seed ตอนถูกถามครั้งแรก (ต้องอ่านประวัติ pledge)
+        self._user_limit_cents: Optional[int] = None      # วงเงินรวมต่อผู้ใช้ (None = ไม่จำกัด)
+        self._cache.save()
+
+    # ---------------- CSV helpers ----------------
+    def _p(self, name: str) -> Path: return self.db_dir / name
+
+    def _notify(self, *project_ids: str):
+        self.dataChanged.emit()
+        self.projectsChanged.emit(list(project_ids))
+
+    def _ensure_headers(self):
+        for fname, headers in self.CSV_HEADERS.items():
+            p = self._p(fname)
+            if not p.exists():
+                with p.open("w", newline="", encoding="utf-8") as f:
+                    csv.DictWriter(f, fieldnames=headers).writeheader()
+        if not self._cache.is_fresh(f"{self.MODE}/projects", self._p("project.csv")):
+            self._upgrade_project_header()
+
+    def _upgrade_project_header(self):
+        # project.csv รุ่นเก่าไม่มีคอลัมน์ rejected_count → เติมให้ครั้งเดียว
+        # (ไม่งั้นแถวที่ create_project ต่อท้ายมีช่องเกิน header แล้ว _write_all ครั้งถัดไปจะล้มกลางไฟล์)
+        pf = self._p("project.csv")
+        with pf.open("r", newline="", encoding="utf-8") as f:
+            header = next(csv.reader(f), [])
+        if "rejected_count" in header:
+            return
+        rows = self._read_all("project.csv")
+        for r in rows:
+            r["rejected_count"] = "0"
+        self._write_all("project.csv", rows, PROJECT_HEADERS)
+
+    # ---------------- Validation ----------------
+    @staticmethod
+    def _validate_project_id(project_id: str):
+        if len(project_id) != 8 or not project_id.isdigit() or project_id[0] == "0":
+            raise ValueError("รหัสโครงการต้องเป็นตัวเลข 8 หลัก และตัวแรกห้ามเป็น 0")
+
+    @staticmethod
+    def _validate_goal(goal_cents: int):
+        if goal_cents <= 0:
+            raise ValueError("เป้าหมายยอดระดมทุนหลักต้องมากกว่า 0")
+
+    @staticmethod
+    def _validate_deadline_future(deadline: date):
+        if deadline <= date.today():
+            raise ValueError("วันสิ้นสุดต้องอยู่ในอนาคต")
+
+    # ---------------- CRUD/ops ----------------
+    def create_project(self, project_id: str, name: str, goal_amount: Amount, deadline: date):
+        try:
+            self._validate_project_id(project_id)
+            goal_cents = to_cents(goal_amount)
+            self._validate_goal(goal_cents)
+            self._validate_deadline_future(deadline)
+            with self._write_lock:
+                snap = self._snapshot
+                if project_id in snap.projects:
+                    raise ValueError("มีรหัสโครงการนี้อยู่แล้ว")
+
+                append_rows(self._p("project.csv"), PROJECT_HEADERS, [{
+                    "project_id": project_id,
+                    "name": name.strip(),
+                    "goal_amount": format_cents(goal_cents),
+                    "deadline": deadline.isoformat(),
+                    "raised_amount": format_cents(0),
+                    "rejected_count": "0",
+                }])
+                self._snapshot = snap.evolve(projects={project_id: ProjectDTO(
+                    project_id, name.strip(), goal_cents, deadline, 0, 0,
+                )})
+                if self._ranking is not None:
+                    self._ranking.set_raised(project_id, 0)
+            self._notify(project_id)
+        except Exception as e:
+            self.errorOccurred.emit(str(e))
+
+    def import_projects(self, records: Iterable[dict]) -> int:
+        """
+        นำเข้าโครงการหลายรายการพร้อม tier (และ Stretch Goal ในโหมด stretch) — รูปแบบดู Model/bulk_import.py
+        ตรวจทั้งชุดก่อน — มีปัญหาแม้แต่แถวเดียวจะไม่เขียนอะไรเลย; ผ่านแล้วเขียนทุกไฟล์ในครั้งเดียวแล้วสลับ snapshot ครั้งเดียว
+        คืนจำนวนโครงการที่นำเข้า (0 ถ้าไม่สำเร็จ — ข้อความอยู่ใน errorOccurred)
+        """
+        try:
+            with self._write_lock, gc_paused():
+                snap = self._snapshot
+                batch = validate_batch(records, snap.projects, with_goals=self.WITH_GOALS)
+                if not batch:
+                    return 0
+                write_batch(self.db_dir, batch, with_goals=self.WITH_GOALS)
+
+                projects = {p.project_id: ProjectDTO(p.project_id, p.name, p.goal_cents, p.deadline, 0, 0) for p in batch}
+                tiers = {p.project_id: p.tiers for p in batch if p.tiers}
+                self._snapshot = snap.evolve(projects=projects, tiers=tiers, goals=self._imported_goals(batch))
+                if self._ranking is not None:
+                    for pid in projects:
+                        self._ranking.set_raised(pid, 0)
+            self._notify(*projects)
+            return len(projects)
+        except Exception as e:
+            self.errorOccurred.emit(str(e))
+            return 0
+
+    def add_pledge(self, pledge_id: str, user_id: str, project_id: str, amount: Amount, when: Optional[datetime] = None, reward_tier_id: Optional[str] = None):
+        try:
+            with self._write_lock:
+                snap = self._snapshot
+                proj = snap.projects.get(project_id)
+                if proj is None:
+                    raise PledgeRejected(REASON_UNKNOWN_PROJECT, "ไม่พบโครงการ")
+
+                now_dt = when or datetime.now()
+                if now_dt.date() > proj.deadline:
+                    raise PledgeRejected(REASON_EXPIRED, "โครงการนี้หมดเขตระดมทุนแล้ว")
+                try:
+                    amount_cents = to_cents(amount)
+                except (ValueError, ArithmeticError):
+                    raise PledgeRejected(REASON_INVALID_AMOUNT, "จำนวนเงินไม่ถูกต้อง")
+                if amount_cents <= 0:
+                    raise PledgeRejected(REASON_INVALID_AMOUNT, "จำนวนเงินต้องมากกว่า 0")
+                if self._user_limit_cents is not None and \
+                        self._pledges.user_total_cents(user_id) + amount_cents > self._user_limit_cents:
+                    raise PledgeRejected(REASON_USER_LIMIT, "ยอดสนับสนุนรวมของผู้ใช้นี้เกินวงเงินที่กำหนด")
+
+                tier = None
+                if reward_tier_id:
+                    tier = self._get_tier(snap, project_id, reward_tier_id)
+                    if tier is None:
+                        raise PledgeRejected(REASON_UNKNOWN_TIER, "ไม่พบ Reward Tier ที่เลือก")
+                    if amount_cents < tier.minimum_cents:
+                        raise PledgeRejected(REASON_BELOW_MINIMUM, "จำนวนเงินไม่ถึงขั้นต่ำของรางวัลนี้")
+                    if tier.quota_left <= 0:
+                        raise PledgeRejected(REASON_QUOTA_FULL, "รางวัลนี้เต็มแล้ว")
+
+                # บันทึก pledge
+                offset = self._pledges.append({
+                    "pledge_id": pledge_id,
+                    "user_id": user_id,
+                    "project_id": project_id,
+                    "amount": format_cents(amount_cents),
+                    "created_at": now_dt.isoformat(timespec="seconds"),
+                    "reward_tier_id": reward_tier_id or "",
+                })
+
+                new_raised = proj.raised_cents + amount_cents
+                try:
+                    # อัปเดตยอดรวม
+                    self._update_project_amount(project_id, new_raised)
+                    changes = {
+                        "projects": {project_id: replace_dto(proj, raised_cents=new_raised)},
+                        "pledge_counts": {project_id: snap.pledge_counts.get(project_id, 0) + 1},
+                    }
+
+                    # ลดโควตา
+                    if tier is not None:
+                        self._update_tier_quota(project_id, reward_tier_id, tier.quota_left - 1)
+                        changes["tiers"] = {project_id: [
+                            replace_dto(t, quota_left=t.quota_left - 1) if t is tier else t
+                            for t in snap.tiers[project_id]
+                        ]}
+
+                    # Stretch Goal ที่สถานะเปลี่ยนตามยอดใหม่ (โหมด basic ไม่มี)
+                    new_goals = self._goals_after_raise(snap, project_id, new_raised)
+                    if new_goals is not None:
+                        changes["goals"] = {project_id: new_goals}
+                except Exception:
+                    # เขียนไฟล์ใดไม่สำเร็จ (ไฟล์นั้นยังเป็นของเดิม ดู _write_all) → ถอน pledge ที่เพิ่งต่อท้าย
+                    # และคืนยอด/โควตาเดิม ให้ทุกไฟล์ตรงกับ snapshot ที่ยังไม่ได้สลับ
+                    self._pledges.undo_append(offset)
+                    self._update_project_amount(project_id, proj.raised_cents)
+                    if tier is not None:
+                        self._update_tier_quota(project_id, reward_tier_id, tier.quota_left)
+                    raise
+
+                # ไฟล์เขียนครบแล้วค่อยสลับ snapshot → ผู้อ่านเห็นทั้ง pledge ยอด และ SG ใหม่พร้อมกัน
+                self._snapshot = snap.evolve(**changes)
+                if self._ranking is not None:
+                    self._ranking.record_pledge(project_id, amount_cents, new_raised, now_dt)
+
+            self._notify(project_id)
+
+        except PledgeRejected as e:
+            # บันทึกเหตุการณ์ปฏิเสธ (append) แทนการเขียน project.csv ใหม่ทั้งไฟล์
+            self._record_rejection(project_id, e)
+            self.errorOccurred.emit(str(e))
+        except Exception as e:
+            # ระบบผิดพลาด (เช่นเขียนไฟล์ไม่ได้) ไม่ใช่การปฏิเสธ pledge → แจ้งอย่างเดียว ไม่นับเป็น rejection
+            self.errorOccurred.emit(str(e))
+
+    # ---------------- Queries (อ่านจาก snapshot — ไม่มี file I/O ไม่ต้องล็อก) ----------------
+    def snapshot(self) -> FundingSnapshot:
+        return self._snapshot
+
+    def reload(self):
+        """อ่าน CSV ใหม่ทั้งหมด (ใช้เมื่อไฟล์ถูกแก้จากภายนอกโปรแกรม)"""
+        with self._write_lock, gc_paused():
+            self._snapshot = self._load_snapshot()
+            self._ranking = None
+        self._cache.save()
+        self._notify(*self._snapshot.projects.keys())
+
+    def flush(self):
+        """เขียนสถานะที่ยังค้างในหน่วยความจำลงดิสก์ (checkpoint ของ rejections + ดัชนี pledge ใน cache) — เรียกตามรอบเวลาและตอนปิดโปรแกรม"""
+        self._rejections.flush()
+        self._pledges.save_index()
+        self._cache.save()
+
+    def list_projects(self) -> List[ProjectDTO]:
+        return list(self._snapshot.projects.values())
+
+    def get_project(self, project_id: str) -> Optional[ProjectDTO]:
+        return self._snapshot.projects.get(project_id)
+
+    # ---------------- Bulk queries ----------------
+    def get_projects(self, project_ids: Iterable[str]) -> Dict[str, ProjectDTO]:
+        projects = self._snapshot.projects
+        return {pid: projects[pid] for pid in project_ids if pid in projects}
+
+    def tiers_by_project(self) -> Dict[str, List[RewardTierDTO]]:
+        return {pid: list(ts) for pid, ts in self._snapshot.tiers.items()}
+
+    def pledge_counts_by_project(self) -> Dict[str, int]:
+        return dict(self._snapshot.pledge_counts)
+
+    # ---------------- Pledge history (อ่านเฉพาะแถวของโครงการผ่านดัชนี) ----------------
+    def pledge_count(self, project_id: str) -> int:
+        return self._snapshot.pledge_counts.get(project_id, 0)
+
+    def pledges_for_project(self, project_id: str, start: int = 0, limit: int = 20) -> List[PledgeRecord]:
+        """pledge ของโครงการ เรียงใหม่ → เก่า เริ่มที่ลำดับ start จำนวนไม่เกิน limit"""
+        return self._pledges.read_project(project_id, start, limit)
+
+    # ---------------- Pledges รายผู้ใช้ (ผ่านดัชนี user_id ของ PledgeStore) ----------------
+    def set_user_pledge_limit(self, amount: Optional[Amount]):
+        """
+        วงเงินสนับสนุนรวมต่อผู้ใช้ (ทุกโครงการรวมกัน) — เกินแล้ว add_pledge ปฏิเสธด้วย REASON_USER_LIMIT; None = ไม่จำกัด
+        สร้างดัชนีรายผู้ใช้ไว้ก่อนเลย: add_pledge เช็กวงเงินขณะถือ _write_lock จึงต้องเป็นแค่การเปิด dict
+        """
+        limit = None if amount is None else to_cents(amount)
+        if limit is not None:
+            self._pledges.load_user_index()
+        self._user_limit_cents = limit
+
+    def user_pledge_summary(self, user_id: str) -> UserPledgeSummary:
+        """ยอดรวม / จำนวน pledge / รางวัลที่ได้ ของผู้ใช้ (ยอดรวมตัวเดียวกับที่ add_pledge ใช้เช็กวงเงิน)"""
+        snap = self._snapshot
+        claims = self._pledges.user_claims(user_id)
+        claimed = []
+        for (pid, tier_id), n in sorted(claims.items()):
+            if not tier_id:
+                continue
+            proj = snap.projects.get(pid)
+            tier = self._get_tier(snap, pid, tier_id)
+            claimed.append(ClaimedTier(pid, proj.name if proj else pid, tier_id, tier.title if tier else tier_id, n))
+        return UserPledgeSummary(
+            pledge_count=self._pledges.user_count(user_id),
+            total_cents=self._pledges.user_total_cents(user_id),
+            projects_backed=len({pid for pid, _ in claims}),
+            claimed_tiers=claimed,
+        )
+
+    def pledges_for_user(self, user_id: str, start: int = 0, limit: int = 20) -> List[PledgeRecord]:
+        """pledge ของผู้ใช้ เรียงใหม่ → เก่า เริ่มที่ลำดับ start จำนวนไม่เกิน limit"""
+        return self._pledges.read_user(user_id, start, limit)
+
+    # ---------------- Funding state (คำนวณไว้ใน snapshot) ----------------
+    def funding_state(self, project_id: str) -> Optional[FundingState]:
+        """สถานะการระดมทุนที่คำนวณไว้แล้วใน snapshot (funded / % / SG ถัดไป / tier ที่เหลือ) — O(1)"""
+        return self._snapshot.funding.get(project_id)
+
+    def funding_states(self) -> Mapping[str, FundingState]:
+        return self._snapshot.funding
+
+    def is_funded(self, project_id: str) -> bool:
+        state = self.funding_state(project_id)
+        if state is None:
+            raise ValueError("ไม่พบโครงการ")
+        return state.funded
+
+    # ---------------- Ranking ----------------
+    def ranked_projects(self, mode: str = SORT_DEADLINE) -> List[ProjectDTO]:
+        """โครงการทั้งหมดเรียงตามโหมด (ดู Model.ranking.SORT_*)"""
+        return self._ranking_engine().order(mode, self.list_projects())
+
+    def leaderboard(self, n: int = 5) -> Dict[str, List[tuple]]:
+        """โหมด -> [(ProjectDTO, ค่า)] top-N ของแต่ละหมวด"""
+        projects = self._snapshot.projects
+        return {
+            mode: [(projects[pid], value) for pid, value in ranked if pid in projects]
+            for mode, ranked in self._ranking_engine().leaderboard(list(projects.values()), n).items()
+        }
+
+    def _ranking_engine(self) -> RankingEngine:
+        if self._ranking is None:
+            with self._write_lock:
+                if self._ranking is None:
+                    self._ranking = self._seed_ranking(self._snapshot)
+        return self._ranking
+
+    def rejections_by_reason(self, project_ids: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, int]]:
+        """project_id -> {reason code -> จำนวนครั้ง} (นับจาก rejections.log) — ส่ง project_ids มาถ้าต้องการเฉพาะบางโครงการ"""
+        if project_ids is None:
+            return self._rejections.by_project()
+        return {pid: self._rejections.by_reason(pid) for pid in project_ids}
+
+    # ---------------- Stretch Goal hooks (โหมด basic ไม่มี SG) ----------------
+    def _load_goals(self) -> dict:
+        """project_id -> [StretchGoalDTO] สำหรับ snapshot ตอนโหลด"""
+        return {}
+
+    def _goals_after_raise(self, snap: FundingSnapshot, project_id: str, raised_cents: int) -> Optional[list]:
+        """ถูกเรียกใต้ _write_lock หลังยอดของโครงการเปลี่ยน — คืน SG ชุดใหม่ หรือ None ถ้าไม่มีอะไรเปลี่ยน"""
+        return None
+
+    def _imported_goals(self, batch) -> dict:
+        """project_id -> [StretchGoalDTO] ของโครงการที่เพิ่งนำเข้า"""
+        return {}
+
+    # ---------------- Internal CSV ops ----------------
+    def _seed_ranking(self, snap: FundingSnapshot) -> RankingEngine:
+        # อ่านเฉพาะ pledge ที่ยังอยู่ในหน้าต่างเวลายาวสุด ผ่านดัชนีต่อโครงการ (ไม่สแกนทั้งไฟล์)
+        since = datetime.now() - timedelta(seconds=max(w for w, _ in WINDOWS.values()))
+        ranking = RankingEngine()
+        ranking.seed(snap.projects.values(), (
+            (rec.project_id, rec.amount_cents, datetime.fromisoformat(rec.created_at))
+            for rec in self._pledges.iter_since(snap.projects, since)
+        ))
+        return ranking
+
+    def _load_snapshot(self) -> FundingSnapshot:
+        # แต่ละตารางมาจาก cache ถ้าไฟล์ต้นทางไม่เปลี่ยน ไม่งั้น parse CSV นั้นใหม่ (แยกกันต่อตาราง)
+        # ชื่อตารางขึ้นต้นด้วยโหมด — สองโหมดเปิด Database เดียวกันสลับกันได้โดยไม่ทับ cache ของกันและกัน
+        parsed = self._cache.load(f"{self.MODE}/projects", self._p("project.csv"), self._parse_projects, PROJECT_CODEC)
+        tiers = self._cache.load(f"{self.MODE}/reward_tiers", self._p("reward_tiers.csv"), self._parse_tiers, TIER_CODEC)
+        goals = self._load_goals()
+        # rejected_count ใน cache คือค่าจากคอลัมน์เดิมใน CSV; บวกยอดจาก rejections.log ทีหลัง
+        projects: Dict[str, ProjectDTO] = {}
+        for pid, p in parsed.items():
+            logged = self._rejections.count(pid)
+            projects[pid] = replace_dto(p, rejected_count=p.rejected_count + logged) if logged else p
+        return FundingSnapshot.build(projects=projects, tiers=tiers, goals=goals, pledge_counts=self._pledges.counts())
+
+    def _parse_projects(self) -> Dict[str, ProjectDTO]:
+        # อ่านแบบ tuple ตามตำแหน่งคอลัมน์ (ไม่สร้าง dict ต่อแถว)
+        header, rows = read_tuples(self._p("project.csv"))
+        pid_i, name_i, goal_i, dl_i, raised_i = (header.index(c) for c in ("project_id","name","goal_amount","deadline","raised_amount"))
+        rej_i = header.index("rejected_count") if "rejected_count" in header else None
+        projects: Dict[str, ProjectDTO] = {}
+        for r in rows:
+            pid = r[pid_i]
+            legacy_rejected = int(r[rej_i] or 0) if rej_i is not None and rej_i < len(r) else 0
+            projects[pid] = ProjectDTO(
+                project_id=pid,
+                name=r[name_i],
+                goal_cents=parse_cents(r[goal_i]),
+                deadline=date.fromisoformat(r[dl_i]),
+                raised_cents=parse_cents(r[raised_i]),
+                rejected_count=legacy_rejected,
+            )
+        return projects
+
+    def _parse_tiers(self) -> Dict[str, List[RewardTierDTO]]:
+        header, rows = read_tuples(self._p("reward_tiers.csv"))
+        pid_i, tier_i, title_i, min_i, quota_i = (header.index(c) for c in ("project_id","tier_id","title","minimum_amount","quota_left"))
+        tiers: Dict[str, List[RewardTierDTO]] = {}
+        for r in rows:
+            tiers.setdefault(r[pid_i], []).append(RewardTierDTO(
+                project_id=r[pid_i],
+                tier_id=r[tier_i],
+                title=r[title_i],
+                minimum_cents=parse_cents(r[min_i]),
+                quota_left=int(r[quota_i]),
+            ))
+        return tiers
+
+    def _read_all(self, filename: str) -> list[dict]:
+        with self._p(filename).open("r", newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def _write_all(self, filename: str, rows: list[dict], headers: list[str]):
+        # เขียนสำเนาแล้วค่อยสลับ → ถ้าเขียนไม่สำเร็จ ไฟล์จริงยังเป็นของเดิมทั้งไฟล์
+        path = self._p(filename)
+        tmp = path.with_suffix(".tmp")
+        try:
+            with tmp.open("w", newline="", encoding="utf-8") as f:
+                w = csv.DictWriter(f, fieldnames=headers)
+                w.writeheader()
+                w.writerows(rows)
+            os.replace(tmp, path)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def _update_project_amount(self, project_id: str, new_cents: int):
+        rows = self._read_all("project.csv")
+        for i, r in enumerate(rows):
+            if r["project_id"] == project_id:
+                rows[i]["raised_amount"] = format_cents(new_cents)
+                # คงค่า rejected_count เดิม
+        self._write_all("project.csv", rows, PROJECT_HEADERS)
+
+    def _record_rejection(self, project_id: str, error: PledgeRejected):
+        code = error.code
+        with self._write_lock:
+            self._rejections.record(project_id, code)
+            snap = self._snapshot
+            proj = snap.projects.get(project_id)
+            if proj is not None:
+                self._snapshot = snap.evolve(projects={project_id: replace_dto(proj, rejected_count=proj.rejected_count + 1)})
+        self.pledgeRejected.emit(project_id, code)
+        self.projectsChanged.emit([project_id])
+
+    @staticmethod
+    def _get_tier(snap: FundingSnapshot, project_id: str, tier_id: str) -> Optional[RewardTierDTO]:
+        for t in snap.tiers.get(project_id, ()):
+            if t.tier_id == tier_id:
+                return t
+        return None
+
+    def _update_tier_quota(self, project_id: str, tier_id: str, new_quota: int):
+        rows = self._read_all("reward_tiers.csv")
+        for i, r in enumerate(rows):
+            if r["project_id"] == project_id and r["tier_id"] == tier_id:
+                rows[i]["quota_left"] = str(int(new_quota))
+        self._write_all("reward_tiers.csv", rows, TIER_HEADERS)
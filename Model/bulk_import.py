@@ -0,0 +1,378 @@
+# Model/bulk_import.py
+from __future__ import annotations
+from typing import Iterable, List, Optional, Tuple
+from collections import Counter
+from datetime import date, timedelta
+from pathlib import Path
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from Model.csv_io import stage_append
+from Model.money import to_cents, format_cents
+from Model.snapshot import RewardTierDTO
+from Model.factory import make_model
+
+# รูปแบบข้อมูลนำเข้า: JSON array หรือ JSONL (หนึ่งโครงการต่อบรรทัด) ชื่อฟิลด์ตามคอลัมน์ใน CSV
+# {"project_id": "12345678", "name": "...", "goal_amount": "50000.00", "deadline": "2027-01-31",
+#  "tiers": [{"tier_id": "T1", "title": "...", "minimum_amount": "100", "quota_left": 50}],
+#  "stretch_goals": [{"sg_id": "SG1", "threshold_amount": "60000", "description": "..."}]}   ← โหมด stretch
+
+PROJECT_HEADERS = ["project_id","name","goal_amount","deadline","raised_amount","rejected_count"]
+TIER_HEADERS = ["project_id","tier_id","title","minimum_amount","quota_left"]
+GOAL_HEADERS = ["project_id","sg_id","threshold_amount","description","unlocked"]
+
+# จุด commit ของ write_batch: มีไฟล์นี้ = สำเนา .tmp ครบทุกไฟล์แล้ว ต้องสลับให้ครบ (ดู recover_batch)
+JOURNAL_NAME = "import.journal"
+STAGED_FILES = ("stretch_goals.csv", "reward_tiers.csv", "project.csv")
+
+MIN_STRETCH_GOALS = 3
+MAX_REPORTED = 20   # จำนวนปัญหาที่แสดงในข้อความ error (ทั้งหมดอยู่ใน BulkImportError.problems)
+
+
+class BulkImportError(ValueError):
+    """ชุดข้อมูลไม่ผ่านการตรวจ — problems เก็บทุกข้อที่พบ (ยังไม่มีอะไรถูกเขียน)"""
+
+    def __init__(self, problems: List[str]):
+        self.problems = problems
+        lines = [f"นำเข้าไม่สำเร็จ: พบปัญหา {len(problems)} ข้อ"] + problems[:MAX_REPORTED]
+        if len(problems) > MAX_REPORTED:
+            lines.append(f"... และอีก {len(problems) - MAX_REPORTED} ข้อ")
+        super().__init__("\n".join(lines))
+
+
+class ImportProject:
+    def __init__(self, project_id: str, name: str, goal_cents: int, deadline: date,
+                 tiers: List[RewardTierDTO], goals: List[Tuple[str, int, str]]):
+        self.project_id = project_id
+        self.name = name
+        self.goal_cents = goal_cents
+        self.deadline = deadline
+        self.tiers = tiers      # RewardTierDTO (quota_left = โควตาเริ่มต้น)
+        self.goals = goals      # (sg_id, threshold_cents, description) เรียงตามที่ส่งมา
+
+
+# ---------------- Read ----------------
+def read_batch(path: Path) -> List[dict]:
+    text = path.read_text(encoding="utf-8")
+    if text.lstrip().startswith("["):
+        return json.loads(text)
+    return [json.loads(line) for line in text.splitlines() if line.strip()]
+
+
+# ---------------- Validate ----------------
+def validate_batch(records: Iterable[dict], existing_ids, with_goals: bool,
+                   today: Optional[date] = None) -> List[ImportProject]:
+    """
+    ตรวจทั้งชุดก่อนเขียนอะไรลงดิสก์ — เก็บปัญหาทุกข้อแล้ว raise BulkImportError ครั้งเดียว
+    กฎเดียวกับ create_project / add_stretch_goals: รหัส 8 หลัก (ตัวแรกห้ามเป็น 0), เป้าหมาย > 0,
+    วันสิ้นสุดในอนาคต, รหัสไม่ซ้ำทั้งกับของเดิม (existing_ids ต้องเช็ก `in` ได้ O(1) เช่น keys ของ snapshot)
+    และภายในชุดเดียวกัน; โหมด stretch ต้องมี Stretch Goal อย่างน้อย 3 ระดับ threshold เรียงจากน้อยไปมาก
+    """
+    records = list(records)
+    today = today or date.today()
+    problems: List[str] = []
+    batch: List[ImportProject] = []
+    memo: dict = {}
+
+    ids = [str(r.get("project_id", "")).strip() if isinstance(r, dict) else "" for r in records]
+    repeated = {pid for pid, n in Counter(ids).items() if n > 1}
+
+    for i, (r, pid) in enumerate(zip(records, ids), start=1):
+        where = f"แถว {i} ({pid or '-'})"
+        errors: List[str] = []
+        if not isinstance(r, dict):
+            problems.append(f"แถว {i}: ต้องเป็น object")
+            continue
+
+        if len(pid) != 8 or not pid.isdigit() or pid[0] == "0":
+            errors.append("รหัสโครงการต้องเป็นตัวเลข 8 หลัก และตัวแรกห้ามเป็น 0")
+        elif pid in existing_ids:
+            errors.append("มีรหัสโครงการนี้อยู่แล้ว")
+        elif pid in repeated:
+            errors.append("รหัสโครงการซ้ำกันในชุดข้อมูล")
+
+        goal_cents = _cents(r.get("goal_amount"), errors, memo)
+        if goal_cents is not None and goal_cents <= 0:
+            errors.append("เป้าหมายยอดระดมทุนหลักต้องมากกว่า 0")
+
+        deadline = None
+        try:
+            deadline = date.fromisoformat(str(r.get("deadline", "")))
+            if deadline <= today:
+                errors.append("วันสิ้นสุดต้องอยู่ในอนาคต")
+        except ValueError:
+            errors.append(f"วันสิ้นสุดไม่ถูกต้อง: {r.get('deadline')!r}")
+
+        tiers = _tiers(pid, r.get("tiers") or [], errors, memo)
+        goals = _goals(r.get("stretch_goals") or [], with_goals, errors, memo)
+
+        if errors:
+            problems.extend(f"{where}: {e}" for e in errors)
+        else:
+            batch.append(ImportProject(pid, str(r.get("name", "")).strip(), goal_cents, deadline, tiers, goals))
+
+    if problems:
+        raise BulkImportError(problems)
+    return batch
+
+
+def _cents(value, errors: List[str], memo: dict) -> Optional[int]:
+    # ชุดข้อมูลใหญ่มักใช้จำนวนเงินซ้ำ ๆ (ยอดขั้นต่ำ tier, เป้าหมายกลม ๆ) → จำผลแปลงของแต่ละข้อความไว้
+    key = (type(value), value) if isinstance(value, (str, int)) else None
+    cents = memo.get(key) if key is not None else None
+    if cents is not None:
+        return cents
+    try:
+        cents = to_cents(value)
+    except (ValueError, TypeError, ArithmeticError):
+        errors.append(f"จำนวนเงินไม่ถูกต้อง: {value!r}")
+        return None
+    if key is not None:
+        memo[key] = cents
+    return cents
+
+
+def _tiers(project_id: str, raw: list, errors: List[str], memo: dict) -> List[RewardTierDTO]:
+    tiers: List[RewardTierDTO] = []
+    if not isinstance(raw, list):
+        errors.append("tiers ต้องเป็น array")
+        return tiers
+    seen = set()
+    for i, t in enumerate(raw, start=1):
+        if not isinstance(t, dict):
+            errors.append(f"tier ลำดับ {i} ต้องเป็น object: {t!r}")
+            continue
+        tier_id = str(t.get("tier_id", "")).strip()
+        if not tier_id or tier_id in seen:
+            errors.append(f"รหัส tier ว่างหรือซ้ำ: {tier_id!r}")
+        seen.add(tier_id)
+        minimum = _cents(t.get("minimum_amount"), errors, memo)
+        if minimum is not None and minimum <= 0:
+            errors.append(f"ยอดขั้นต่ำของ tier {tier_id} ต้องมากกว่า 0")
+        try:
+            quota = int(t.get("quota_left"))
+            if quota < 0:
+                raise ValueError
+        except (ValueError, TypeError):
+            errors.append(f"โควตาของ tier {tier_id} ต้องเป็นจำนวนเต็มไม่ติดลบ")
+            quota = 0
+        tiers.append(RewardTierDTO(project_id, tier_id, str(t.get("title", "")).strip(), minimum or 0, quota))
+    return tiers
+
+
+def _goals(raw: list, with_goals: bool, errors: List[str], memo: dict) -> List[Tuple[str, int, str]]:
+    if not isinstance(raw, list):
+        errors.append("stretch_goals ต้องเป็น array")
+        return []
+    if not with_goals:
+        if raw:
+            errors.append("โหมด basic ไม่มี Stretch Goal — นำเข้าด้วยโหมด stretch")
+        return []
+    if len(raw) < MIN_STRETCH_GOALS:
+        errors.append(f"ต้องมี Stretch Goal อย่างน้อย {MIN_STRETCH_GOALS} ระดับ")
+    goals: List[Tuple[str, int, str]] = []
+    seen = set()
+    previous = 0
+    for i, g in enumerate(raw, start=1):
+        if not isinstance(g, dict):
+            errors.append(f"Stretch Goal ลำดับ {i} ต้องเป็น object: {g!r}")
+            continue
+        sg_id = str(g.get("sg_id", "")).strip()
+        if not sg_id or sg_id in seen:
+            errors.append(f"รหัส Stretch Goal ว่างหรือซ้ำ: {sg_id!r}")
+        seen.add(sg_id)
+        threshold = _cents(g.get("threshold_amount"), errors, memo)
+        if threshold is None:
+            continue
+        if threshold <= 0:
+            errors.append("Threshold ของ Stretch Goal ต้องมากกว่า 0")
+        elif threshold <= previous:
+            errors.append(f"Threshold ของ {sg_id} ต้องมากกว่าระดับก่อนหน้า ({format_cents(previous)})")
+        previous = max(previous, threshold)
+        goals.append((sg_id, threshold, str(g.get("description", "")).strip()))
+    return goals
+
+
+# ---------------- Write ----------------
+def write_batch(db_dir: Path, batch: List[ImportProject], with_goals: bool):
+    """
+    เขียนทั้งชุดแบบ all-or-nothing:
+    1) เตรียมสำเนา <ไฟล์>.tmp ของทุกไฟล์ (ของเดิม + แถวใหม่) แล้ว fsync — ล้มตรงนี้ ไฟล์จริงไม่ถูกแตะ
+    2) เขียน import.journal (รายชื่อไฟล์ที่ต้องสลับ) แบบ atomic — นี่คือจุด commit
+    3) os.replace ทีละไฟล์ แล้วลบ journal
+    ถ้าโปรแกรมตายระหว่างข้อ 3 ครั้งหน้าที่เปิดโมเดล recover_batch() จะสลับไฟล์ที่เหลือให้ครบ
+    ผู้เรียกต้องถือ _write_lock ของโมเดล
+    """
+    money: dict = {}
+
+    def fmt(cents: int) -> str:
+        text = money.get(cents)
+        if text is None:
+            text = money[cents] = format_cents(cents)
+        return text
+
+    plan = []
+    if with_goals:
+        plan.append(("stretch_goals.csv", GOAL_HEADERS, [
+            (p.project_id, sg_id, fmt(th), desc, "0")
+            for p in batch for sg_id, th, desc in p.goals
+        ]))
+    plan.append(("reward_tiers.csv", TIER_HEADERS, [
+        (t.project_id, t.tier_id, t.title, fmt(t.minimum_cents), str(t.quota_left))
+        for p in batch for t in p.tiers
+    ]))
+    plan.append(("project.csv", PROJECT_HEADERS, [
+        (p.project_id, p.name, fmt(p.goal_cents), p.deadline.isoformat(), fmt(0), "0")
+        for p in batch
+    ]))
+
+    staged: List[Path] = []
+    try:
+        for fname, headers, rows in plan:
+            staged.append(stage_append(db_dir / fname, headers, rows))
+        _write_journal(db_dir, [fname for fname, _, _ in plan])
+    except Exception:
+        for tmp in staged:
+            tmp.unlink(missing_ok=True)
+        raise
+    _roll_forward(db_dir, [fname for fname, _, _ in plan])
+
+
+def recover_batch(db_dir: Path) -> bool:
+    """
+    เรียกตอนเปิดโมเดล (ก่อนอ่าน CSV): ถ้ามี import.journal ค้างอยู่ แปลว่าการนำเข้าครั้งก่อน commit แล้ว
+    แต่สลับไฟล์ไม่ครบ → สลับส่วนที่เหลือให้ครบ; ถ้าไม่มี journal แต่มีสำเนา .tmp ค้าง (ตายก่อน commit) → ทิ้งสำเนา
+    คืน True ถ้ามีการนำเข้าที่ถูกทำต่อจนครบ
+    """
+    journal = db_dir / JOURNAL_NAME
+    try:
+        names = json.loads(journal.read_text(encoding="utf-8"))["files"]
+    except FileNotFoundError:
+        for fname in STAGED_FILES:
+            (db_dir / (fname + ".tmp")).unlink(missing_ok=True)
+        return False
+    except (ValueError, KeyError, TypeError):
+        # journal ถูกเขียนแบบ atomic จึงไม่ควรเสีย — ถ้าเสียก็ไม่รู้ว่าต้องสลับอะไร ปล่อยไว้ให้ตรวจด้วยมือ
+        raise RuntimeError(f"{journal} อ่านไม่ได้ — ตรวจไฟล์ .tmp ใน {db_dir} ก่อนเปิดโปรแกรม")
+    _roll_forward(db_dir, [n for n in names if n in STAGED_FILES])
+    return True
+
+
+def _write_journal(db_dir: Path, names: List[str]):
+    journal = db_dir / JOURNAL_NAME
+    tmp = journal.with_name(journal.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump({"files": names}, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, journal)
+    _fsync_dir(db_dir)
+
+
+def _roll_forward(db_dir: Path, names: List[str]):
+    # ไฟล์ที่สลับไปแล้วไม่มี .tmp เหลือ → ข้าม (เรียกซ้ำได้ปลอดภัย)
+    for fname in names:
+        tmp = db_dir / (fname + ".tmp")
+        if tmp.exists():
+            os.replace(tmp, db_dir / fname)
+    _fsync_dir(db_dir)
+    (db_dir / JOURNAL_NAME).unlink(missing_ok=True)
+
+
+def _fsync_dir(path: Path):
+    # ให้การ rename ลงดิสก์จริง (POSIX); ระบบที่เปิดโฟลเดอร์แบบนี้ไม่ได้ (Windows) ข้ามไป
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+# ---------------- Bench / CLI ----------------
+def synthetic_batch(n: int, start_id: int = 50_000_000, today: Optional[date] = None) -> List[dict]:
+    today = today or date.today()
+    records = []
+    for i in range(n):
+        goal = 10_000 + (i % 97) * 1_000
+        records.append({
+            "project_id": str(start_id + i),
+            "name": f"Imported project {i}",
+            "goal_amount": f"{goal}.00",
+            "deadline": (today + timedelta(days=1 + i % 365)).isoformat(),
+            "tiers": [{"tier_id": f"T{k}", "title": f"Tier {k}", "minimum_amount": str(100 * k), "quota_left": 10 * k}
+                      for k in (1, 2, 3)],
+            "stretch_goals": [{"sg_id": f"SG{k}", "threshold_amount": f"{goal * (100 + 25 * k) // 100}.00",
+                               "description": f"Stretch {k}"} for k in (1, 2, 3)],
+        })
+    return records
+
+
+def bench(n: int, mode: str = "stretch", db_dir: Path = Path("Database")):
+    work = Path(tempfile.mkdtemp(prefix="bulk-import-"))
+    try:
+        db_copy = work / "Database"
+        shutil.copytree(db_dir, db_copy)
+        (db_copy / "state.cache").unlink(missing_ok=True)
+        records = synthetic_batch(n)
+        if mode != "stretch":
+            for r in records:
+                r.pop("stretch_goals")
+        model = make_model(mode, db_copy)
+        model.errorOccurred.connect(lambda msg: print(msg))
+        t0 = time.perf_counter()
+        imported = model.import_projects(records)
+        elapsed = time.perf_counter() - t0
+        print(f"นำเข้า {imported:,} โครงการ ({mode}) ใน {elapsed:.2f} s "
+              f"({imported / elapsed:,.0f} โครงการ/s); ทั้งหมดในโมเดล {len(model.snapshot().projects):,}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+def main(argv: List[str]) -> int:
+    """
+    python -m Model.bulk_import <batch.json|batch.jsonl> [basic|stretch] [Database] [--dry-run]
+    python -m Model.bulk_import bench [n] [basic|stretch] [Database]
+    """
+    args = [a for a in argv if not a.startswith("--")]
+    if not args:
+        print(main.__doc__)
+        return 2
+    if args[0] == "bench":
+        bench(int(args[1]) if len(args) > 1 else 100_000,
+              args[2] if len(args) > 2 else "stretch",
+              Path(args[3]) if len(args) > 3 else Path("Database"))
+        return 0
+    mode = args[1] if len(args) > 1 else "stretch"
+    db_dir = Path(args[2]) if len(args) > 2 else Path("Database")
+    records = read_batch(Path(args[0]))
+    if "--dry-run" in argv:
+        model = make_model(mode, db_dir)
+        try:
+            batch = validate_batch(records, model.snapshot().projects, with_goals=(mode == "stretch"))
+        except BulkImportError as e:
+            print(e)
+            return 1
+        print(f"ตรวจผ่าน {len(batch):,} โครงการ (ยังไม่ได้เขียน)")
+        return 0
+    model = make_model(mode, db_dir)
+    errors: List[str] = []
+    model.errorOccurred.connect(errors.append)
+    imported = model.import_projects(records)
+    if errors:
+        print("\n".join(errors))
+        return 1
+    print(f"นำเข้า {imported:,} โครงการ → {db_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,52 @@
+# Model/csv_io.py
+from __future__ import annotations
+from typing import Iterable, List, Sequence
+from pathlib import Path
+import csv
+import io
+import os
+import shutil
+
+
+def append_rows(path: Path, headers: List[str], rows: Iterable[dict]) -> int:
+    """
+    ต่อท้ายแถวลงไฟล์ CSV ในการเขียนครั้งเดียว คืนตำแหน่ง byte ที่แถวแรกเริ่ม
+    ถ้าบรรทัดสุดท้ายของไฟล์ไม่มี newline จะปิดบรรทัดให้ก่อน (ไม่งั้นแถวใหม่จะไปต่อท้ายแถวเดิม)
+    """
+    buf = io.StringIO()
+    csv.DictWriter(buf, fieldnames=headers, lineterminator="\n").writerows(rows)
+    data = buf.getvalue().encode("utf-8")
+    with path.open("ab+") as f:
+        end = f.seek(0, 2)
+        if end > 0:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+                end += 1
+        f.write(data)
+    return end
+
+
+def stage_append(path: Path, headers: List[str], rows: Iterable[Sequence[str]]) -> Path:
+    """
+    ต่อท้ายแถว (tuple ตามลำดับ headers) ลงสำเนา <ชื่อไฟล์>.tmp ของไฟล์เดิม แล้ว fsync คืน path ของสำเนา
+    ไฟล์จริงยังไม่เปลี่ยนจนกว่าผู้เรียกจะ os.replace(สำเนา, ไฟล์จริง) — ใช้เตรียมหลายไฟล์ให้ครบก่อนสลับ
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    if path.exists():
+        shutil.copyfile(path, tmp)
+    else:
+        with tmp.open("w", newline="", encoding="utf-8") as f:
+            csv.writer(f, lineterminator="\n").writerow(headers)
+    with tmp.open("ab+") as f:
+        end = f.seek(0, 2)
+        if end > 0:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerows(rows)
+        f.write(buf.getvalue().encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp
@@ -0,0 +1,117 @@
+# Model/detail_composer.py
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+
+class ProjectDetail:
+    """ข้อมูลหน้ารายละเอียดของหนึ่งโครงการ ประกอบจาก snapshot เดียวกัน (ห้ามแก้ในที่)"""
+
+    def __init__(self, project, funding, tiers: Tuple, goals: Tuple, recent_pledges: List, pledge_count: int, version: int):
+        self.project = project                  # ProjectDTO
+        self.funding = funding                  # FundingState (funded / % / SG ถัดไป / tier ที่เหลือ)
+        self.tiers = tiers                      # tuple[RewardTierDTO] (มี quota_left)
+        self.goals = goals                      # tuple[StretchGoalDTO] (มี unlocked) — โหมด basic เป็น ()
+        self.recent_pledges = recent_pledges    # pledge ล่าสุด ใหม่ → เก่า (หน้าแรกของประวัติ)
+        self.pledge_count = pledge_count
+        self.version = version                  # เวอร์ชัน snapshot ที่ใช้ประกอบ
+
+
+class DetailComposer:
+    """
+    ประกอบ ProjectDetail แล้วเก็บใน LRU (OrderedDict) ขนาดจำกัด
+    - invalidate(ids) เรียกจาก projectsChanged ของโมเดล → ทิ้ง entry ของโครงการนั้น
+    - prefetch(ids) ประกอบล่วงหน้าใน thread พื้นหลัง (เช่นแถวก่อน/หลังแถวที่เลือกบนหน้ารายการ)
+    - กันผลเก่าทับผลใหม่ด้วยเลข generation ต่อโครงการ: ถ้ามีการ invalidate ระหว่างประกอบ ผลนั้นจะไม่ถูกเก็บ
+    """
+
+    def __init__(self, model, capacity: int = 32, recent: int = 10, workers: int = 1):
+        self._model = model
+        self._capacity = capacity
+        self._recent = recent
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, ProjectDetail]" = OrderedDict()
+        self._generation: Dict[str, int] = {}
+        self._epoch = 0   # เพิ่มเมื่อ clear() ทั้งหมด
+        self._pending: set = set()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="detail-prefetch")
+
+    # ---------------- Read ----------------
+    def get(self, project_id: str) -> Optional[ProjectDetail]:
+        with self._lock:
+            detail = self._cache.get(project_id)
+            if detail is not None:
+                self._cache.move_to_end(project_id)
+                return detail
+        return self._load(project_id)
+
+    def cached(self, project_id: str) -> bool:
+        with self._lock:
+            return project_id in self._cache
+
+    def _load(self, project_id: str) -> Optional[ProjectDetail]:
+        with self._lock:
+            gen = self._gen(project_id)
+        detail = self._compose(project_id)
+        if detail is None:
+            return None
+        with self._lock:
+            if self._gen(project_id) == gen:
+                self._cache[project_id] = detail
+                self._cache.move_to_end(project_id)
+                while len(self._cache) > self._capacity:
+                    self._cache.popitem(last=False)
+        return detail
+
+    def _gen(self, project_id: str) -> Tuple[int, int]:
+        return self._epoch, self._generation.get(project_id, 0)
+
+    def _compose(self, project_id: str) -> Optional[ProjectDetail]:
+        snap = self._model.snapshot()
+        project = snap.projects.get(project_id)
+        if project is None:
+            return None
+        return ProjectDetail(
+            project=project,
+            funding=snap.funding.get(project_id),
+            tiers=snap.tiers.get(project_id, ()),
+            goals=snap.goals.get(project_id, ()),
+            recent_pledges=self._model.pledges_for_project(project_id, 0, self._recent),
+            pledge_count=snap.pledge_counts.get(project_id, 0),
+            version=snap.version,
+        )
+
+    # ---------------- Prefetch ----------------
+    def prefetch(self, project_ids: Iterable[str]):
+        for pid in project_ids:
+            with self._lock:
+                if not pid or pid in self._cache or pid in self._pending:
+                    continue
+                self._pending.add(pid)
+            self._pool.submit(self._prefetch_one, pid)
+
+    def _prefetch_one(self, project_id: str):
+        try:
+            self._load(project_id)
+        except Exception:
+            pass   # prefetch เป็นแค่ตัวช่วย — ตอนเปิดจริง get() จะประกอบใหม่และแจ้ง error ตามปกติ
+        finally:
+            with self._lock:
+                self._pending.discard(project_id)
+
+    # ---------------- Invalidation ----------------
+    def invalidate(self, project_ids: Iterable[str]):
+        with self._lock:
+            for pid in project_ids:
+                self._generation[pid] = self._generation.get(pid, 0) + 1
+                self._cache.pop(pid, None)
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._cache.clear()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,18 @@
+# Model/factory.py
+from __future__ import annotations
+from pathlib import Path
+
+MODES = ("basic", "stretch")
+
+
+def make_model(mode: str = "basic", db_dir: Path = Path("Database")):
+    """
+    สร้างโมเดลตามโหมด ("stretch" → StretchGoalFundingModel, อื่น ๆ → BasicFundingModel)
+    ใช้ร่วมกันระหว่างเครื่องมือ command line (bulk_import / stats_export / workload)
+    import โมเดลในฟังก์ชัน เพราะตัวโมเดลเองก็ import โมดูลเหล่านั้นอยู่
+    """
+    if mode.lower() == "stretch":
+        from Model.stretch_model import StretchGoalFundingModel
+        return StretchGoalFundingModel(db_dir)
+    from Model.basic_model import BasicFundingModel
+    return BasicFundingModel(db_dir)
@@ -0,0 +1,51 @@
+# Model/funding_state.py
+from __future__ import annotations
+from typing import Iterable, Optional, Tuple
+
+from Model.money import percent_of
+
+
+class FundingState:
+    """
+    สถานะการระดมทุนของหนึ่งโครงการที่คำนวณไว้แล้ว (materialized) — เก็บใน FundingSnapshot.funding
+    snapshot คำนวณใหม่ให้ทุกครั้งที่ evolve() แตะโครงการนั้น จึงตรงกับ projects/tiers/goals เวอร์ชันเดียวกันเสมอ
+    ผู้อ่าน (View, สถิติ, is_funded) ใช้ค่าตรงนี้แทนการคำนวณเอง
+    """
+
+    def __init__(self, project_id: str, funded: bool, percent: int, next_threshold_cents: Optional[int],
+                 to_next_unlock_cents: Optional[int], tiers_remaining: int, unlocked_goals: Tuple[str, ...]):
+        self.project_id = project_id
+        self.funded = funded                                # raised >= goal
+        self.percent = percent                              # 0..100 (ปัดลง) สำหรับ progress bar
+        self.next_threshold_cents = next_threshold_cents    # threshold ของ Stretch Goal ถัดไปที่ยอดยังไม่ถึง (None = ไม่มี)
+        self.to_next_unlock_cents = to_next_unlock_cents    # ยอดที่ขาดถึง threshold นั้น
+        self.tiers_remaining = tiers_remaining              # จำนวน tier ที่ยังมีโควตา
+        self.unlocked_goals = unlocked_goals                # ชื่อ (description หรือ sg_id) ของ SG ที่ปลดล็อกแล้ว
+
+    @property
+    def next_threshold_amount(self) -> Optional[float]:
+        return None if self.next_threshold_cents is None else self.next_threshold_cents / 100
+
+
+def compute_state(project, tiers: Iterable = (), goals: Iterable = ()) -> FundingState:
+    """project: มี raised_cents / goal_cents; tiers: มี quota_left; goals: มี threshold_cents / unlocked"""
+    raised = project.raised_cents
+    next_threshold = None
+    unlocked = []
+    for g in goals:
+        if g.unlocked:
+            label = g.description or g.sg_id
+            if label:
+                unlocked.append(label)
+        # SG ถัดไปดูจากยอดจริง (ธง unlocked อาจยังไม่ถูกคำนวณใหม่ ถ้ายอดถูกเพิ่มจากโหมด basic)
+        if g.threshold_cents > raised and (next_threshold is None or g.threshold_cents < next_threshold):
+            next_threshold = g.threshold_cents
+    return FundingState(
+        project_id=project.project_id,
+        funded=raised >= project.goal_cents,
+        percent=percent_of(raised, project.goal_cents),
+        next_threshold_cents=next_threshold,
+        to_next_unlock_cents=None if next_threshold is None else next_threshold - raised,
+        tiers_remaining=sum(1 for t in tiers if t.quota_left > 0),
+        unlocked_goals=tuple(unlocked),
+    )
@@ -0,0 +1,53 @@
+# Model/money.py
+from __future__ import annotations
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Union
+
+# จำนวนเงินเก็บเป็นจำนวนเต็มหน่วย "สตางค์" (1 บาท = 100) ตลอดทั้งโมเดล
+# - ในไฟล์ CSV ยังเขียนเป็นทศนิยม 2 ตำแหน่ง ("850.00") ซึ่งแปลงไป-กลับกับสตางค์ได้ตรงทุกค่า
+# - บวก/เปรียบเทียบด้วย int ทั้งหมด → ผลรวมไม่คลาดเคลื่อนแบบ float
+
+Amount = Union[int, float, str, Decimal]
+
+
+def parse_cents(text: str) -> int:
+    """ "1234.5" / "-0.05" / "12" → สตางค์ (ทศนิยมเกิน 2 ตำแหน่งปัดครึ่งขึ้น)"""
+    s = text.strip()
+    neg = s.startswith("-")
+    if neg or s.startswith("+"):
+        s = s[1:]
+    whole, _, frac = s.partition(".")
+    if not (whole or frac) or (whole and not whole.isdigit()) or (frac and not frac.isdigit()):
+        raise ValueError(f"จำนวนเงินไม่ถูกต้อง: {text!r}")
+    cents = int(whole or "0") * 100 + int((frac[:2] or "0").ljust(2, "0"))
+    if len(frac) > 2 and frac[2] >= "5":
+        cents += 1
+    return -cents if neg else cents
+
+
+def format_cents(cents: int) -> str:
+    """สตางค์ → "850.00" (รูปแบบเดียวกับที่เก็บใน CSV)"""
+    sign = "-" if cents < 0 else ""
+    whole, frac = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{frac:02d}"
+
+
+def to_cents(amount: Amount) -> int:
+    """แปลงจำนวนเงินหน่วยบาทจากชนิดใดก็ได้ที่ผู้เรียกส่งมา → สตางค์"""
+    if isinstance(amount, bool):
+        raise ValueError("จำนวนเงินไม่ถูกต้อง")
+    if isinstance(amount, int):
+        return amount * 100
+    if isinstance(amount, str):
+        return parse_cents(amount)
+    if isinstance(amount, float):
+        # ผ่าน repr ที่สั้นที่สุดของ float (เช่น 0.1 → "0.1") แทนค่าฐานสองที่คลาดเคลื่อน
+        return int((Decimal(repr(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    return int((Decimal(amount) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def percent_of(part_cents: int, whole_cents: int, cap: int = 100) -> int:
+    """เปอร์เซ็นต์แบบจำนวนเต็ม (ปัดลง) เพดานที่ cap — ใช้กับ progress bar"""
+    if whole_cents <= 0:
+        return 0
+    return min(part_cents * 100 // whole_cents, cap)
@@ -0,0 +1,467 @@
+# Model/pledge_store.py
+from __future__ import annotations
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+from pathlib import Path
+import csv
+import io
+import os
+import sys
+import threading
+from Model.csv_io import append_rows
+from Model.csv_loader import scan_pledges
+from Model.money import parse_cents, format_cents
+from Model.state_cache import Codec, StateCache
+
+PLEDGE_HEADERS = ["pledge_id", "user_id", "project_id", "amount", "created_at", "reward_tier_id"]
+
+
+class PledgeRecord:
+    def __init__(self, pledge_id: str, user_id: str, project_id: str, amount: str, created_at: str, reward_tier_id: str):
+        self.pledge_id = pledge_id
+        self.user_id = user_id
+        self.project_id = project_id
+        self.amount = amount
+        self.created_at = created_at
+        self.reward_tier_id = reward_tier_id
+
+    @property
+    def amount_cents(self) -> int:
+        return parse_cents(self.amount)
+
+
+class ClaimedTier:
+    def __init__(self, project_id: str, project_name: str, tier_id: str, title: str, count: int):
+        self.project_id = project_id
+        self.project_name = project_name
+        self.tier_id = tier_id
+        self.title = title
+        self.count = count
+
+
+class UserPledgeSummary:
+    def __init__(self, pledge_count: int, total_cents: int, projects_backed: int, claimed_tiers: List[ClaimedTier]):
+        self.pledge_count = pledge_count
+        self.total_cents = total_cents
+        self.projects_backed = projects_backed
+        self.claimed_tiers = claimed_tiers
+
+    @property
+    def total_amount(self) -> float:
+        return self.total_cents / 100
+
+
+class UserPledgeIndex:
+    """
+    ดัชนีรอง user_id → offset ของ pledge ใน pledges.csv พร้อมยอดรวมต่อผู้ใช้ (อยู่ในหน่วยความจำ)
+    - cents[user] = ยอดสนับสนุนรวม (สตางค์) → เช็กวงเงินต่อผู้ใช้ได้ O(1)
+    - claims[user][(project_id, reward_tier_id)] = จำนวน pledge (tier ว่าง = ไม่รับรางวัล)
+    """
+
+    def __init__(self):
+        self.offsets: Dict[str, List[int]] = {}
+        self.cents: Dict[str, int] = {}
+        self.claims: Dict[str, Dict[Tuple[str, str], int]] = {}
+
+    def add(self, user_id: str, offset: int, cents: int, project_id: str, tier_id: str):
+        self.offsets.setdefault(user_id, []).append(offset)
+        self.cents[user_id] = self.cents.get(user_id, 0) + cents
+        claims = self.claims.setdefault(user_id, {})
+        claims[(project_id, tier_id)] = claims.get((project_id, tier_id), 0) + 1
+
+    def remove(self, user_id: str, offset: int, cents: int, project_id: str, tier_id: str):
+        """ย้อน add() ของ pledge ที่ offset นี้ (ใช้ตอนยกเลิก append)"""
+        self.offsets[user_id].remove(offset)
+        self.cents[user_id] -= cents
+        claims = self.claims[user_id]
+        claims[(project_id, tier_id)] -= 1
+        if not claims[(project_id, tier_id)]:
+            del claims[(project_id, tier_id)]
+
+    @classmethod
+    def from_scan(cls, scan) -> "UserPledgeIndex":
+        users = cls()
+        users.offsets, users.cents, users.claims = scan.user_offsets, scan.user_cents, scan.user_claims
+        return users
+
+    def to_json(self) -> dict:
+        return {
+            "offsets": self.offsets,
+            "cents": self.cents,
+            "claims": {uid: [[pid, tier, n] for (pid, tier), n in c.items()] for uid, c in self.claims.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "UserPledgeIndex":
+        users = cls()
+        users.offsets = {uid: [int(o) for o in offs] for uid, offs in data["offsets"].items()}
+        users.cents = {uid: int(c) for uid, c in data["cents"].items()}
+        users.claims = {uid: {(pid, tier): int(n) for pid, tier, n in c} for uid, c in data["claims"].items()}
+        return users
+
+
+# ตารางใน StateCache: pledge_index = {project_id: [offset, ...]}, user index = UserPledgeIndex.to_json()
+OFFSETS_CODEC = Codec(
+    lambda offsets: {pid: list(offs) for pid, offs in offsets.items()},
+    lambda data: {str(pid): [int(o) for o in offs] for pid, offs in data.items()},
+)
+USER_INDEX_CODEC = Codec(UserPledgeIndex.to_json, UserPledgeIndex.from_json)
+
+
+class PledgeStore:
+    """
+    pledges.csv ไฟล์เดียว + ดัชนีตำแหน่ง byte แยกตาม project_id (pledges.idx)
+    - append() ต่อท้าย pledges.csv แล้วต่อท้าย pledges.idx ด้วย "offset,project_id"
+    - คำถามต่อโครงการ (จำนวน / ประวัติแบบแบ่งหน้า) อ่านเฉพาะบรรทัดของโครงการนั้นด้วย seek
+    - ถ้า pledges.csv ถูกแก้จากภายนอก ดัชนีจะตามอ่านเฉพาะส่วนที่ต่อท้ายเพิ่ม หรือสร้างใหม่ถ้าไม่ตรงกัน
+    - ถ้าให้ StateCache มา และทั้ง pledges.csv / pledges.idx ไม่เปลี่ยนจากครั้งก่อน จะได้ดัชนีจาก cache โดยไม่อ่านสองไฟล์นี้
+    - ดัชนีรายผู้ใช้ (UserPledgeIndex) สร้างตอนถูกถามครั้งแรก (หรือ load_user_index()) แล้วต่อเติมทุกครั้งที่ append();
+      เก็บใน StateCache ผูกกับ pledges.csv + pledges.idx เหมือนดัชนีต่อโครงการ — save_index() เขียนทั้งสองตารางใหม่
+      หลัง append (เรียกจาก flush ของโมเดล) เปิดครั้งถัดไปจึงไม่ต้องสแกนทั้งไฟล์
+    ข้อจำกัด: หนึ่ง pledge ต้องอยู่บรรทัดเดียว (ห้ามมี newline ในช่องข้อมูล)
+    user_id คือ user_id ของ users.csv เท่านั้น — ข้อมูลเก่าที่ใช้ "u-<username>" ให้แปลงด้วย
+    python -m Model.pledge_store migrate ก่อน (ดู migrate_user_ids)
+    """
+
+    INDEX_NAME = "pledges.idx"
+    USER_TABLE = "pledge_user_index"
+
+    def __init__(self, db_dir: Path, cache: Optional[StateCache] = None):
+        self._path = db_dir / "pledges.csv"
+        self._idx_path = db_dir / self.INDEX_NAME
+        self._lock = threading.Lock()
+        self._offsets: Dict[str, List[int]] = {}
+        self._indexed_upto = 0   # byte ใน pledges.csv ที่ดัชนีครอบคลุมถึงแล้ว
+        self._cache = cache
+        self._users: Optional[UserPledgeIndex] = None   # สร้างตอนถูกถามครั้งแรก (ดู _user_index)
+        self._unsaved = False   # มี append() ที่ยังไม่ได้เขียนดัชนีลง cache (ดู save_index)
+        self._last_append: Optional[Tuple[dict, int, int, int]] = None   # (row, offset, ขนาด pledges.csv / .idx ก่อนเขียน) สำหรับ undo_append
+        if cache is None:
+            self._load_index()
+            return
+        sources = (self._path, self._idx_path)
+        cached = cache.get("pledge_index", sources, OFFSETS_CODEC)
+        if cached is not None:
+            self._offsets = cached
+            self._indexed_upto = self._path.stat().st_size
+            return
+        self._load_index()
+        sig = cache.signature(sources)
+        if sig is not None:
+            cache.put("pledge_index", sig, self._offsets, OFFSETS_CODEC)
+
+    # ---------------- Index maintenance ----------------
+    def _load_index(self):
+        self._offsets, self._indexed_upto = {}, 0
+        if self._idx_path.exists():
+            last = None
+            with self._idx_path.open("r", encoding="utf-8") as f:
+                for line in f:
+                    off, _, pid = line.rstrip("\n").partition(",")
+                    if pid:
+                        last = int(off)
+                        self._offsets.setdefault(pid, []).append(last)
+            if last is not None:
+                row = self._row_at(last)
+                if row is None or row.project_id not in self._offsets or self._offsets[row.project_id][-1] != last:
+                    self.rebuild_index()
+                    return
+                with self._path.open("rb") as f:
+                    f.seek(last)
+                    f.readline()
+                    self._indexed_upto = f.tell()
+        self._catch_up()
+
+    def _catch_up(self):
+        """อ่าน pledges.csv ต่อจากตำแหน่งที่ดัชนีครอบคลุม แล้วเพิ่มเข้าดัชนี (ไฟล์ใหญ่สแกนขนาน)"""
+        if not self._path.exists():
+            return
+        scan = scan_pledges(self._path, self._indexed_upto or None, with_offsets=True)
+        new_entries = []
+        for pid, offs in scan.offsets.items():
+            self._offsets.setdefault(pid, []).extend(offs)
+            new_entries.extend((off, pid) for off in offs)
+        self._indexed_upto = scan.end
+        if new_entries:
+            new_entries.sort()
+            with self._idx_path.open("a", encoding="utf-8") as f:
+                f.writelines(f"{off},{pid}\n" for off, pid in new_entries)
+
+    def rebuild_index(self):
+        with self._lock:
+            if self._idx_path.exists():
+                self._idx_path.unlink()
+            self._offsets, self._indexed_upto = {}, 0
+            self._users = None
+            self._catch_up()
+
+    def load_user_index(self):
+        """สร้างดัชนีรายผู้ใช้ตอนนี้เลย (ถ้ายังไม่มี) — เรียกก่อนเริ่มใช้งานที่ต้องถามต่อ pledge จะได้ไม่สแกนไฟล์ตอนถือล็อกของโมเดล"""
+        self._user_index()
+
+    def _user_index(self) -> UserPledgeIndex:
+        with self._lock:
+            if self._users is None:
+                self._users = self._load_user_index()
+            return self._users
+
+    def _load_user_index(self) -> UserPledgeIndex:
+        # จาก cache ถ้า pledges.csv / pledges.idx ตรงกับตอนที่เก็บ ไม่งั้นสแกนทั้งไฟล์ (ผู้เรียกถือ self._lock อยู่)
+        sources = (self._path, self._idx_path)
+        if self._cache is not None:
+            cached = self._cache.get(self.USER_TABLE, sources, USER_INDEX_CODEC)
+            if cached is not None:
+                return cached
+        if not self._path.exists():
+            return UserPledgeIndex()
+        sig = self._cache.signature(sources) if self._cache is not None else None
+        users = UserPledgeIndex.from_scan(scan_pledges(self._path, with_users=True))
+        if sig is not None:
+            self._cache.put(self.USER_TABLE, sig, users, USER_INDEX_CODEC)
+            self._cache.save()
+        return users
+
+    def save_index(self):
+        """เขียนดัชนีต่อโครงการ / รายผู้ใช้ลง StateCache ใหม่ถ้ามี append() ตั้งแต่ครั้งก่อน (ผู้เรียกต้อง save() ของ cache เอง)"""
+        if self._cache is None:
+            return
+        with self._lock:
+            if not self._unsaved:
+                return
+            sig = self._cache.signature((self._path, self._idx_path))
+            if sig is None:
+                return
+            self._cache.put("pledge_index", sig, self._offsets, OFFSETS_CODEC)
+            if self._users is not None:
+                self._cache.put(self.USER_TABLE, sig, self._users, USER_INDEX_CODEC)
+            self._unsaved = False
+
+    # ---------------- Write ----------------
+    def append(self, row: dict) -> int:
+        with self._lock:
+            size = self._path.stat().st_size
+            idx_size = self._idx_path.stat().st_size if self._idx_path.exists() else 0
+            try:
+                end = append_rows(self._path, PLEDGE_HEADERS, [row])
+                with self._idx_path.open("a", encoding="utf-8") as f:
+                    f.write(f"{end},{row['project_id']}\n")
+            except Exception:
+                # เขียนไม่ครบ → ตัดทั้งสองไฟล์กลับขนาดเดิม ไม่ให้เหลือแถวที่ดัชนีไม่รู้จัก (หรือดัชนีที่ชี้ไปแถวที่ไม่มี)
+                self._truncate(size, idx_size)
+                raise
+            self._offsets.setdefault(row["project_id"], []).append(end)
+            self._indexed_upto = self._path.stat().st_size
+            if self._users is not None:
+                self._users.add(row["user_id"], end, parse_cents(row["amount"]), row["project_id"],
+                                row["reward_tier_id"] or "")
+            self._unsaved = True
+            self._last_append = (row, end, size, idx_size)
+        return end
+
+    def undo_append(self, offset: int):
+        """
+        ยกเลิก append() ครั้งล่าสุด (offset = ค่าที่ append() คืนมา) ทั้งในไฟล์และดัชนี
+        ใช้เมื่อเขียนไฟล์อื่นของ pledge เดียวกันไม่สำเร็จ — ผู้เรียกถือ _write_lock ของโมเดล จึงไม่มี append อื่นแทรก
+        """
+        with self._lock:
+            if self._last_append is None or self._last_append[1] != offset:
+                raise RuntimeError("ยกเลิกได้เฉพาะ pledge ที่เพิ่ง append ล่าสุด")
+            row, end, size, idx_size = self._last_append
+            self._truncate(size, idx_size)
+            offs = self._offsets[row["project_id"]]
+            offs.pop()
+            if not offs:
+                del self._offsets[row["project_id"]]
+            self._indexed_upto = size
+            if self._users is not None:
+                self._users.remove(row["user_id"], end, parse_cents(row["amount"]), row["project_id"],
+                                   row["reward_tier_id"] or "")
+            self._last_append = None
+
+    def _truncate(self, size: int, idx_size: int):
+        with self._path.open("r+b") as f:
+            f.truncate(size)
+        if self._idx_path.exists():
+            with self._idx_path.open("r+b") as f:
+                f.truncate(idx_size)
+
+    # ---------------- Queries ----------------
+    def count(self, project_id: str) -> int:
+        return len(self._offsets.get(project_id, ()))
+
+    def counts(self) -> Dict[str, int]:
+        return {pid: len(offs) for pid, offs in self._offsets.items()}
+
+    def read_project(self, project_id: str, start: int = 0, limit: Optional[int] = None, newest_first: bool = True) -> List[PledgeRecord]:
+        return self._read_offsets(self._offsets.get(project_id, []), start, limit, newest_first)
+
+    def _read_offsets(self, offs: List[int], start: int, limit: Optional[int], newest_first: bool) -> List[PledgeRecord]:
+        if newest_first:
+            offs = offs[::-1]
+        offs = offs[start:] if limit is None else offs[start:start + limit]
+        out: List[PledgeRecord] = []
+        with self._path.open("rb") as f:
+            for off in offs:
+                f.seek(off)
+                row = self._parse(f.readline())
+                if row is not None:
+                    out.append(row)
+        return out
+
+    # ---------------- Queries รายผู้ใช้ (ผ่าน UserPledgeIndex) ----------------
+    def user_count(self, user_id: str) -> int:
+        users = self._user_index()
+        with self._lock:
+            return len(users.offsets.get(user_id, ()))
+
+    def user_total_cents(self, user_id: str) -> int:
+        users = self._user_index()
+        with self._lock:
+            return users.cents.get(user_id, 0)
+
+    def user_claims(self, user_id: str) -> Dict[Tuple[str, str], int]:
+        """(project_id, reward_tier_id) -> จำนวน pledge ของผู้ใช้ (tier ว่าง = สนับสนุนโดยไม่รับรางวัล)"""
+        users = self._user_index()
+        with self._lock:
+            return dict(users.claims.get(user_id, {}))
+
+    def read_user(self, user_id: str, start: int = 0, limit: Optional[int] = None, newest_first: bool = True) -> List[PledgeRecord]:
+        users = self._user_index()
+        with self._lock:
+            offs = sorted(users.offsets.get(user_id, ()))
+        return self._read_offsets(offs, start, limit, newest_first)
+
+    def iter_since(self, project_ids: Iterable[str], since: datetime) -> Iterator[PledgeRecord]:
+        """
+        pledge ของแต่ละโครงการที่ created_at ไม่เก่ากว่า since (ใหม่ → เก่า ทีละโครงการ)
+        เดินดัชนีจากท้ายและหยุดที่แถวแรกที่เก่ากว่า → อ่านเฉพาะส่วนท้ายของประวัติ
+        เปิดไฟล์ครั้งเดียวสำหรับทุกโครงการ (ใช้ seed ตัวนับช่วงเวลา)
+        """
+        if not self._path.exists():
+            return
+        with self._path.open("rb") as f:
+            for pid in project_ids:
+                for off in reversed(self._offsets.get(pid, ())):
+                    f.seek(off)
+                    row = self._parse(f.readline())
+                    if row is None:
+                        continue
+                    try:
+                        when = datetime.fromisoformat(row.created_at)
+                    except ValueError:
+                        continue
+                    if when < since:
+                        break
+                    yield row
+
+    def _row_at(self, offset: int) -> Optional[PledgeRecord]:
+        if not self._path.exists() or offset >= self._path.stat().st_size:
+            return None
+        with self._path.open("rb") as f:
+            f.seek(offset)
+            return self._parse(f.readline())
+
+    @staticmethod
+    def _parse(line: bytes) -> Optional[PledgeRecord]:
+        row = next(csv.reader([line.decode("utf-8")]), None)
+        if not row or len(row) < len(PLEDGE_HEADERS):
+            return None
+        return PledgeRecord(*row[:len(PLEDGE_HEADERS)])
+
+    # ---------------- Migration / verification ----------------
+    def verify(self, raised_by_project: Dict[str, int]) -> List[str]:
+        """
+        ตรวจว่า (1) ทุก offset ในดัชนีชี้ไปที่ pledge ของโครงการนั้นจริง
+        (2) ดัชนีครอบคลุมทุกแถวใน pledges.csv และ (3) ผลรวม pledge ตรงกับ raised_amount แบบตรงทุกสตางค์
+        คืนรายการปัญหาที่พบ (ว่าง = ผ่าน)
+        """
+        problems: List[str] = []
+        indexed = 0
+        for pid, offs in self._offsets.items():
+            for row in self.read_project(pid, newest_first=False):
+                if row.project_id != pid:
+                    problems.append(f"ดัชนีของ {pid} ชี้ไปที่ pledge {row.pledge_id} ของ {row.project_id}")
+            indexed += len(offs)
+        scan = scan_pledges(self._path)
+        for pid, total in scan.cents.items():
+            if pid in raised_by_project and total != raised_by_project[pid]:
+                problems.append(f"{pid}: ผลรวม pledge {format_cents(total)} ไม่ตรงกับ raised_amount {format_cents(raised_by_project[pid])}")
+        rows = sum(scan.counts.values())
+        if rows != indexed:
+            problems.append(f"pledges.csv มี {rows} แถว แต่ดัชนีมี {indexed} แถว")
+        return problems
+
+
+LEGACY_USER_PREFIX = "u-"   # ข้อมูลเก่าบางชุดเก็บผู้ใช้เป็น "u-<username>" แทน user_id ของ users.csv
+
+
+def migrate_user_ids(db_dir: Path) -> Tuple[int, List[str]]:
+    """
+    แปลง user_id แบบเก่า "u-<username>" ใน pledges.csv เป็น user_id ของ users.csv (เช่น u-alice → U001)
+    แถวอื่นคงไว้ทั้งบรรทัด เขียนสำเนาแล้วสลับ (ผู้เรียกต้องสร้างดัชนีใหม่ต่อ เพราะ offset เปลี่ยน)
+    คืน (จำนวนแถวที่แปลง, รหัสแบบเก่าที่ไม่พบใน users.csv — เป็นผู้สนับสนุนที่ไม่มีบัญชี จึงคงไว้)
+    """
+    path = db_dir / "pledges.csv"
+    with (db_dir / "users.csv").open("r", newline="", encoding="utf-8") as f:
+        by_name = {LEGACY_USER_PREFIX + r["username"]: r["user_id"] for r in csv.DictReader(f)}
+    out = io.StringIO()
+    changed, unknown = 0, set()
+    with path.open("r", newline="", encoding="utf-8") as f:
+        header = f.readline()
+        out.write(header)
+        user_i = next(csv.reader([header])).index("user_id")
+        for line in f:
+            row = next(csv.reader([line]), None)
+            uid = row[user_i] if row and len(row) > user_i else ""
+            if not uid.startswith(LEGACY_USER_PREFIX):
+                out.write(line)
+            elif uid in by_name:
+                row[user_i] = by_name[uid]
+                buf = io.StringIO()
+                csv.writer(buf, lineterminator="\n").writerow(row)
+                out.write(buf.getvalue() if line.endswith("\n") else buf.getvalue().rstrip("\n"))
+                changed += 1
+            else:
+                unknown.add(uid)
+                out.write(line)
+    if changed:
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(out.getvalue(), encoding="utf-8", newline="")
+        os.replace(tmp, path)
+    return changed, sorted(unknown)
+
+
+def _raised_from_projects(db_dir: Path) -> Dict[str, int]:
+    with (db_dir / "project.csv").open("r", newline="", encoding="utf-8") as f:
+        return {r["project_id"]: parse_cents(r["raised_amount"]) for r in csv.DictReader(f)}
+
+
+def main(argv: List[str]) -> int:
+    """
+    python -m Model.pledge_store migrate [Database]  → แปลง user_id แบบ "u-<username>" เป็นรหัสใน users.csv
+                                                       สร้างดัชนีใหม่จาก pledges.csv แล้วตรวจสอบ
+    python -m Model.pledge_store verify  [Database]  → ตรวจสอบอย่างเดียว
+    """
+    if not argv or argv[0] not in ("migrate", "verify"):
+        print(main.__doc__)
+        return 2
+    db_dir = Path(argv[1]) if len(argv) > 1 else Path("Database")
+    if argv[0] == "migrate":
+        changed, unknown = migrate_user_ids(db_dir)
+        print(f"แปลง user_id แล้ว {changed} แถว")
+        if unknown:
+            print("ไม่พบใน users.csv (คงไว้):", ", ".join(unknown))
+    store = PledgeStore(db_dir)
+    if argv[0] == "migrate":
+        store.rebuild_index()
+        print(f"สร้างดัชนีแล้ว: {sum(store.counts().values())} pledges / {len(store.counts())} โครงการ")
+    problems = store.verify(_raised_from_projects(db_dir))
+    for p in problems:
+        print("ไม่ผ่าน:", p)
+    if not problems:
+        print("ตรวจสอบผ่าน")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
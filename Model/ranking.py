@@ -0,0 +1,204 @@
+# Model/ranking.py
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional, Tuple
+from collections import deque
+from datetime import date, datetime
+import heapq
+import threading
+
+# --- โหมดการเรียงบนหน้ารวมโครงการ ---
+SORT_DEADLINE = "deadline"
+SORT_TRENDING_1H = "trending_1h"
+SORT_TRENDING_24H = "trending_24h"
+SORT_RAISED = "raised"
+SORT_CLOSEST_TO_GOAL = "closest_to_goal"
+
+SORT_LABELS = {
+    SORT_DEADLINE: "ใกล้หมดเวลาก่อน",
+    SORT_TRENDING_1H: "มาแรง (1 ชม.)",
+    SORT_TRENDING_24H: "มาแรง (24 ชม.)",
+    SORT_RAISED: "ยอดระดมสูงสุด",
+    SORT_CLOSEST_TO_GOAL: "ใกล้ถึงเป้าที่สุด",
+}
+
+# ชื่อหน้าต่างเวลา -> (ความยาวหน้าต่าง, ความกว้าง bucket) หน่วยวินาที
+WINDOWS = {"1h": (3600, 60), "24h": (86400, 3600)}
+
+
+class SlidingWindowCounter:
+    """
+    นับจำนวน pledge / ยอดสตางค์ในช่วงเวลาล่าสุดด้วย bucket ที่หมดอายุเป็นช่วง ๆ
+    add() เป็น O(1) (amortized), total() ทิ้ง bucket ที่หลุดหน้าต่างออกก่อนตอบ
+    """
+
+    def __init__(self, window_s: int, bucket_s: int):
+        self.window_s = window_s
+        self.bucket_s = bucket_s
+        self._buckets: deque = deque()   # [bucket_start, count, cents]
+        self.count = 0
+        self.cents = 0
+
+    def add(self, ts: float, cents: int):
+        start = int(ts) - int(ts) % self.bucket_s
+        if self._buckets and self._buckets[-1][0] == start:
+            b = self._buckets[-1]
+            b[1] += 1
+            b[2] += cents
+        elif self._buckets and start < self._buckets[-1][0]:
+            # pledge ย้อนเวลา (เช่นตอน seed) → ใส่ bucket ที่ตรงช่วง
+            for b in self._buckets:
+                if b[0] == start:
+                    b[1] += 1
+                    b[2] += cents
+                    break
+            else:
+                self._buckets.append([start, 1, cents])
+                self._buckets = deque(sorted(self._buckets))
+        else:
+            self._buckets.append([start, 1, cents])
+        self.count += 1
+        self.cents += cents
+
+    def expire(self, now_ts: float):
+        cutoff = now_ts - self.window_s
+        while self._buckets and self._buckets[0][0] + self.bucket_s <= cutoff:
+            _, n, c = self._buckets.popleft()
+            self.count -= n
+            self.cents -= c
+
+    def total(self, now_ts: float) -> Tuple[int, int]:
+        self.expire(now_ts)
+        return self.count, self.cents
+
+
+class RankingEngine:
+    """
+    ตัวจัดอันดับโครงการ
+    - ความเร็ว (velocity): SlidingWindowCounter ต่อโครงการ ต่อหน้าต่างเวลา (1 ชม. / 24 ชม.)
+    - ยอดระดมสูงสุด: max-heap แบบ lazy (push ค่าใหม่ทุก pledge O(log N), ค่าเก่าทิ้งตอน query)
+    - ใกล้ถึงเป้า / ใกล้หมดเวลา: heapq.nsmallest บนข้อมูลโครงการจาก snapshot
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows: Dict[str, Dict[str, SlidingWindowCounter]] = {name: {} for name in WINDOWS}
+        self._raised: Dict[str, int] = {}
+        self._raised_heap: List[Tuple[int, str]] = []   # (-raised_cents, project_id)
+
+    # ---------------- Updates ----------------
+    def set_raised(self, project_id: str, raised_cents: int):
+        with self._lock:
+            self._set_raised(project_id, raised_cents)
+
+    def _set_raised(self, project_id: str, raised_cents: int):
+        if self._raised.get(project_id) == raised_cents:
+            return
+        self._raised[project_id] = raised_cents
+        heapq.heappush(self._raised_heap, (-raised_cents, project_id))
+        if len(self._raised_heap) > 4 * len(self._raised) + 64:
+            # entry เก่าสะสมเยอะเกิน → สร้าง heap ใหม่จากค่าปัจจุบัน
+            self._raised_heap = [(-c, pid) for pid, c in self._raised.items()]
+            heapq.heapify(self._raised_heap)
+
+    def seed(self, projects: Iterable, recent: Iterable[Tuple[str, int, datetime]]):
+        """เติมค่าเริ่มต้นจาก snapshot (ยอดระดม) และ pledge ล่าสุด (project_id, สตางค์, เวลา)"""
+        with self._lock:
+            for p in projects:
+                self._set_raised(p.project_id, p.raised_cents)
+            for pid, cents, when in recent:
+                self._add_to_windows(pid, cents, when.timestamp())
+
+    def _add_to_windows(self, project_id: str, cents: int, ts: float):
+        for name, (window_s, bucket_s) in WINDOWS.items():
+            counters = self._windows[name]
+            c = counters.get(project_id)
+            if c is None:
+                c = counters[project_id] = SlidingWindowCounter(window_s, bucket_s)
+            c.add(ts, cents)
+
+    def record_pledge(self, project_id: str, amount_cents: int, raised_cents: int, when: datetime):
+        with self._lock:
+            self._add_to_windows(project_id, amount_cents, when.timestamp())
+            self._set_raised(project_id, raised_cents)
+
+    # ---------------- Queries ----------------
+    def velocity(self, window: str, now: Optional[datetime] = None) -> Dict[str, int]:
+        """project_id -> จำนวน pledge ในหน้าต่างเวลา (เฉพาะโครงการที่มีความเคลื่อนไหว)"""
+        now_ts = (now or datetime.now()).timestamp()
+        with self._lock:
+            counters = self._windows[window]
+            out = {}
+            for pid in list(counters):
+                n, _ = counters[pid].total(now_ts)
+                if n:
+                    out[pid] = n
+                else:
+                    del counters[pid]
+            return out
+
+    def top_velocity(self, window: str, n: int, now: Optional[datetime] = None) -> List[Tuple[str, int]]:
+        return heapq.nlargest(n, self.velocity(window, now).items(), key=lambda kv: kv[1])
+
+    def top_raised(self, n: int) -> List[Tuple[str, int]]:
+        with self._lock:
+            out: List[Tuple[str, int]] = []
+            kept = []
+            seen = set()
+            while self._raised_heap and len(out) < n:
+                neg, pid = heapq.heappop(self._raised_heap)
+                if pid in seen or self._raised.get(pid) != -neg:
+                    continue   # ค่าเก่าที่ถูกแทนแล้ว
+                seen.add(pid)
+                out.append((pid, -neg))
+                kept.append((neg, pid))
+            for item in kept:
+                heapq.heappush(self._raised_heap, item)
+            return out
+
+    @staticmethod
+    def top_closest_to_goal(projects: Iterable, n: int, today: Optional[date] = None) -> List[Tuple[str, int]]:
+        """โครงการที่ยังไม่ถึงเป้าและยังไม่หมดเขต เรียงตามยอดที่ขาด (สตางค์) น้อยไปมาก"""
+        today = today or date.today()
+        remaining = ((p.project_id, p.goal_cents - p.raised_cents) for p in projects
+                     if p.raised_cents < p.goal_cents and p.deadline >= today)
+        return heapq.nsmallest(n, remaining, key=lambda kv: kv[1])
+
+    @staticmethod
+    def top_ending_soon(projects: Iterable, n: int, today: Optional[date] = None) -> List[Tuple[str, int]]:
+        """โครงการที่ยังไม่หมดเขต เรียงตามจำนวนวันที่เหลือ"""
+        today = today or date.today()
+        left = ((p.project_id, (p.deadline - today).days) for p in projects if p.deadline >= today)
+        return heapq.nsmallest(n, left, key=lambda kv: kv[1])
+
+    def order(self, mode: str, projects: List, today: Optional[date] = None) -> List:
+        """
+        เรียงโครงการทั้งหมดตามโหมด — โครงการที่ติดอันดับมาก่อน ที่เหลือเรียงตาม deadline ต่อท้าย
+        """
+        by_deadline = sorted(projects, key=lambda p: p.deadline)
+        if mode == SORT_TRENDING_1H:
+            ranked = [pid for pid, _ in self.top_velocity("1h", len(projects))]
+        elif mode == SORT_TRENDING_24H:
+            ranked = [pid for pid, _ in self.top_velocity("24h", len(projects))]
+        elif mode == SORT_RAISED:
+            ranked = [pid for pid, _ in self.top_raised(len(projects))]
+        elif mode == SORT_CLOSEST_TO_GOAL:
+            ranked = [pid for pid, _ in self.top_closest_to_goal(projects, len(projects), today)]
+        else:
+            return by_deadline
+        by_id = {p.project_id: p for p in projects}
+        head = [by_id[pid] for pid in ranked if pid in by_id]
+        in_head = set(ranked)
+        return head + [p for p in by_deadline if p.project_id not in in_head]
+
+    def leaderboard(self, projects: List, n: int = 5, today: Optional[date] = None) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        อันดับ top-N ทุกหมวดในครั้งเดียว: โหมด -> [(project_id, ค่า)]
+        ค่า = จำนวน pledge ในหน้าต่าง / ยอดระดม (สตางค์) / ยอดที่ขาด (สตางค์) / จำนวนวันที่เหลือ
+        """
+        return {
+            SORT_TRENDING_1H: self.top_velocity("1h", n),
+            SORT_TRENDING_24H: self.top_velocity("24h", n),
+            SORT_RAISED: self.top_raised(n),
+            SORT_CLOSEST_TO_GOAL: self.top_closest_to_goal(projects, n, today),
+            SORT_DEADLINE: self.top_ending_soon(projects, n, today),
+        }
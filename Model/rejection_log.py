@@ -0,0 +1,150 @@
+# Model/rejection_log.py
+from __future__ import annotations
+from typing import Dict, Optional
+from datetime import datetime
+from pathlib import Path
+import csv
+import io
+import json
+import os
+import threading
+import time
+
+# --- รหัสเหตุผลที่ pledge ถูกปฏิเสธ ---
+REASON_EXPIRED = "expired"
+REASON_BELOW_MINIMUM = "below_minimum"
+REASON_QUOTA_FULL = "quota_full"
+REASON_UNKNOWN_PROJECT = "unknown_project"
+REASON_UNKNOWN_TIER = "unknown_tier"
+REASON_INVALID_AMOUNT = "invalid_amount"
+REASON_USER_LIMIT = "user_limit"
+REASON_OTHER = "other"
+
+REASON_LABELS = {
+    REASON_EXPIRED: "หมดเขต",
+    REASON_BELOW_MINIMUM: "ต่ำกว่าขั้นต่ำ",
+    REASON_QUOTA_FULL: "รางวัลเต็ม",
+    REASON_UNKNOWN_PROJECT: "ไม่พบโครงการ",
+    REASON_UNKNOWN_TIER: "ไม่พบ Tier",
+    REASON_INVALID_AMOUNT: "จำนวนเงินไม่ถูกต้อง",
+    REASON_USER_LIMIT: "เกินวงเงินต่อผู้ใช้",
+    REASON_OTHER: "อื่น ๆ",
+}
+
+
+# เขียน checkpoint อย่างช้าทุกเท่านี้วินาที (เมื่อมีเหตุการณ์ค้าง) — ผู้ใช้ที่มี event loop เรียก flush() ตามรอบนี้
+CHECKPOINT_INTERVAL_S = 30.0
+
+
+class PledgeRejected(ValueError):
+    """ValueError ที่พกรหัสเหตุผลไว้ด้วย (ข้อความยังเป็นข้อความเดิมสำหรับ errorOccurred)"""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class RejectionLog:
+    """
+    บันทึกการปฏิเสธ pledge แบบต่อท้ายไฟล์ (append-only) แทนการเขียน project.csv ใหม่ทั้งไฟล์
+    - rejections.log        : หนึ่งบรรทัดต่อเหตุการณ์ "epoch,project_id,code" (แถว CSV)
+    - rejections.checkpoint : ยอดนับสะสม + ตำแหน่ง byte ใน log ที่นับถึงแล้ว (JSON)
+    ตัวนับหลักอยู่ในหน่วยความจำ ตอนเปิดโปรแกรมโหลด checkpoint แล้วอ่าน log ต่อจากตำแหน่งนั้น
+    checkpoint ถูกเขียนเมื่อครบ checkpoint_every เหตุการณ์ตอน record() และเมื่อเรียก flush() (ตามรอบเวลา / ตอนปิด)
+    """
+
+    LOG_NAME = "rejections.log"
+    CHECKPOINT_NAME = "rejections.checkpoint"
+
+    def __init__(self, db_dir: Path, checkpoint_every: int = 200, checkpoint_interval_s: float = CHECKPOINT_INTERVAL_S):
+        self._log_path = db_dir / self.LOG_NAME
+        self._cp_path = db_dir / self.CHECKPOINT_NAME
+        self._checkpoint_every = checkpoint_every
+        self._checkpoint_interval_s = checkpoint_interval_s
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+        self._load()
+
+    # ---------------- Load / checkpoint ----------------
+    def _load(self):
+        offset = 0
+        if self._cp_path.exists():
+            try:
+                cp = json.loads(self._cp_path.read_text(encoding="utf-8"))
+                offset = int(cp["offset"])
+                self._counts = {pid: dict(c) for pid, c in cp["counts"].items()}
+            except (ValueError, KeyError, TypeError):
+                offset, self._counts = 0, {}
+        size = self._log_path.stat().st_size if self._log_path.exists() else 0
+        if offset > size:
+            # log ถูกตัด/ลบไปแล้ว → checkpoint ใช้ไม่ได้ นับใหม่จากต้นไฟล์
+            offset, self._counts = 0, {}
+        if size > offset:
+            end = offset   # ท้ายบรรทัดสมบูรณ์บรรทัดสุดท้าย
+            with self._log_path.open("rb") as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break   # บรรทัดสุดท้ายเขียนไม่ครบ (โปรแกรมปิดกลางคัน)
+                    end += len(line)
+                    row = next(csv.reader([line.decode("utf-8").rstrip("\n")]), [])
+                    if len(row) == 3:
+                        self._add(row[1], row[2])
+                        self._since_checkpoint += 1
+            if end < size:
+                # ตัดเศษบรรทัดทิ้ง ไม่งั้น record() ครั้งถัดไปจะต่อท้ายเศษนั้น กลายเป็นบรรทัดเสียและเหตุการณ์นั้นหาย
+                with self._log_path.open("r+b") as f:
+                    f.truncate(end)
+
+    def checkpoint(self):
+        with self._lock:
+            self._write_checkpoint()
+
+    def flush(self):
+        """เขียน checkpoint ถ้ามีเหตุการณ์ที่ยังไม่ได้นับลง checkpoint (เรียกตามรอบเวลา และตอนปิดโปรแกรม)"""
+        with self._lock:
+            if self._since_checkpoint:
+                self._write_checkpoint()
+
+    def _write_checkpoint(self):
+        offset = self._log_path.stat().st_size if self._log_path.exists() else 0
+        tmp = self._cp_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"offset": offset, "counts": self._counts}), encoding="utf-8")
+        os.replace(tmp, self._cp_path)
+        self._since_checkpoint = 0
+        self._last_checkpoint = time.monotonic()
+
+    # ---------------- Record ----------------
+    def record(self, project_id: str, code: str, when: Optional[datetime] = None):
+        ts = int((when or datetime.now()).timestamp())
+        # หนึ่งเหตุการณ์ต้องเป็นหนึ่งบรรทัด: แทนตัวขึ้นบรรทัดใหม่ในรหัสด้วยช่องว่าง (รหัสโครงการจริงเป็นตัวเลข 8 หลัก
+        # จึงกระทบเฉพาะรหัสที่ไม่มีอยู่จริง) แล้วเขียนผ่าน csv ให้ , และ " ในรหัสถูก quote
+        project_id = project_id.replace("\r", " ").replace("\n", " ")
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerow([ts, project_id, code])
+        line = buf.getvalue().encode("utf-8")
+        with self._lock:
+            with self._log_path.open("ab") as f:
+                f.write(line)
+            self._add(project_id, code)
+            self._since_checkpoint += 1
+            if (self._since_checkpoint >= self._checkpoint_every
+                    or time.monotonic() - self._last_checkpoint >= self._checkpoint_interval_s):
+                self._write_checkpoint()
+
+    def _add(self, project_id: str, code: str):
+        per = self._counts.setdefault(project_id, {})
+        per[code] = per.get(code, 0) + 1
+
+    # ---------------- Queries ----------------
+    def count(self, project_id: str) -> int:
+        return sum(self._counts.get(project_id, {}).values())
+
+    def by_reason(self, project_id: str) -> Dict[str, int]:
+        return dict(self._counts.get(project_id, {}))
+
+    def by_project(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {pid: dict(c) for pid, c in self._counts.items()}
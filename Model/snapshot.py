@@ -0,0 +1,87 @@
+# Model/snapshot.py
+from __future__ import annotations
+from typing import Any, Mapping, Optional, Tuple
+from dataclasses import dataclass, field
+from types import MappingProxyType
+import copy
+
+from Model.funding_state import compute_state
+
+
+class RewardTierDTO:
+    def __init__(self, project_id: str, tier_id: str, title: str, minimum_cents: int, quota_left: int):
+        self.project_id = project_id
+        self.tier_id = tier_id
+        self.title = title
+        self.minimum_cents = minimum_cents
+        self.quota_left = quota_left
+
+
+def replace_dto(obj, **changes):
+    """สร้าง DTO ตัวใหม่ที่แก้เฉพาะฟิลด์ที่ระบุ (DTO ใน snapshot ห้ามแก้ในที่)"""
+    new = copy.copy(obj)
+    for k, v in changes.items():
+        setattr(new, k, v)
+    return new
+
+
+def _frozen(d: Optional[dict] = None) -> Mapping:
+    return MappingProxyType(dict(d or {}))
+
+
+@dataclass(frozen=True)
+class FundingSnapshot:
+    """
+    สถานะข้อมูลทั้งหมดของโมเดล ณ เวอร์ชันหนึ่ง — อ่านได้จากทุก thread โดยไม่ต้องล็อก
+    - ห้ามแก้ไข snapshot หรือ DTO ข้างใน; ผู้เขียนสร้างเวอร์ชันใหม่ด้วย evolve() แล้วสลับแทนที่ทั้งก้อน
+    - evolve() คัดลอกเฉพาะตารางที่เปลี่ยน ตารางที่ไม่เปลี่ยนใช้ร่วมกับเวอร์ชันก่อนหน้า
+    - funding (FundingState) เป็นตารางที่คำนวณจาก projects/tiers/goals — build()/evolve() ทำให้เอง ผู้เขียนไม่ต้องส่งมา
+    """
+
+    version: int = 0
+    projects: Mapping[str, Any] = field(default_factory=_frozen)           # project_id -> ProjectDTO
+    tiers: Mapping[str, Tuple[Any, ...]] = field(default_factory=_frozen)   # project_id -> tuple[RewardTierDTO]
+    goals: Mapping[str, Tuple[Any, ...]] = field(default_factory=_frozen)   # project_id -> tuple[StretchGoalDTO]
+    pledge_counts: Mapping[str, int] = field(default_factory=_frozen)       # project_id -> จำนวน pledge
+    funding: Mapping[str, Any] = field(default_factory=_frozen)            # project_id -> FundingState
+
+    @classmethod
+    def build(cls, *, projects: dict, tiers: dict, goals: dict, pledge_counts: dict) -> "FundingSnapshot":
+        tiers = {pid: tuple(ts) for pid, ts in tiers.items()}
+        goals = {pid: tuple(gs) for pid, gs in goals.items()}
+        return cls(
+            version=1,
+            projects=_frozen(projects),
+            tiers=_frozen(tiers),
+            goals=_frozen(goals),
+            pledge_counts=_frozen(pledge_counts),
+            funding=_frozen({pid: compute_state(p, tiers.get(pid, ()), goals.get(pid, ())) for pid, p in projects.items()}),
+        )
+
+    def evolve(self, *, projects: Optional[dict] = None, tiers: Optional[dict] = None,
+               goals: Optional[dict] = None, pledge_counts: Optional[dict] = None) -> "FundingSnapshot":
+        """คืน snapshot เวอร์ชันถัดไป โดยรวม entry ที่ส่งมา (แทนที่ราย project_id) เข้ากับของเดิม"""
+        def merged(current: Mapping, changes: Optional[dict], as_tuple: bool = False) -> Mapping:
+            if not changes:
+                return current
+            d = dict(current)
+            d.update({k: tuple(v) for k, v in changes.items()} if as_tuple else changes)
+            return MappingProxyType(d)
+
+        new_projects = merged(self.projects, projects)
+        new_tiers = merged(self.tiers, tiers, as_tuple=True)
+        new_goals = merged(self.goals, goals, as_tuple=True)
+        # คำนวณ FundingState ใหม่เฉพาะโครงการที่ projects/tiers/goals ถูกแตะในรอบนี้ (อยู่ในเวอร์ชันเดียวกับข้อมูลต้นทาง)
+        touched = set(projects or ()) | set(tiers or ()) | set(goals or ())
+        funding = {
+            pid: compute_state(new_projects[pid], new_tiers.get(pid, ()), new_goals.get(pid, ()))
+            for pid in touched if pid in new_projects
+        }
+        return FundingSnapshot(
+            version=self.version + 1,
+            projects=new_projects,
+            tiers=new_tiers,
+            goals=new_goals,
+            pledge_counts=merged(self.pledge_counts, pledge_counts),
+            funding=merged(self.funding, funding),
+        )
@@ -0,0 +1,181 @@
+# Model/state_cache.py
+from __future__ import annotations
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple, Union
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+
+# เปลี่ยนเลขนี้เมื่อโครงสร้างข้อมูลที่เก็บ (DTO / ตาราง) เปลี่ยน → cache เก่าถูกทิ้งทั้งไฟล์
+FORMAT_VERSION = 3
+
+# (size, mtime_ns, content hash แบบ hex) ต่อไฟล์ต้นทาง
+FileSignature = Tuple[int, int, str]
+Signature = Tuple[FileSignature, ...]
+Sources = Union[Path, Sequence[Path]]
+
+
+def _as_tuple(sources: Sources) -> Tuple[Path, ...]:
+    return (sources,) if isinstance(sources, Path) else tuple(sources)
+
+
+def _digest(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Codec:
+    """
+    แปลงข้อมูลของตารางหนึ่ง ↔ ค่าที่ JSON เก็บได้ (dict / list / str / int / bool / None)
+    cache เก็บเฉพาะข้อมูลล้วน ไม่เก็บ object ของ Python — ไฟล์ cache ที่ถูกแก้จึงทำได้แค่ให้ข้อมูลผิด ไม่ได้รันโค้ด
+    """
+
+    def __init__(self, encode: Callable[[Any], Any], decode: Callable[[Any], Any]):
+        self.encode = encode
+        self.decode = decode
+
+
+def rows_codec(to_row: Callable[[Any], list], from_row: Callable[[list], Any], key: str, grouped: bool = False) -> Codec:
+    """
+    Codec ของตารางรูป {key: DTO} (grouped=False) หรือ {key: [DTO, ...]} (grouped=True)
+    เก็บเป็น list ของแถว (to_row) — ตอนอ่านสร้าง DTO ด้วย from_row แล้วจัดกลุ่มตาม attribute ชื่อ key ตามลำดับเดิม
+    """
+    def encode(table) -> list:
+        items = (dto for dtos in table.values() for dto in dtos) if grouped else table.values()
+        return [to_row(dto) for dto in items]
+
+    def decode(rows: list):
+        out: Dict[str, Any] = {}
+        for row in rows:
+            dto = from_row(row)
+            if grouped:
+                out.setdefault(getattr(dto, key), []).append(dto)
+            else:
+                out[getattr(dto, key)] = dto
+        return out
+
+    return Codec(encode, decode)
+
+
+class StateCache:
+    """
+    cache ของตารางที่ parse แล้ว (Database/state.cache) — โหลดทั้งไฟล์ด้วยการอ่านครั้งเดียว
+    - แต่ละตารางผูกกับไฟล์ต้นทาง (หนึ่งไฟล์หรือมากกว่า) ด้วย (size, mtime_ns, hash เนื้อหา) ของแต่ละไฟล์
+    - ตรวจ size/mtime ก่อน; hash คำนวณเฉพาะเมื่อ size เท่าเดิมแต่ mtime เปลี่ยน (เช่นไฟล์ถูก touch / copy)
+    - ตารางไหนไม่ตรงก็ parse ใหม่เฉพาะตารางนั้น (ตารางอื่นยังใช้ cache ได้)
+    - เก็บเป็น JSON: ผู้เรียกส่ง Codec มาแปลงข้อมูลของตารางเข้า/ออก (ในหน่วยความจำเก็บแบบ encode แล้ว)
+    ไฟล์นี้เป็นแค่ตัวเร่ง ลบทิ้งได้ทุกเมื่อ; อ่านไม่ได้/เวอร์ชันไม่ตรง = เริ่มจาก cache ว่าง
+    """
+
+    CACHE_NAME = "state.cache"
+
+    def __init__(self, db_dir: Path):
+        self._path = db_dir / self.CACHE_NAME
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Tuple[Signature, Any]] = {}   # ข้อมูลเก็บแบบ encode แล้ว (JSON ได้)
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            blob = json.loads(self._path.read_bytes())
+            if not isinstance(blob, dict) or blob.get("version") != FORMAT_VERSION:
+                return
+            self._tables = {
+                table: (tuple((int(size), int(mtime_ns), str(digest)) for size, mtime_ns, digest in sigs), data)
+                for table, (sigs, data) in blob["tables"].items()
+            }
+        except Exception:
+            self._tables = {}
+
+    # ---------------- Lookup ----------------
+    def is_fresh(self, table: str, sources: Sources) -> bool:
+        return self._check(table, _as_tuple(sources)) is not None
+
+    def get(self, table: str, sources: Sources, codec: Codec) -> Optional[Any]:
+        entry = self._check(table, _as_tuple(sources))
+        if entry is None:
+            return None
+        try:
+            return codec.decode(entry[1])
+        except Exception:
+            return None   # รูปข้อมูลไม่ตรงกับ codec (ไฟล์เสีย / ลืมเพิ่ม FORMAT_VERSION) → ถือว่าไม่มีใน cache
+
+    def _check(self, table: str, sources: Tuple[Path, ...]) -> Optional[Tuple[Signature, Any]]:
+        entry = self._tables.get(table)
+        if entry is None or len(entry[0]) != len(sources):
+            return None
+        sigs, data = entry
+        new_sigs = []
+        for source, (size, mtime_ns, digest) in zip(sources, sigs):
+            try:
+                st = source.stat()
+            except OSError:
+                return None
+            if st.st_size != size:
+                return None
+            # mtime เปลี่ยนแต่ขนาดเท่าเดิม → ดูเนื้อหา
+            if st.st_mtime_ns != mtime_ns and _digest(source) != digest:
+                return None
+            new_sigs.append((size, st.st_mtime_ns, digest))
+        if tuple(new_sigs) != sigs:
+            with self._lock:
+                entry = (tuple(new_sigs), data)
+                self._tables[table] = entry
+                self._dirty = True
+        return entry
+
+    def load(self, table: str, sources: Sources, parse: Callable[[], Any], codec: Codec) -> Any:
+        """คืนข้อมูลจาก cache ถ้ายังตรงกับไฟล์ ไม่งั้นเรียก parse() แล้วเก็บผลลง cache"""
+        data = self.get(table, sources, codec)
+        if data is None:
+            sig = self.signature(sources)   # จับ signature ก่อน parse: ถ้าไฟล์เปลี่ยนระหว่างนั้น ครั้งหน้าจะไม่ตรงเอง
+            data = parse()
+            if sig is not None:
+                self.put(table, sig, data, codec)
+        return data
+
+    # ---------------- Update ----------------
+    @staticmethod
+    def signature(sources: Sources) -> Optional[Signature]:
+        sigs = []
+        for source in _as_tuple(sources):
+            try:
+                st = source.stat()
+                sigs.append((st.st_size, st.st_mtime_ns, _digest(source)))
+            except OSError:
+                return None
+        return tuple(sigs)
+
+    def put(self, table: str, sig: Signature, data: Any, codec: Codec):
+        encoded = codec.encode(data)
+        with self._lock:
+            self._tables[table] = (sig, encoded)
+            self._dirty = True
+
+    def invalidate(self, table: Optional[str] = None):
+        with self._lock:
+            if table is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(table, None)
+            self._dirty = True
+
+    def save(self):
+        """เขียน cache ลงไฟล์ (ไฟล์ชั่วคราว + os.replace) เฉพาะเมื่อมีการเปลี่ยนแปลง"""
+        with self._lock:
+            if not self._dirty:
+                return
+            blob = json.dumps({"version": FORMAT_VERSION, "tables": self._tables},
+                              ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            self._dirty = False
+        tmp = self._path.with_name(self._path.name + ".tmp")
+        try:
+            tmp.write_bytes(blob)
+            os.replace(tmp, self._path)
+        except OSError:
+            pass   # เขียน cache ไม่ได้ไม่ใช่ข้อผิดพลาดของโปรแกรม — รอบหน้าแค่ parse CSV ตามปกติ
@@ -0,0 +1,235 @@
+# Model/stats_export.py
+from __future__ import annotations
+from typing import Callable, Dict, Iterator, List, Optional
+from pathlib import Path
+import csv
+import io
+import json
+import os
+import sys
+import time
+
+from Model.factory import make_model
+from Model.money import format_cents
+
+# คอลัมน์ของไฟล์ export (CSV ใช้ลำดับนี้; JSONL ใช้ชื่อเดียวกันเป็น key)
+COLUMNS = [
+    "project_id", "name", "goal_amount", "raised_amount", "funded", "percent",
+    "pledge_count", "rejected_count", "rejected_by_reason", "unlocked_goals",
+    "next_threshold", "to_next_unlock", "tiers_remaining",
+]
+TOTAL_ID = "TOTAL"      # แถวสรุปท้ายไฟล์ CSV (JSONL ใช้ "type": "summary" แทน)
+CHUNK_ROWS = 2000       # จำนวนแถวต่อการเขียนหนึ่งครั้ง / ต่อการรายงานความคืบหน้าหนึ่งครั้ง
+
+FORMATS = ("csv", "jsonl")
+
+
+class ExportSummary:
+    """ยอดรวมที่สะสมไประหว่างสตรีมแถว (หน่วยความจำคงที่ ไม่เก็บแถวไว้)"""
+
+    def __init__(self):
+        self.projects = 0
+        self.funded = 0
+        self.goal_cents = 0
+        self.raised_cents = 0
+        self.pledges = 0
+        self.rejected = 0
+        self.rejected_by_reason: Dict[str, int] = {}
+
+    def add(self, row: dict):
+        self.projects += 1
+        self.funded += 1 if row["funded"] else 0
+        self.goal_cents += row["goal_cents"]
+        self.raised_cents += row["raised_cents"]
+        self.pledges += row["pledge_count"]
+        self.rejected += row["rejected_count"]
+
+    def add_reasons(self, by_reason: Dict[str, int]):
+        for code, n in by_reason.items():
+            self.rejected_by_reason[code] = self.rejected_by_reason.get(code, 0) + n
+
+
+class ExportResult:
+    def __init__(self, path: Path, fmt: str, rows: int, summary: ExportSummary, cancelled: bool, elapsed_s: float):
+        self.path = path
+        self.fmt = fmt
+        self.rows = rows
+        self.summary = summary
+        self.cancelled = cancelled      # True = ผู้ใช้ยกเลิก ไฟล์ปลายทางไม่ถูกสร้าง/แก้
+        self.elapsed_s = elapsed_s
+
+
+# ---------------- Rows (generator) ----------------
+def iter_project_stats(snapshot, rejections_by_reason: Dict[str, Dict[str, int]], summary: ExportSummary) -> Iterator[dict]:
+    """
+    ไล่โครงการใน snapshot เดียว (ข้อมูลทุกแถวมาจากเวอร์ชันเดียวกัน) แล้ว yield แถวละโครงการ
+    funded / % / SG ถัดไป มาจาก FundingState ใน snapshot; ยอดรวมสะสมลง summary ระหว่างทาง
+    """
+    for pid, p in snapshot.projects.items():
+        state = snapshot.funding.get(pid)
+        reasons = rejections_by_reason.get(pid, {})
+        row = {
+            "project_id": pid,
+            "name": p.name,
+            "goal_cents": p.goal_cents,
+            "raised_cents": p.raised_cents,
+            "funded": state.funded if state else False,
+            "percent": state.percent if state else 0,
+            "pledge_count": snapshot.pledge_counts.get(pid, 0),
+            "rejected_count": p.rejected_count,
+            "rejected_by_reason": reasons,
+            "unlocked_goals": list(state.unlocked_goals) if state else [],
+            "next_threshold_cents": state.next_threshold_cents if state else None,
+            "to_next_unlock_cents": state.to_next_unlock_cents if state else None,
+            "tiers_remaining": state.tiers_remaining if state else 0,
+        }
+        summary.add(row)
+        summary.add_reasons(reasons)
+        yield row
+    # pledge ที่อ้าง project_id ที่ไม่มีอยู่จริงก็นับเป็นการปฏิเสธ (เหมือนหน้าสถิติ)
+    for pid, per in rejections_by_reason.items():
+        if pid not in snapshot.projects:
+            summary.rejected += sum(per.values())
+            summary.add_reasons(per)
+
+
+def _money(cents: Optional[int]) -> Optional[str]:
+    return None if cents is None else format_cents(cents)
+
+
+def _jsonl_row(row: dict) -> dict:
+    return {
+        "type": "project",
+        "project_id": row["project_id"],
+        "name": row["name"],
+        "goal_amount": format_cents(row["goal_cents"]),
+        "raised_amount": format_cents(row["raised_cents"]),
+        "funded": row["funded"],
+        "percent": row["percent"],
+        "pledge_count": row["pledge_count"],
+        "rejected_count": row["rejected_count"],
+        "rejected_by_reason": row["rejected_by_reason"],
+        "unlocked_goals": row["unlocked_goals"],
+        "next_threshold": _money(row["next_threshold_cents"]),
+        "to_next_unlock": _money(row["to_next_unlock_cents"]),
+        "tiers_remaining": row["tiers_remaining"],
+    }
+
+
+def _csv_row(row: dict) -> list:
+    return [
+        row["project_id"], row["name"], format_cents(row["goal_cents"]), format_cents(row["raised_cents"]),
+        "1" if row["funded"] else "0", row["percent"], row["pledge_count"], row["rejected_count"],
+        ";".join(f"{code}={n}" for code, n in sorted(row["rejected_by_reason"].items())),
+        " | ".join(row["unlocked_goals"]),
+        _money(row["next_threshold_cents"]) or "", _money(row["to_next_unlock_cents"]) or "",
+        row["tiers_remaining"],
+    ]
+
+
+def _summary_jsonl(s: ExportSummary, mode_label: str) -> dict:
+    return {
+        "type": "summary", "mode": mode_label, "projects": s.projects, "funded_projects": s.funded,
+        "goal_amount": format_cents(s.goal_cents), "raised_amount": format_cents(s.raised_cents),
+        "pledges": s.pledges, "rejected": s.rejected, "rejected_by_reason": s.rejected_by_reason,
+    }
+
+
+def _summary_csv(s: ExportSummary, mode_label: str) -> list:
+    return [
+        TOTAL_ID, f"{mode_label}: {s.projects} projects, {s.funded} funded",
+        format_cents(s.goal_cents), format_cents(s.raised_cents), s.funded, "", s.pledges, s.rejected,
+        ";".join(f"{code}={n}" for code, n in sorted(s.rejected_by_reason.items())), "", "", "", "",
+    ]
+
+
+# ---------------- Writer ----------------
+def format_for(path: Path) -> str:
+    return "jsonl" if path.suffix.lower() in (".jsonl", ".json", ".ndjson") else "csv"
+
+
+def export_statistics(model, path: Path, fmt: Optional[str] = None, *, mode_label: str = "-",
+                      chunk_rows: int = CHUNK_ROWS,
+                      progress: Optional[Callable[[int, int], None]] = None,
+                      cancelled: Optional[Callable[[], bool]] = None) -> ExportResult:
+    """
+    เขียนสถิติรายโครงการ + แถวสรุป ลง path แบบสตรีม: สร้างแถวทีละตัวจาก generator แล้วเขียนทีละ chunk_rows แถว
+    - ใช้ snapshot เดียวตลอดการ export (pledge ที่เข้ามาระหว่างนั้นไม่ทำให้ไฟล์ขัดกันเอง)
+    - เขียนลง <path>.part ก่อน เสร็จแล้วค่อย os.replace → ไฟล์ปลายทางไม่มีวันค้างครึ่งเดียว
+    - progress(done, total) ถูกเรียกทุก chunk; cancelled() คืน True เมื่อต้องการหยุด (ไฟล์ .part ถูกลบ)
+    เรียกจาก thread ไหนก็ได้ — อ่านเฉพาะ snapshot และ rejections ของโมเดล
+    """
+    fmt = fmt or format_for(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"ไม่รองรับรูปแบบ {fmt!r} (ใช้ได้: {', '.join(FORMATS)})")
+    started = time.perf_counter()
+    snapshot = model.snapshot()
+    total = len(snapshot.projects)
+    summary = ExportSummary()
+    rows = iter_project_stats(snapshot, model.rejections_by_reason(), summary)
+
+    part = path.with_name(path.name + ".part")
+    done = 0
+    finished = False
+    try:
+        with part.open("w", newline="", encoding="utf-8") as f:
+            buf = io.StringIO()
+            writer = csv.writer(buf, lineterminator="\n")
+            if fmt == "csv":
+                writer.writerow(COLUMNS)
+
+            def emit(record, as_csv, as_json):
+                if fmt == "csv":
+                    writer.writerow(as_csv(record))
+                else:
+                    buf.write(json.dumps(as_json(record), ensure_ascii=False) + "\n")
+
+            def flush():
+                f.write(buf.getvalue())
+                buf.seek(0)
+                buf.truncate()
+                if progress:
+                    progress(done, total)
+
+            for row in rows:
+                emit(row, _csv_row, _jsonl_row)
+                done += 1
+                if done % chunk_rows == 0:
+                    flush()
+                    if cancelled and cancelled():
+                        break
+            else:
+                # ครบทุกแถวแล้ว (summary สะสมเสร็จ) → ต่อแถวสรุปท้ายไฟล์
+                emit(summary, lambda s: _summary_csv(s, mode_label), lambda s: _summary_jsonl(s, mode_label))
+                flush()
+                f.flush()
+                os.fsync(f.fileno())
+                finished = True
+        if finished:
+            os.replace(part, path)
+    finally:
+        if not finished:
+            part.unlink(missing_ok=True)
+    return ExportResult(path, fmt, done, summary, not finished, time.perf_counter() - started)
+
+
+# ---------------- CLI ----------------
+def main(argv: List[str]) -> int:
+    """
+    python -m Model.stats_export <out.csv|out.jsonl> [basic|stretch] [Database]
+    """
+    if not argv:
+        print(main.__doc__)
+        return 2
+    path = Path(argv[0])
+    mode = argv[1] if len(argv) > 1 else "basic"
+    model = make_model(mode, Path(argv[2]) if len(argv) > 2 else Path("Database"))
+    result = export_statistics(model, path, mode_label="Stretch" if mode == "stretch" else "Basic")
+    s = result.summary
+    print(f"เขียน {result.rows:,} โครงการ ({result.fmt}) → {path} ใน {result.elapsed_s:.2f} s; "
+          f"สำเร็จ {s.funded:,} โครงการ, pledge {s.pledges:,}, ถูกปฏิเสธ {s.rejected:,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,346 @@
+# Model/workload.py
+from __future__ import annotations
+from typing import Dict, Iterable, Iterator, List, Optional
+from datetime import date, datetime, timedelta
+from pathlib import Path
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from Model.factory import make_model
+from Model.money import parse_cents, format_cents
+
+# ---------------- Trace format ----------------
+# ไฟล์ trace เป็น JSONL หนึ่งบรรทัดต่อเหตุการณ์ เรียงตามเวลา "t" (วินาทีนับจากต้น trace)
+#   {"t": 0.012, "op": "create_project", "project_id", "name", "goal", "deadline"}
+#   {"t": 0.250, "op": "pledge", "pledge_id", "user_id", "project_id", "amount", "when", "tier"}
+#   {"t": 0.251, "op": "rejected", "project_id", "code"}           ← ผลที่สังเกตได้ ไม่ถูก replay
+#   {"t": 1.300, "op": "navigate", "page": "list|detail|stats", "project_id"}
+OP_CREATE = "create_project"
+OP_PLEDGE = "pledge"
+OP_REJECTED = "rejected"
+OP_NAVIGATE = "navigate"
+
+TRACE_ENV = "FUNDING_TRACE"
+
+
+def read_trace(path: Path) -> Iterator[dict]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_trace(path: Path, events: Iterable[dict]) -> int:
+    n = 0
+    with path.open("w", encoding="utf-8") as f:
+        for e in events:
+            f.write(json.dumps(e, ensure_ascii=False) + "\n")
+            n += 1
+    return n
+
+
+# ---------------- Recorder ----------------
+class TraceRecorder:
+    """
+    บันทึกการเรียกโมเดลจาก session ที่รันอยู่ลงไฟล์ trace
+    - attach(model) ห่อ create_project / add_pledge ของ instance นั้น และฟัง pledgeRejected
+    - navigate(page, project_id) ให้ controller เรียกตอนเปลี่ยนหน้า
+    เปิดใช้จากตัวแปรแวดล้อม FUNDING_TRACE=<ไฟล์> (ดู from_env)
+    """
+
+    def __init__(self, path: Path):
+        self._f = path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+
+    @classmethod
+    def from_env(cls) -> Optional["TraceRecorder"]:
+        path = os.environ.get(TRACE_ENV)
+        return cls(Path(path)) if path else None
+
+    def _write(self, event: dict):
+        event = {"t": round(time.perf_counter() - self._t0, 6), **event}
+        with self._lock:
+            if self._f.closed:
+                return   # ปิดไปแล้ว (shutdown) — สัญญาณที่มาช้าไม่ต้องบันทึก
+            self._f.write(json.dumps(event, ensure_ascii=False) + "\n")
+            self._f.flush()
+
+    def attach(self, model):
+        create_project, add_pledge = model.create_project, model.add_pledge
+
+        def traced_create(project_id, name, goal_amount, deadline):
+            self._write({"op": OP_CREATE, "project_id": project_id, "name": name,
+                         "goal": str(goal_amount), "deadline": deadline.isoformat()})
+            return create_project(project_id, name, goal_amount, deadline)
+
+        def traced_pledge(pledge_id, user_id, project_id, amount, when=None, reward_tier_id=None):
+            when = when or datetime.now()
+            self._write({"op": OP_PLEDGE, "pledge_id": pledge_id, "user_id": user_id, "project_id": project_id,
+                         "amount": str(amount), "when": when.isoformat(timespec="seconds"), "tier": reward_tier_id or ""})
+            return add_pledge(pledge_id, user_id, project_id, amount, when, reward_tier_id)
+
+        model.create_project = traced_create
+        model.add_pledge = traced_pledge
+        model.pledgeRejected.connect(lambda pid, code: self._write({"op": OP_REJECTED, "project_id": pid, "code": code}))
+
+    def navigate(self, page: str, project_id: Optional[str] = None):
+        self._write({"op": OP_NAVIGATE, "page": page, "project_id": project_id or ""})
+
+    def close(self):
+        with self._lock:
+            self._f.close()
+
+
+# ---------------- Synthesizer ----------------
+def _zipf_weights(n: int, s: float) -> List[float]:
+    return [1.0 / (k ** s) for k in range(1, n + 1)]
+
+
+def synthesize(db_dir: Path, ops: int = 5000, *, seed: int = 1, rate: float = 200.0, zipf_s: float = 1.2,
+               burst_factor: float = 10.0, new_projects: int = 3, nav_ratio: float = 0.05) -> List[dict]:
+    """
+    สร้าง trace จากโครงการ/tier ที่มีอยู่ใน db_dir
+    - arrival แบบเป็นช่วง (bursty): สลับช่วงเงียบ (อัตรา rate) กับช่วงพีค (rate × burst_factor) ระยะเวลาสุ่ม
+    - โครงการร้อน: เลือกโครงการตาม Zipf(zipf_s) → ไม่กี่โครงการรับ pledge ส่วนใหญ่
+    - แย่ง tier: ~40% ของ pledge เลือก tier โดยเน้น tier ที่โควตาเหลือน้อย (บางส่วนต่ำกว่าขั้นต่ำ)
+    - ขอบ deadline: ~10% ของ pledge มีเวลาอยู่รอบ ๆ วันสิ้นสุด (วันสุดท้าย / วันถัดไป)
+    - มี create_project ใหม่ new_projects โครงการ และ navigate ปน nav_ratio ของเหตุการณ์
+    """
+    from Model.csv_loader import read_tuples
+    rng = random.Random(seed)
+
+    header, rows = read_tuples(db_dir / "project.csv")
+    pid_i, dl_i = header.index("project_id"), header.index("deadline")
+    deadlines: Dict[str, date] = {r[pid_i]: date.fromisoformat(r[dl_i]) for r in rows}
+    header, rows = read_tuples(db_dir / "reward_tiers.csv")
+    pid_i, tier_i, min_i, quota_i = (header.index(c) for c in ("project_id", "tier_id", "minimum_amount", "quota_left"))
+    tiers: Dict[str, List[tuple]] = {}
+    for r in rows:
+        tiers.setdefault(r[pid_i], []).append((r[tier_i], parse_cents(r[min_i]), int(r[quota_i])))
+
+    events: List[dict] = []
+    t = 0.0
+    today = date.today()
+    for k in range(new_projects):
+        pid = str(90000000 + rng.randrange(10000000))
+        deadlines[pid] = today + timedelta(days=rng.choice((1, 2, 7, 30)))
+        events.append({"t": t, "op": OP_CREATE, "project_id": pid, "name": f"Synthetic {k + 1}",
+                       "goal": f"{rng.choice((5000, 20000, 100000))}.00", "deadline": deadlines[pid].isoformat()})
+
+    project_ids = list(deadlines)
+    rng.shuffle(project_ids)   # อันดับความร้อนไม่ผูกกับลำดับในไฟล์
+    weights = _zipf_weights(len(project_ids), zipf_s)
+
+    in_burst, phase_left = False, rng.expovariate(1 / 2.0)
+    n = 0
+    while n < ops:
+        current = rate * (burst_factor if in_burst else 1.0)
+        gap = rng.expovariate(current)
+        t += gap
+        phase_left -= gap
+        if phase_left <= 0:
+            in_burst = not in_burst
+            phase_left = rng.expovariate(1 / (0.5 if in_burst else 2.0))
+        n += 1
+
+        pid = rng.choices(project_ids, weights)[0]
+        if rng.random() < nav_ratio:
+            events.append({"t": round(t, 6), "op": OP_NAVIGATE, "page": rng.choice(("list", "detail", "detail", "stats")),
+                           "project_id": pid})
+            continue
+
+        deadline = deadlines[pid]
+        if rng.random() < 0.10:
+            # รอบ ๆ เส้นตาย: 23:59 ของวันสุดท้าย หรือ 00:00 ของวันถัดไป
+            when = datetime.combine(deadline, datetime.min.time()) + timedelta(
+                days=rng.choice((0, 1)), minutes=rng.choice((-1, 0, 1)) + (23 * 60 + 59 if rng.random() < 0.5 else 0))
+        else:
+            # ก่อนวันสิ้นสุด 0–14 วัน (โครงการที่หมดเขตแล้วยังได้ pledge ที่ "ย้อนเวลา" ได้)
+            when = datetime.combine(deadline, datetime.min.time()) - timedelta(days=rng.randint(0, 14), seconds=rng.randint(1, 86399))
+
+        # ยอดเป็นสตางค์ (int) ตลอด แล้วค่อยจัดรูปตอนเขียน trace
+        tier_id, amount_cents = "", round(rng.lognormvariate(5.5, 1.0) * 100)
+        project_tiers = tiers.get(pid)
+        if project_tiers and rng.random() < 0.4:
+            # เน้น tier โควตาน้อย → แย่งกันจนเต็ม
+            tier_id, minimum_cents, _ = min(rng.sample(project_tiers, min(2, len(project_tiers))), key=lambda x: x[2])
+            amount_cents = round(minimum_cents * (rng.uniform(0.8, 0.99) if rng.random() < 0.1 else rng.uniform(1.0, 3.0)))
+        elif rng.random() < 0.01:
+            tier_id = "TX"   # tier ที่ไม่มีอยู่
+        if rng.random() < 0.005:
+            amount_cents = rng.choice((0, -500))
+
+        events.append({"t": round(t, 6), "op": OP_PLEDGE, "pledge_id": f"W{n:08d}", "user_id": f"u-{rng.randrange(2000)}",
+                       "project_id": pid, "amount": format_cents(amount_cents), "when": when.isoformat(timespec="seconds"),
+                       "tier": tier_id})
+    return events
+
+
+# ---------------- Replay ----------------
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = min(int(round(q / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[k]
+
+
+class ReplayReport:
+    def __init__(self):
+        self.ops = 0
+        self.wall_s = 0.0
+        self.latency_ms: Dict[str, List[float]] = {}
+        self.rejections: Dict[str, int] = {}
+        self.expected_rejections: Dict[str, int] = {}   # จาก trace ที่บันทึกมา (ถ้ามี)
+        self.problems: List[str] = []
+
+    def format(self) -> str:
+        lines = [f"เหตุการณ์ {self.ops} รายการ ใน {self.wall_s:.2f} s → {self.ops / max(self.wall_s, 1e-9):,.0f} ops/s"]
+        for op, values in sorted(self.latency_ms.items()):
+            v = sorted(values)
+            lines.append(f"  {op:<15} n={len(v):<6} p50={_percentile(v, 50):7.3f} ms  p95={_percentile(v, 95):7.3f} ms"
+                         f"  p99={_percentile(v, 99):7.3f} ms  max={v[-1]:7.3f} ms")
+        total = sum(self.rejections.values())
+        mix = ", ".join(f"{code} {n}" for code, n in sorted(self.rejections.items(), key=lambda kv: -kv[1])) or "—"
+        lines.append(f"ถูกปฏิเสธ {total} รายการ: {mix}")
+        if self.expected_rejections:
+            lines.append("  (ตอนบันทึก: " + ", ".join(f"{c} {n}" for c, n in sorted(self.expected_rejections.items())) + ")")
+        lines.extend(f"ไม่ผ่าน: {p}" for p in self.problems)
+        lines.append("ตรวจความถูกต้องผ่าน" if not self.problems else f"ตรวจความถูกต้องไม่ผ่าน {len(self.problems)} ข้อ")
+        return "\n".join(lines)
+
+
+def _run_navigation(model, page: str, project_id: str):
+    # อ่านแบบเดียวกับที่ controller ทำตอนเปิดหน้านั้น
+    if page == "list":
+        model.list_projects()
+    elif page == "detail":
+        if model.get_project(project_id) is not None:
+            model.pledges_for_project(project_id, 0, 10)
+    elif page == "stats":
+        model.list_projects()
+        model.pledge_counts_by_project()
+        model.rejections_by_reason()
+
+
+def check_consistency(model, db_dir: Path) -> List[str]:
+    """
+    - raised_amount ใน project.csv = ผลรวม pledge ของโครงการ (ตรงทุกสตางค์) และดัชนี pledge ครบ
+    - quota_left ไม่ติดลบ ทั้งใน snapshot และ reward_tiers.csv
+    - snapshot ในหน่วยความจำตรงกับที่อ่านใหม่จากไฟล์ (รวม FundingState ที่ปรับทีละ pledge = คำนวณใหม่ทั้งก้อน)
+    """
+    from Model.csv_loader import read_tuples
+    from Model.pledge_store import PledgeStore, _raised_from_projects
+    problems = PledgeStore(db_dir).verify(_raised_from_projects(db_dir))
+
+    for pid, ts in model.snapshot().tiers.items():
+        problems.extend(f"{pid}/{t.tier_id}: quota_left ติดลบ ({t.quota_left}) ใน snapshot" for t in ts if t.quota_left < 0)
+    header, rows = read_tuples(db_dir / "reward_tiers.csv")
+    pid_i, tier_i, quota_i = header.index("project_id"), header.index("tier_id"), header.index("quota_left")
+    problems.extend(f"{r[pid_i]}/{r[tier_i]}: quota_left ติดลบ ({r[quota_i]}) ใน reward_tiers.csv"
+                    for r in rows if int(r[quota_i]) < 0)
+
+    fresh = make_model(model.MODE, db_dir).snapshot()
+    live = model.snapshot()
+    for pid, p in live.projects.items():
+        q = fresh.projects.get(pid)
+        if q is None or (q.raised_cents, q.goal_cents) != (p.raised_cents, p.goal_cents):
+            problems.append(f"{pid}: snapshot ไม่ตรงกับไฟล์")
+        if live.pledge_counts.get(pid, 0) != fresh.pledge_counts.get(pid, 0):
+            problems.append(f"{pid}: จำนวน pledge ใน snapshot ไม่ตรงกับไฟล์")
+        state, expected = live.funding.get(pid), fresh.funding.get(pid)
+        if state is None or expected is None or vars(state) != vars(expected):
+            problems.append(f"{pid}: FundingState ใน snapshot ไม่ตรงกับที่คำนวณจากไฟล์")
+    return problems
+
+
+def replay(trace: Iterable[dict], db_dir: Path, mode: str = "basic", *, rate: Optional[float] = None,
+           speed: Optional[float] = None, keep: bool = False) -> ReplayReport:
+    """
+    เล่น trace ซ้ำกับสำเนาของ db_dir (ไฟล์จริงไม่ถูกแตะ)
+    - rate: เหตุการณ์ต่อวินาทีคงที่  /  speed: คูณความเร็วตามเวลาใน trace (2.0 = เร็วขึ้นสองเท่า)
+    - ไม่ระบุทั้งคู่ = เร็วที่สุดเท่าที่ทำได้
+    """
+    report = ReplayReport()
+    work = Path(tempfile.mkdtemp(prefix="funding-replay-"))
+    db_copy = work / "Database"
+    shutil.copytree(db_dir, db_copy)
+    try:
+        model = make_model(mode, db_copy)
+        model.pledgeRejected.connect(lambda _pid, code: report.rejections.__setitem__(code, report.rejections.get(code, 0) + 1))
+        model.errorOccurred.connect(lambda _msg: None)
+
+        start = time.perf_counter()
+        for i, e in enumerate(trace):
+            op = e.get("op")
+            if op == OP_REJECTED:
+                report.expected_rejections[e["code"]] = report.expected_rejections.get(e["code"], 0) + 1
+                continue
+            # คุมจังหวะ
+            due = i / rate if rate else (e.get("t", 0.0) / speed if speed else None)
+            if due is not None:
+                delay = start + due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            t0 = time.perf_counter()
+            if op == OP_PLEDGE:
+                model.add_pledge(e["pledge_id"], e["user_id"], e["project_id"], e["amount"],
+                                 datetime.fromisoformat(e["when"]) if e.get("when") else None, e.get("tier") or None)
+            elif op == OP_CREATE:
+                model.create_project(e["project_id"], e["name"], e["goal"], date.fromisoformat(e["deadline"]))
+            elif op == OP_NAVIGATE:
+                _run_navigation(model, e.get("page", ""), e.get("project_id", ""))
+                op = f"navigate:{e.get('page', '')}"
+            else:
+                continue
+            report.latency_ms.setdefault(op, []).append((time.perf_counter() - t0) * 1000)
+            report.ops += 1
+        report.wall_s = time.perf_counter() - start
+
+        report.problems = check_consistency(model, db_copy)
+    finally:
+        if keep:
+            print(f"เก็บสำเนาฐานข้อมูลไว้ที่ {db_copy}")
+        else:
+            shutil.rmtree(work, ignore_errors=True)
+    return report
+
+
+# ---------------- CLI ----------------
+def main(argv: List[str]) -> int:
+    """
+    python -m Model.workload synth  <trace.jsonl> [ops] [Database]      → สร้าง trace สังเคราะห์
+    python -m Model.workload replay <trace.jsonl> [basic|stretch] [Database] [--rate N | --speed X] [--keep]
+    บันทึก trace จากโปรแกรมจริง: FUNDING_TRACE=<trace.jsonl> python main.py
+    """
+    flags = {a: argv[i + 1] for i, a in enumerate(argv[:-1]) if a in ("--rate", "--speed")}
+    args = [a for i, a in enumerate(argv) if not a.startswith("--") and (i == 0 or argv[i - 1] not in ("--rate", "--speed"))]
+    if len(args) < 2 or args[0] not in ("synth", "replay"):
+        print(main.__doc__)
+        return 2
+    trace_path = Path(args[1])
+    if args[0] == "synth":
+        ops = int(args[2]) if len(args) > 2 else 5000
+        db_dir = Path(args[3]) if len(args) > 3 else Path("Database")
+        n = write_trace(trace_path, synthesize(db_dir, ops))
+        print(f"เขียน trace {n} เหตุการณ์ → {trace_path}")
+        return 0
+    mode = args[2] if len(args) > 2 else "basic"
+    db_dir = Path(args[3]) if len(args) > 3 else Path("Database")
+    report = replay(read_trace(trace_path), db_dir, mode,
+                    rate=float(flags["--rate"]) if "--rate" in flags else None,
+                    speed=float(flags["--speed"]) if "--speed" in flags else None,
+                    keep="--keep" in argv)
+    print(report.format())
+    return 1 if report.problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -3,6 +3,7 @@ from PyQt5.QtWidgets import QMainWindow, QStackedWidget
 from View.project_list_view import ProjectListView
 from View.project_detail_view import ProjectDetailView
 from View.statistics_view import StatisticsView
+from View.my_pledges_view import MyPledgesView
 from View.login_view import LoginView   # << เพิ่มบรรทัดนี้
 
 class MainWindow(QMainWindow):
@@ -19,12 +20,14 @@ class MainWindow(QMainWindow):
         self.project_list_view = ProjectListView()
         self.project_detail_view = ProjectDetailView()
         self.statistics_view = StatisticsView()
+        self.my_pledges_view = MyPledgesView()
 
         # --- Add to stack ---
         self._stack.addWidget(self.login_view)       # index 0
         self._stack.addWidget(self.project_list_view)  # index 1
         self._stack.addWidget(self.project_detail_view) # index 2
         self._stack.addWidget(self.statistics_view)    # index 3
+        self._stack.addWidget(self.my_pledges_view)    # index 4
 
         self._stack.setCurrentIndex(0)  # เริ่มที่หน้า Login
 
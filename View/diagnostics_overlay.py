@@ -0,0 +1,52 @@
+# View/diagnostics_overlay.py
+from PyQt5.QtWidgets import QLabel, QShortcut
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import Qt, QEvent
+
+
+class DiagnosticsOverlay(QLabel):
+    """
+    ป้ายโปร่งแสงมุมขวาบนของหน้าต่าง แสดงสถิติการค้างของ UI (View เท่านั้น)
+    - กด F12 เพื่อเปิด/ปิด
+    - update_stats() ให้ผู้เรียกส่งตัวเลขมา (ดู ResponsivenessMonitor)
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setStyleSheet(
+            "background: rgba(20,20,20,200); color: #eee; font-family: monospace; font-size: 11px; padding: 6px;"
+        )
+        self.setTextFormat(Qt.PlainText)
+        self.setText("UI monitor: ยังไม่พบการค้าง")
+        self.hide()
+        parent.installEventFilter(self)
+        self._shortcut = QShortcut(QKeySequence("F12"), parent)
+        self._shortcut.activated.connect(self.toggle)
+
+    def toggle(self):
+        self.setVisible(not self.isVisible())
+        if self.isVisible():
+            self.raise_()
+            self._reposition()
+
+    def update_stats(self, *, count: int, total_ms: float, max_ms: float, by_action: dict, recent: list):
+        lines = [f"UI ค้าง {count} ครั้ง · รวม {total_ms:.0f} ms · สูงสุด {max_ms:.0f} ms"]
+        for action, (n, ms) in sorted(by_action.items(), key=lambda kv: -kv[1][1])[:5]:
+            lines.append(f"  {action}: {n}× {ms:.0f} ms")
+        if recent:
+            lines.append("ล่าสุด:")
+            for s in recent[-3:][::-1]:
+                lines.append(f"  {s.when:%H:%M:%S} {s.duration_ms:.0f} ms {s.action}")
+        self.setText("\n".join(lines))
+        self._reposition()
+
+    def _reposition(self):
+        self.adjustSize()
+        parent = self.parentWidget()
+        self.move(max(parent.width() - self.width() - 8, 0), 8)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize and self.isVisible():
+            self._reposition()
+        return False
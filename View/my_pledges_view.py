@@ -0,0 +1,109 @@
+# View/my_pledges_view.py
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QTableWidget, QTableWidgetItem
+)
+from PyQt5.QtCore import pyqtSignal
+from Model.money import format_cents
+
+
+class MyPledgesView(QWidget):
+    """
+    หน้า "การสนับสนุนของฉัน" ของผู้ใช้ที่ล็อกอินอยู่ (View เท่านั้น)
+    - ยอดรวม / จำนวน pledge / จำนวนโครงการ + ตารางรางวัลที่ได้
+    - ประวัติ pledge แบ่งหน้า (ใหม่ → เก่า) → pageRequested(page)
+    """
+
+    backRequested = pyqtSignal()
+    pageRequested = pyqtSignal(int)   # page index เริ่มที่ 0
+
+    PAGE_SIZE = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.current_page = 0
+        self._build()
+
+    def _build(self):
+        v = QVBoxLayout(self)
+
+        self.lbl_title = QLabel("การสนับสนุนของฉัน")
+        self.lbl_title.setStyleSheet("font-size:20px;font-weight:700;")
+        v.addWidget(self.lbl_title)
+
+        self.lbl_totals = QLabel("-")
+        self.lbl_totals.setStyleSheet("font-size:14px;")
+        v.addWidget(self.lbl_totals)
+
+        v.addWidget(QLabel("รางวัลที่ได้รับ:"))
+        self.tbl_tiers = QTableWidget(0, 4)
+        self.tbl_tiers.setHorizontalHeaderLabels(["โครงการ", "Tier", "ชื่อรางวัล", "จำนวน"])
+        self.tbl_tiers.setEditTriggers(self.tbl_tiers.NoEditTriggers)
+        self.tbl_tiers.setMaximumHeight(140)
+        v.addWidget(self.tbl_tiers)
+
+        v.addWidget(QLabel("ประวัติการสนับสนุน:"))
+        self.tbl_pledges = QTableWidget(0, 5)
+        self.tbl_pledges.setHorizontalHeaderLabels(["Pledge ID", "โครงการ", "จำนวนเงิน", "เวลา", "Reward Tier"])
+        self.tbl_pledges.setEditTriggers(self.tbl_pledges.NoEditTriggers)
+        v.addWidget(self.tbl_pledges)
+
+        pager = QHBoxLayout()
+        self.btn_prev_page = QPushButton("‹ ก่อนหน้า")
+        self.btn_prev_page.clicked.connect(lambda: self._request_page(self.current_page - 1))
+        self.lbl_page = QLabel("หน้า 0/0")
+        self.btn_next_page = QPushButton("ถัดไป ›")
+        self.btn_next_page.clicked.connect(lambda: self._request_page(self.current_page + 1))
+        pager.addStretch(1)
+        pager.addWidget(self.btn_prev_page)
+        pager.addWidget(self.lbl_page)
+        pager.addWidget(self.btn_next_page)
+        v.addLayout(pager)
+
+        nav = QHBoxLayout()
+        self.btn_back = QPushButton("← กลับหน้ารวมโครงการ")
+        self.btn_back.clicked.connect(lambda: self.backRequested.emit())
+        nav.addWidget(self.btn_back)
+        nav.addStretch(1)
+        v.addLayout(nav)
+
+    def _request_page(self, page: int):
+        if page >= 0:
+            self.pageRequested.emit(page)
+
+    def render_summary(self, display_name: str, summary):
+        """
+        summary: ออบเจ็กต์ที่มี (pledge_count, total_cents, projects_backed, claimed_tiers)
+        claimed_tiers: ออบเจ็กต์ที่มี (project_name, tier_id, title, count)
+        """
+        self.lbl_title.setText(f"การสนับสนุนของ {display_name}")
+        self.lbl_totals.setText(
+            f"ยอดรวม {format_cents(summary.total_cents)} · {summary.pledge_count} ครั้ง · "
+            f"{summary.projects_backed} โครงการ"
+        )
+        self.tbl_tiers.setRowCount(0)
+        for t in summary.claimed_tiers:
+            r = self.tbl_tiers.rowCount()
+            self.tbl_tiers.insertRow(r)
+            for c, text in enumerate((t.project_name, t.tier_id, t.title, str(t.count))):
+                self.tbl_tiers.setItem(r, c, QTableWidgetItem(text))
+        self.tbl_tiers.resizeColumnsToContents()
+
+    def render_pledge_page(self, pledges, page: int, total_count: int, project_names: dict):
+        """
+        pledges: ออบเจ็กต์ที่มี (pledge_id, project_id, amount, created_at, reward_tier_id) ของหน้านี้
+        project_names: project_id -> ชื่อโครงการ (ไม่มีในนี้จะแสดง project_id)
+        """
+        self.current_page = page
+        total_pages = max((total_count + self.PAGE_SIZE - 1) // self.PAGE_SIZE, 1)
+        self.tbl_pledges.setRowCount(0)
+        for pl in pledges:
+            r = self.tbl_pledges.rowCount()
+            self.tbl_pledges.insertRow(r)
+            name = project_names.get(pl.project_id, pl.project_id)
+            for c, text in enumerate((pl.pledge_id, name, pl.amount, pl.created_at, pl.reward_tier_id or "—")):
+                self.tbl_pledges.setItem(r, c, QTableWidgetItem(str(text)))
+        self.tbl_pledges.resizeColumnsToContents()
+        self.lbl_page.setText(f"หน้า {page + 1}/{total_pages} ({total_count} รายการ)")
+        self.btn_prev_page.setEnabled(page > 0)
+        self.btn_next_page.setEnabled(page + 1 < total_pages)
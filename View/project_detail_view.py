@@ -1,14 +1,21 @@
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QProgressBar,
+    QTableWidget, QTableWidgetItem
 )
 from PyQt5.QtCore import pyqtSignal
+from Model.money import format_cents
 
 
 class ProjectDetailView(QWidget):
     backRequested = pyqtSignal()
+    pledgePageRequested = pyqtSignal(str, int)   # (project_id, page index เริ่มที่ 0)
+
+    PAGE_SIZE = 10
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.current_project_id = None   # โครงการที่กำลังแสดงอยู่ (ให้ Controller เช็กตอนมีข้อมูลเปลี่ยน)
+        self.current_page = 0
         self._build()
 
     def _build(self):
@@ -31,6 +38,45 @@ class ProjectDetailView(QWidget):
         self.progress.setMinimum(0)
         self.progress.setMaximum(100)
         v.addWidget(self.progress)
+        self.lbl_funding = QLabel("-")
+        self.lbl_funding.setStyleSheet("font-size:13px;color:#555;")
+        v.addWidget(self.lbl_funding)
+
+        # Reward tiers (โควตาคงเหลือ)
+        v.addWidget(QLabel("รางวัล (Reward Tiers):"))
+        self.tbl_tiers = QTableWidget(0, 4)
+        self.tbl_tiers.setHorizontalHeaderLabels(["Tier", "ชื่อรางวัล", "ขั้นต่ำ", "คงเหลือ"])
+        self.tbl_tiers.setEditTriggers(self.tbl_tiers.NoEditTriggers)
+        self.tbl_tiers.setMaximumHeight(140)
+        v.addWidget(self.tbl_tiers)
+
+        # Stretch goals (เฉพาะโหมด stretch — ซ่อนเมื่อโครงการไม่มี SG)
+        self.lbl_goals = QLabel("Stretch Goals:")
+        v.addWidget(self.lbl_goals)
+        self.tbl_goals = QTableWidget(0, 3)
+        self.tbl_goals.setHorizontalHeaderLabels(["เป้ายอด", "รายละเอียด", "สถานะ"])
+        self.tbl_goals.setEditTriggers(self.tbl_goals.NoEditTriggers)
+        self.tbl_goals.setMaximumHeight(140)
+        v.addWidget(self.tbl_goals)
+
+        # ประวัติการสนับสนุน (แบ่งหน้า ใหม่ → เก่า)
+        v.addWidget(QLabel("ประวัติการสนับสนุน:"))
+        self.tbl_pledges = QTableWidget(0, 5)
+        self.tbl_pledges.setHorizontalHeaderLabels(["Pledge ID", "ผู้สนับสนุน", "จำนวนเงิน", "เวลา", "Reward Tier"])
+        self.tbl_pledges.setEditTriggers(self.tbl_pledges.NoEditTriggers)
+        v.addWidget(self.tbl_pledges)
+
+        pager = QHBoxLayout()
+        self.btn_prev_page = QPushButton("‹ ก่อนหน้า")
+        self.btn_prev_page.clicked.connect(lambda: self._request_page(self.current_page - 1))
+        self.lbl_page = QLabel("หน้า 0/0")
+        self.btn_next_page = QPushButton("ถัดไป ›")
+        self.btn_next_page.clicked.connect(lambda: self._request_page(self.current_page + 1))
+        pager.addStretch(1)
+        pager.addWidget(self.btn_prev_page)
+        pager.addWidget(self.lbl_page)
+        pager.addWidget(self.btn_next_page)
+        v.addLayout(pager)
 
         nav = QHBoxLayout()
         self.btn_back = QPushButton("← กลับหน้ารวมโครงการ")
@@ -39,17 +85,78 @@ class ProjectDetailView(QWidget):
         nav.addStretch(1)
         v.addLayout(nav)
 
-    def render_project(self, project):
+    def render_project(self, project, state=None):
         """
-        project: ออบเจ็กต์ที่มี (project_id, name, goal_amount, deadline, raised_amount)
+        project: ออบเจ็กต์ที่มี (project_id, name, goal_cents, deadline, raised_cents)
+        state: FundingState ของโครงการ (funded, percent, next_threshold_cents, to_next_unlock_cents, tiers_remaining)
         """
+        self.current_project_id = project.project_id
         self.lbl_title.setText(project.name)
         self.lbl_pid.setText(f"รหัสโครงการ: {project.project_id}")
-        self.lbl_goal.setText(f"เป้าหมาย: {float(project.goal_amount):.2f}")
+        self.lbl_goal.setText(f"เป้าหมาย: {format_cents(project.goal_cents)}")
         self.lbl_deadline.setText(f"กำหนดสิ้นสุด: {project.deadline}")
-        self.lbl_raised.setText(f"ยอดระดม: {float(project.raised_amount):.2f}")
+        self.lbl_raised.setText(f"ยอดระดม: {format_cents(project.raised_cents)}")
+        self.progress.setValue(state.percent if state else 0)
+        self.lbl_funding.setText(self._format_state(state))
+
+    @staticmethod
+    def _format_state(state) -> str:
+        if state is None:
+            return "-"
+        parts = ["✅ ถึงเป้าหมายแล้ว" if state.funded else f"{state.percent}% ของเป้าหมาย"]
+        if state.next_threshold_cents is not None:
+            parts.append(f"Stretch Goal ถัดไป {format_cents(state.next_threshold_cents)} "
+                         f"(ขาดอีก {format_cents(state.to_next_unlock_cents)})")
+        parts.append(f"รางวัลที่ยังมีโควตา {state.tiers_remaining} รายการ")
+        return " · ".join(parts)
 
-        goal = float(project.goal_amount)
-        raised = float(project.raised_amount)
-        pct = 0 if goal <= 0 else min(int((raised / goal) * 100), 100)
-        self.progress.setValue(pct)
\ No newline at end of file
+    def render_detail(self, detail):
+        """
+        detail: ออบเจ็กต์ที่มี (project, funding, tiers, goals, recent_pledges, pledge_count)
+        แสดงข้อมูลโครงการ + tiers + stretch goals + ประวัติหน้าแรก ในครั้งเดียว
+        """
+        self.render_project(detail.project, detail.funding)
+
+        self.tbl_tiers.setRowCount(0)
+        for t in detail.tiers:
+            r = self.tbl_tiers.rowCount()
+            self.tbl_tiers.insertRow(r)
+            quota = f"{t.quota_left}" if t.quota_left > 0 else "เต็ม"
+            for c, text in enumerate((t.tier_id, t.title, format_cents(t.minimum_cents), quota)):
+                self.tbl_tiers.setItem(r, c, QTableWidgetItem(text))
+        self.tbl_tiers.resizeColumnsToContents()
+
+        goals = sorted(detail.goals, key=lambda g: g.threshold_cents)
+        self.lbl_goals.setVisible(bool(goals))
+        self.tbl_goals.setVisible(bool(goals))
+        self.tbl_goals.setRowCount(0)
+        for g in goals:
+            r = self.tbl_goals.rowCount()
+            self.tbl_goals.insertRow(r)
+            status = "🔓 ปลดล็อกแล้ว" if g.unlocked else "🔒 ยังไม่ถึง"
+            for c, text in enumerate((format_cents(g.threshold_cents), g.description, status)):
+                self.tbl_goals.setItem(r, c, QTableWidgetItem(text))
+        self.tbl_goals.resizeColumnsToContents()
+
+        self.render_pledge_page(detail.recent_pledges, 0, detail.pledge_count)
+
+    def _request_page(self, page: int):
+        if self.current_project_id is not None and page >= 0:
+            self.pledgePageRequested.emit(self.current_project_id, page)
+
+    def render_pledge_page(self, pledges, page: int, total_count: int):
+        """
+        pledges: ออบเจ็กต์ที่มี (pledge_id, user_id, amount, created_at, reward_tier_id) ของหน้านี้
+        """
+        self.current_page = page
+        total_pages = max((total_count + self.PAGE_SIZE - 1) // self.PAGE_SIZE, 1)
+        self.tbl_pledges.setRowCount(0)
+        for pl in pledges:
+            r = self.tbl_pledges.rowCount()
+            self.tbl_pledges.insertRow(r)
+            for c, text in enumerate((pl.pledge_id, pl.user_id, pl.amount, pl.created_at, pl.reward_tier_id or "—")):
+                self.tbl_pledges.setItem(r, c, QTableWidgetItem(str(text)))
+        self.tbl_pledges.resizeColumnsToContents()
+        self.lbl_page.setText(f"หน้า {page + 1}/{total_pages} ({total_count} รายการ)")
+        self.btn_prev_page.setEnabled(page > 0)
+        self.btn_next_page.setEnabled(page + 1 < total_pages)
@@ -1,9 +1,11 @@
 # View/project_list_view.py
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
-    QPushButton, QTableWidget, QTableWidgetItem, QMessageBox
+    QPushButton, QTableWidget, QTableWidgetItem, QMessageBox, QComboBox
 )
 from PyQt5.QtCore import pyqtSignal
+from Model.money import format_cents
+from Model.ranking import SORT_LABELS, SORT_DEADLINE
 
 
 class ProjectListView(QWidget):
@@ -11,24 +13,44 @@ class ProjectListView(QWidget):
     หน้ารวมโครงการ (View เท่านั้น)
     - แสดงตารางรายการโครงการ
     - ปุ่ม 'ดูสถิติ' → statsRequested
+    - ปุ่ม 'การสนับสนุนของฉัน' → myPledgesRequested
     - ดับเบิลคลิก/ปุ่ม 'ดูรายละเอียด' → openProjectRequested(project_id)
-    - render_projects() จะเรียงตาม deadline ใกล้หมดเวลาก่อนเอง
+    - render_projects() จะเรียงตาม deadline ใกล้หมดเวลาก่อนเอง (หรือใช้ลำดับที่ส่งมาถ้า presorted=True)
+    - เลือกโหมดเรียงจาก combo box → sortModeChanged(mode) ให้ controller ส่งลำดับจาก ranking มา
+    - update_projects() แก้เฉพาะแถวที่เปลี่ยน (ไม่สร้างตารางใหม่ทั้งตาราง)
+    - reorder_projects() สำหรับตารางที่เรียงตาม ranking: เขียนเฉพาะแถวที่ย้ายตำแหน่งหรือข้อมูลเปลี่ยน
+    - เลือกแถว → projectSelected(project_id) (ให้ controller prefetch รายละเอียดแถวข้างเคียง)
     """
 
     openProjectRequested = pyqtSignal(str)   # ส่ง project_id ที่เลือก
     statsRequested = pyqtSignal()            # ขอเปิดหน้าสถิติ
+    myPledgesRequested = pyqtSignal()        # ขอเปิดหน้าการสนับสนุนของผู้ใช้ที่ล็อกอินอยู่
+    sortModeChanged = pyqtSignal(str)        # โหมดเรียง (Model.ranking.SORT_*)
+    projectSelected = pyqtSignal(str)        # แถวที่เลือกเปลี่ยน (ยังไม่เปิด)
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._row_of: dict = {}        # project_id -> row index
+        self._deadline_of: dict = {}   # project_id -> deadline ที่ใช้เรียงอยู่ตอนนี้
+        self._presorted = False        # True = ลำดับแถวมาจากผู้เรียก (patch รายแถวไม่ได้)
         self._build()
 
     # ---------------- UI Layout ----------------
     def _build(self):
         v = QVBoxLayout(self)
 
-        header = QLabel("รายการโครงการ (เรียงใกล้หมดเวลาก่อน)")
+        top = QHBoxLayout()
+        header = QLabel("รายการโครงการ")
         header.setStyleSheet("font-size:18px;font-weight:600;")
-        v.addWidget(header)
+        top.addWidget(header)
+        top.addStretch(1)
+        top.addWidget(QLabel("เรียงตาม:"))
+        self.cmb_sort = QComboBox()
+        for mode, label in SORT_LABELS.items():
+            self.cmb_sort.addItem(label, mode)
+        self.cmb_sort.currentIndexChanged.connect(lambda _: self.sortModeChanged.emit(self.sort_mode))
+        top.addWidget(self.cmb_sort)
+        v.addLayout(top)
 
         self.tbl = QTableWidget(0, 5)
         self.tbl.setHorizontalHeaderLabels(
@@ -38,21 +60,47 @@ class ProjectListView(QWidget):
         self.tbl.setEditTriggers(self.tbl.NoEditTriggers)
         # ดับเบิลคลิกเพื่อเปิดรายละเอียด
         self.tbl.itemDoubleClicked.connect(lambda _: self._emit_open_selected())
+        self.tbl.currentCellChanged.connect(self._emit_selected)
         v.addWidget(self.tbl)
 
-        # ปุ่มล่าง: ดูสถิติ / ดูรายละเอียด
+        # ปุ่มล่าง: ดูสถิติ / การสนับสนุนของฉัน / ดูรายละเอียด
         row = QHBoxLayout()
         self.btn_stats = QPushButton("ดูสถิติ")
         self.btn_stats.clicked.connect(lambda: self.statsRequested.emit())
+        self.btn_my_pledges = QPushButton("การสนับสนุนของฉัน")
+        self.btn_my_pledges.clicked.connect(lambda: self.myPledgesRequested.emit())
         self.btn_open = QPushButton("ดูรายละเอียด")
         self.btn_open.clicked.connect(self._emit_open_selected)
 
         row.addWidget(self.btn_stats)
+        row.addWidget(self.btn_my_pledges)
         row.addStretch(1)
         row.addWidget(self.btn_open)
         v.addLayout(row)
 
     # ---------------- Helpers ----------------
+    @property
+    def sort_mode(self) -> str:
+        return self.cmb_sort.currentData() or SORT_DEADLINE
+
+    def _emit_selected(self, row: int, *_):
+        item = self.tbl.item(row, 0) if row >= 0 else None
+        if item is not None:
+            self.projectSelected.emit(item.text())
+
+    def neighbor_ids(self, project_id: str, span: int = 1) -> list:
+        """project_id ของแถวก่อนหน้า/ถัดไป (ตามลำดับที่แสดงอยู่) ไม่เกิน span แถวต่อด้าน"""
+        r = self._row_of.get(project_id)
+        if r is None:
+            return []
+        out = []
+        for d in range(1, span + 1):
+            for nr in (r + d, r - d):
+                item = self.tbl.item(nr, 0) if 0 <= nr < self.tbl.rowCount() else None
+                if item is not None:
+                    out.append(item.text())
+        return out
+
     def _emit_open_selected(self):
         r = self.tbl.currentRow()
         if r < 0:
@@ -62,38 +110,87 @@ class ProjectListView(QWidget):
         self.openProjectRequested.emit(pid)
 
     # ---------------- Render API ----------------
-    def render_projects(self, projects):
+    def render_projects(self, projects, presorted: bool = False):
         """
         projects: iterable ของออบเจ็กต์ที่มีฟิลด์อย่างน้อย:
           - project_id (str)
           - name (str)
-          - goal_amount (float|str ตัวเลข)
+          - goal_cents (int สตางค์)
           - deadline (date|str รูปแบบ YYYY-MM-DD)
-          - raised_amount (float|str ตัวเลข)
+          - raised_cents (int สตางค์)
 
-        View จะเรียงตาม deadline ใกล้หมดเวลาก่อนในเมธอดนี้
+        View จะเรียงตาม deadline ใกล้หมดเวลาก่อนในเมธอดนี้ เว้นแต่ presorted=True
+        (ลำดับมาจาก ranking ของโมเดล — แสดงตามลำดับที่ส่งมา)
         """
-        # แปลงและเรียงตาม deadline (หากชนิดไม่ใช่ date ให้ fallback เป็น str เพื่อเรียงได้)
-        try:
-            sorted_projects = sorted(projects, key=lambda p: getattr(p, "deadline"))
-        except Exception:
-            sorted_projects = sorted(projects, key=lambda p: str(getattr(p, "deadline")))
+        self._presorted = presorted
+        if presorted:
+            sorted_projects = list(projects)
+        else:
+            # แปลงและเรียงตาม deadline (หากชนิดไม่ใช่ date ให้ fallback เป็น str เพื่อเรียงได้)
+            try:
+                sorted_projects = sorted(projects, key=lambda p: getattr(p, "deadline"))
+            except Exception:
+                sorted_projects = sorted(projects, key=lambda p: str(getattr(p, "deadline")))
 
         self.tbl.setRowCount(0)
+        self._row_of.clear()
+        self._deadline_of.clear()
         for p in sorted_projects:
-            # อ่านค่าอย่างปลอดภัย
-            pid = getattr(p, "project_id", "")
-            name = getattr(p, "name", "")
-            goal = float(getattr(p, "goal_amount", 0.0))
-            deadline = getattr(p, "deadline", "")
-            raised = float(getattr(p, "raised_amount", 0.0))
-
             r = self.tbl.rowCount()
             self.tbl.insertRow(r)
-            self.tbl.setItem(r, 0, QTableWidgetItem(str(pid)))
-            self.tbl.setItem(r, 1, QTableWidgetItem(str(name)))
-            self.tbl.setItem(r, 2, QTableWidgetItem(f"{goal:.2f}"))
-            self.tbl.setItem(r, 3, QTableWidgetItem(str(deadline)))
-            self.tbl.setItem(r, 4, QTableWidgetItem(f"{raised:.2f}"))
+            self._fill_row(r, p)
+
+        self.tbl.resizeColumnsToContents()
+
+    def update_projects(self, projects) -> bool:
+        """
+        patch เฉพาะแถวของโครงการที่ส่งมา (ตาม project_id)
+        คืน False ถ้าแก้แบบเฉพาะแถวไม่ได้ (มีโครงการใหม่, deadline เปลี่ยนจนลำดับผิด
+        หรือตารางเรียงตาม ranking ซึ่งยอดที่เปลี่ยนอาจทำให้ลำดับเปลี่ยน — ใช้ reorder_projects() แทน)
+        → ผู้เรียกควร render_projects() ทั้งตารางแทน
+        """
+        if self._presorted:
+            return False
+        projects = list(projects)
+        for p in projects:
+            pid = str(getattr(p, "project_id", ""))
+            if pid not in self._row_of or self._deadline_of.get(pid) != getattr(p, "deadline", ""):
+                return False
+        for p in projects:
+            self._fill_row(self._row_of[str(p.project_id)], p)
+        return True
+
+    def reorder_projects(self, projects, changed_ids) -> bool:
+        """
+        ตารางที่เรียงตาม ranking (presorted): projects คือรายการทั้งหมดตามลำดับใหม่
+        เขียนเฉพาะแถวที่โครงการในตำแหน่งนั้นเปลี่ยน หรือเป็นโครงการใน changed_ids
+        (ลำดับเหมือนเดิม = แก้แค่แถวที่ข้อมูลเปลี่ยน ไม่ล้างตาราง)
+        คืน False ถ้าชุดโครงการไม่ตรงกับที่แสดงอยู่ (มีโครงการใหม่) → ผู้เรียกควร render_projects() ทั้งตาราง
+        """
+        if not self._presorted:
+            return False
+        projects = list(projects)
+        if len(projects) != self.tbl.rowCount() or any(str(p.project_id) not in self._row_of for p in projects):
+            return False
+        for r, p in enumerate(projects):
+            pid = str(p.project_id)
+            if self._row_of[pid] != r or pid in changed_ids:
+                self._fill_row(r, p)
+        return True
+
+    def _fill_row(self, r: int, p):
+        # อ่านค่าอย่างปลอดภัย
+        pid = getattr(p, "project_id", "")
+        name = getattr(p, "name", "")
+        goal = format_cents(int(getattr(p, "goal_cents", 0)))
+        deadline = getattr(p, "deadline", "")
+        raised = format_cents(int(getattr(p, "raised_cents", 0)))
 
-        self.tbl.resizeColumnsToContents()
\ No newline at end of file
+        self._row_of[str(pid)] = r
+        self._deadline_of[str(pid)] = deadline
+        for c, text in enumerate((str(pid), str(name), goal, str(deadline), raised)):
+            item = self.tbl.item(r, c)
+            if item is None:
+                self.tbl.setItem(r, c, QTableWidgetItem(text))
+            elif item.text() != text:
+                item.setText(text)
@@ -1,16 +1,24 @@
 # View/statistics_view.py
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QTableWidget, QTableWidgetItem, QHeaderView, QProgressBar
+    QTableWidget, QTableWidgetItem, QHeaderView, QProgressBar, QFileDialog
 )
 from PyQt5.QtCore import pyqtSignal, Qt
+from Model.money import format_cents
+from Model.rejection_log import REASON_LABELS
+from Model.ranking import (
+    SORT_LABELS, SORT_DEADLINE, SORT_TRENDING_1H, SORT_TRENDING_24H, SORT_RAISED, SORT_CLOSEST_TO_GOAL
+)
 
 
 class StatisticsView(QWidget):
     backRequested = pyqtSignal()
+    exportRequested = pyqtSignal(str)     # path ที่ผู้ใช้เลือก (.csv / .jsonl)
+    exportCancelRequested = pyqtSignal()
 
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._row_of: dict = {}   # project_id -> row index
         self._build_ui()
 
     # ---------------- UI ----------------
@@ -39,6 +47,11 @@ class StatisticsView(QWidget):
         summary_row.addStretch(1)
         root.addLayout(summary_row)
 
+        # แยกจำนวนที่ถูกปฏิเสธตามเหตุผล
+        self.lbl_reject_reasons = QLabel("เหตุผลที่ถูกปฏิเสธ: —")
+        self.lbl_reject_reasons.setStyleSheet("font-size:12px; color:#a33;")
+        root.addWidget(self.lbl_reject_reasons)
+
         # Table: per-project (+ คอลัมน์ Unlocked SG)
         self.tbl = QTableWidget(0, 10)
         self.tbl.setHorizontalHeaderLabels([
@@ -52,16 +65,79 @@ class StatisticsView(QWidget):
         self.tbl.setColumnWidth(9, 260)   # unlocked sg
         root.addWidget(self.tbl)
 
+        # Leaderboard: คอลัมน์ละหมวดการจัดอันดับ แถว = อันดับ 1..N
+        lb_title = QLabel("อันดับโครงการ")
+        lb_title.setStyleSheet("font-size:14px; font-weight:600;")
+        root.addWidget(lb_title)
+        self._lb_modes = list(SORT_LABELS)
+        self.tbl_leaderboard = QTableWidget(0, len(self._lb_modes))
+        self.tbl_leaderboard.setHorizontalHeaderLabels([SORT_LABELS[m] for m in self._lb_modes])
+        self.tbl_leaderboard.setEditTriggers(self.tbl_leaderboard.NoEditTriggers)
+        self.tbl_leaderboard.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tbl_leaderboard.setMaximumHeight(180)
+        root.addWidget(self.tbl_leaderboard)
+
         # Footer / Nav
         nav = QHBoxLayout()
         self.btn_back = QPushButton("← กลับ")
         self.btn_back.clicked.connect(lambda: self.backRequested.emit())
         nav.addWidget(self.btn_back)
         nav.addStretch(1)
+
+        # Export (ทำงานเบื้องหลัง — progress + ปุ่มยกเลิกแสดงเฉพาะระหว่าง export)
+        self.lbl_export = QLabel("")
+        self.lbl_export.setStyleSheet("font-size:12px; color:#555;")
+        self.export_progress = QProgressBar()
+        self.export_progress.setMaximumWidth(220)
+        self.export_progress.hide()
+        self.btn_cancel_export = QPushButton("ยกเลิก")
+        self.btn_cancel_export.clicked.connect(lambda: self.exportCancelRequested.emit())
+        self.btn_cancel_export.hide()
+        self.btn_export = QPushButton("Export…")
+        self.btn_export.clicked.connect(self._choose_export_path)
+        for w in (self.lbl_export, self.export_progress, self.btn_cancel_export, self.btn_export):
+            nav.addWidget(w)
         root.addLayout(nav)
 
+    def _choose_export_path(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export สถิติ", "statistics.csv", "CSV (*.csv);;JSON Lines (*.jsonl)"
+        )
+        if path:
+            self.exportRequested.emit(path)
+
+    # ---------------- Export status ----------------
+    def show_export_started(self, path: str):
+        self.btn_export.setEnabled(False)
+        self.export_progress.setRange(0, 0)   # ยังไม่รู้จำนวนแถว → แถบวิ่ง
+        self.export_progress.show()
+        self.btn_cancel_export.setEnabled(True)
+        self.btn_cancel_export.show()
+        self.lbl_export.setText(f"กำลัง export → {path}")
+
+    def show_export_progress(self, done: int, total: int):
+        self.export_progress.setRange(0, max(total, 1))
+        self.export_progress.setValue(done)
+
+    def show_export_cancelling(self):
+        self.btn_cancel_export.setEnabled(False)
+        self.lbl_export.setText("กำลังยกเลิก…")
+
+    def show_export_finished(self, message: str):
+        self.btn_export.setEnabled(True)
+        self.export_progress.hide()
+        self.btn_cancel_export.hide()
+        self.lbl_export.setText(message)
+
     # ---------------- Render API ----------------
-    def render_summary(self, *, total_projects: int, total_success_pledges: int, total_rejected: int, mode_label: str = "-"):
+    @staticmethod
+    def _format_reasons(by_reason: dict) -> str:
+        if not by_reason:
+            return "—"
+        items = sorted(by_reason.items(), key=lambda kv: -kv[1])
+        return " · ".join(f"{REASON_LABELS.get(code, code)} {n}" for code, n in items)
+
+    def render_summary(self, *, total_projects: int, total_success_pledges: int, total_rejected: int, mode_label: str = "-", rejected_by_reason: dict = None):
         total_attempts = max(total_success_pledges + total_rejected, 1)
         rate = (total_success_pledges / total_attempts) * 100.0
         self.lbl_total_projects.setText(f"โครงการทั้งหมด: {total_projects}")
@@ -69,48 +145,110 @@ class StatisticsView(QWidget):
         self.lbl_rejected.setText(f"ถูกปฏิเสธ: {total_rejected}")
         self.lbl_success_rate.setText(f"อัตราสำเร็จ: {rate:.2f}%")
         self.lbl_mode.setText(f"โหมด: {mode_label}")
+        self.lbl_reject_reasons.setText(f"เหตุผลที่ถูกปฏิเสธ: {self._format_reasons(rejected_by_reason or {})}")
 
     def render_project_rows(self, projects):
         self.tbl.setRowCount(0)
+        self._row_of.clear()
 
         for p in projects:
-            goal = float(getattr(p, "goal_amount", 0.0))
-            raised = float(getattr(p, "raised_amount", 0.0))
-            pct = 0 if goal <= 0 else min(int((raised / goal) * 100), 100)
-
             r = self.tbl.rowCount()
             self.tbl.insertRow(r)
+            self._fill_row(r, p)
 
-            self.tbl.setItem(r, 0, QTableWidgetItem(str(getattr(p, "project_id", ""))))
-            self.tbl.setItem(r, 1, QTableWidgetItem(str(getattr(p, "name", ""))))
-            self.tbl.setItem(r, 2, QTableWidgetItem(f"{goal:.2f}"))
-            self.tbl.setItem(r, 3, QTableWidgetItem(f"{raised:.2f}"))
-            self.tbl.setItem(r, 4, QTableWidgetItem("✅" if bool(getattr(p, "funded", False)) else "—"))
-            self.tbl.setItem(r, 5, QTableWidgetItem(str(int(getattr(p, "success_count", 0)))))
-            self.tbl.setItem(r, 6, QTableWidgetItem(str(int(getattr(p, "rejected_count", 0)))))
-            self.tbl.setItem(r, 7, QTableWidgetItem(f"{pct:d}%"))
+        self.tbl.resizeColumnsToContents()
 
-            # ProgressBar ในคอลัมน์ 8
+    def update_project_rows(self, projects) -> bool:
+        """
+        patch เฉพาะแถวของโครงการที่ส่งมา — คืน False ถ้ามีโครงการที่ยังไม่อยู่ในตาราง
+        (ผู้เรียกควร render_project_rows() ใหม่ทั้งตาราง)
+        """
+        projects = list(projects)
+        if any(str(getattr(p, "project_id", "")) not in self._row_of for p in projects):
+            return False
+        for p in projects:
+            self._fill_row(self._row_of[str(p.project_id)], p)
+        return True
+
+    def _set_text(self, r: int, c: int, text: str):
+        item = self.tbl.item(r, c)
+        if item is None:
+            self.tbl.setItem(r, c, QTableWidgetItem(text))
+        elif item.text() != text:
+            item.setText(text)
+
+    def _fill_row(self, r: int, p):
+        goal = int(getattr(p, "goal_cents", 0))
+        raised = int(getattr(p, "raised_cents", 0))
+        pct = int(getattr(p, "percent", 0))   # คำนวณไว้แล้วในโมเดล (FundingState)
+
+        pid = str(getattr(p, "project_id", ""))
+        self._row_of[pid] = r
+        self._set_text(r, 0, pid)
+        self._set_text(r, 1, str(getattr(p, "name", "")))
+        self._set_text(r, 2, format_cents(goal))
+        self._set_text(r, 3, format_cents(raised))
+        self._set_text(r, 4, "✅" if bool(getattr(p, "funded", False)) else "—")
+        self._set_text(r, 5, str(int(getattr(p, "success_count", 0))))
+        self._set_text(r, 6, str(int(getattr(p, "rejected_count", 0))))
+        self.tbl.item(r, 6).setToolTip(self._format_reasons(getattr(p, "rejected_by_reason", None) or {}))
+        self._set_text(r, 7, f"{pct:d}%")
+
+        # ProgressBar ในคอลัมน์ 8 (ใช้ widget เดิมถ้ามีอยู่แล้ว)
+        bar = self.tbl.cellWidget(r, 8)
+        if bar is None:
             bar = QProgressBar()
             bar.setMinimum(0)
             bar.setMaximum(100)
-            bar.setValue(pct)
             bar.setAlignment(Qt.AlignCenter)
             self.tbl.setCellWidget(r, 8, bar)
-
-            # คอลัมน์ 9: Unlocked SG
-            unlocked = getattr(p, "unlocked_goals", None) or []
-            txt = " , ".join([str(x) for x in unlocked]) if unlocked else "—"
-            self.tbl.setItem(r, 9, QTableWidgetItem(txt))
-
-        self.tbl.resizeColumnsToContents()
-
-    def render(self, summary, per_project):
+        bar.setValue(pct)
+
+        # คอลัมน์ 9: Unlocked SG
+        unlocked = getattr(p, "unlocked_goals", None) or []
+        txt = " , ".join([str(x) for x in unlocked]) if unlocked else "—"
+        self._set_text(r, 9, txt)
+
+    @staticmethod
+    def _format_rank_value(mode: str, value: int) -> str:
+        if mode in (SORT_TRENDING_1H, SORT_TRENDING_24H):
+            return f"{value} pledges"
+        if mode == SORT_RAISED:
+            return format_cents(value)
+        if mode == SORT_CLOSEST_TO_GOAL:
+            return f"ขาด {format_cents(value)}"
+        if mode == SORT_DEADLINE:
+            return f"เหลือ {value} วัน"
+        return str(value)
+
+    def render_leaderboard(self, boards: dict):
+        """boards: โหมด (Model.ranking.SORT_*) -> [(project, ค่า)] เรียงอันดับแล้ว"""
+        t = self.tbl_leaderboard
+        t.setRowCount(max((len(v) for v in boards.values()), default=0))
+        t.setVerticalHeaderLabels([str(i + 1) for i in range(t.rowCount())])
+        for c, mode in enumerate(self._lb_modes):
+            ranked = boards.get(mode, [])
+            for r in range(t.rowCount()):
+                if r < len(ranked):
+                    p, value = ranked[r]
+                    text = f"{getattr(p, 'name', '')} · {self._format_rank_value(mode, value)}"
+                else:
+                    text = ""
+                item = t.item(r, c)
+                if item is None:
+                    t.setItem(r, c, QTableWidgetItem(text))
+                elif item.text() != text:
+                    item.setText(text)
+
+    def render(self, summary, per_project, leaderboard=None):
 
         self.render_summary(
             total_projects=int(summary["total_projects"]),
             total_success_pledges=int(summary["total_success_pledges"]),
             total_rejected=int(summary["total_rejected"]),
             mode_label=str(summary.get("mode_label", "-")),
+            rejected_by_reason=summary.get("rejected_by_reason", {}),
         )
-        self.render_project_rows(per_project)
\ No newline at end of file
+        self.render_project_rows(per_project)
+        if leaderboard is not None:
+            self.render_leaderboard(leaderboard)
\ No newline at end of file
@@ -1,12 +1,24 @@
 # main.py
 from PyQt5.QtWidgets import QApplication, QMessageBox
+import os
 import sys
+from pathlib import Path
 from View.app import MainWindow
+from View.diagnostics_overlay import DiagnosticsOverlay
 from Controller.project_controller import ProjectController
+from Controller.responsiveness_monitor import ResponsivenessMonitor
 
 def main():
     app = QApplication(sys.argv)
 
+    # ตัวเฝ้าดูการค้างของ UI (เปิดด้วย --monitor หรือ FUNDING_MONITOR=<ไฟล์ log>)
+    monitor = None
+    if "--monitor" in sys.argv or os.environ.get("FUNDING_MONITOR"):
+        log = os.environ.get("FUNDING_MONITOR", "")
+        monitor = ResponsivenessMonitor(Path(log if log not in ("", "1") else "responsiveness.log"))
+        monitor.start()
+        app.aboutToQuit.connect(monitor.stop)
+
     # กล่องถามโหมดตอนเริ่ม
     choice = QMessageBox.question(
         None, "เลือกโหมด",
@@ -18,6 +30,9 @@ def main():
     main_window = MainWindow()
     controller = ProjectController(main_window, mode=mode)
     main_window.set_controller(controller)
+    app.aboutToQuit.connect(controller.shutdown)
+    if monitor:
+        monitor.attach_overlay(DiagnosticsOverlay(main_window))   # F12 เปิด/ปิด
     main_window.show()
     sys.exit(app.exec_())
 
@@ -0,0 +1,63 @@
+# tests/conftest.py
+import builtins
+import io
+import os
+import shutil
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from PyQt5.QtWidgets import QApplication   # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """สำเนา CSV ใน Database/ ของ repo ไว้ใน tmp_path/Database แล้ว chdir ไปที่ tmp_path (controller ใช้ path แบบ relative)"""
+    db_dir = tmp_path / "Database"
+    db_dir.mkdir()
+    for src in (ROOT / "Database").glob("*.csv"):
+        shutil.copy(src, db_dir / src.name)
+    monkeypatch.chdir(tmp_path)
+    return db_dir
+
+
+@pytest.fixture
+def open_counts(monkeypatch):
+    """
+    นับการเปิดไฟล์ต่อชื่อไฟล์ (ผ่าน open / io.open / Path.open) — เรียก .clear() ก่อนช่วงที่ต้องการนับ
+    Path.open เรียก io.open ข้างในอีกที จึงกันไม่ให้นับซ้ำ
+    """
+    counts: Counter = Counter()
+    real_open, real_path_open = io.open, Path.open
+    inside = threading.local()
+
+    def counting_open(file, *args, **kwargs):
+        if not getattr(inside, "path_open", False) and isinstance(file, (str, bytes, os.PathLike)):
+            counts[Path(os.fsdecode(file)).name] += 1
+        return real_open(file, *args, **kwargs)
+
+    def counting_path_open(self, *args, **kwargs):
+        counts[self.name] += 1
+        inside.path_open = True
+        try:
+            return real_path_open(self, *args, **kwargs)
+        finally:
+            inside.path_open = False
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+    monkeypatch.setattr(io, "open", counting_open)
+    monkeypatch.setattr(Path, "open", counting_path_open)
+    return counts
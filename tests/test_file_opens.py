@@ -0,0 +1,68 @@
+# tests/test_file_opens.py
+# หน้าสถิติ / bulk query ต้องไม่วนเปิดไฟล์ต่อโครงการ: แต่ละไฟล์ถูกเปิดได้ไม่เกินหนึ่งครั้งต่อการเรียกหนึ่งครั้ง
+from datetime import datetime, time
+
+import pytest
+from PyQt5.QtTest import QTest
+
+from Model.basic_model import BasicFundingModel
+from Model.stretch_model import StretchGoalFundingModel
+
+MODELS = {"basic": BasicFundingModel, "stretch": StretchGoalFundingModel}
+
+
+def assert_opened_at_most_once(counts, what):
+    again = {name: n for name, n in counts.items() if n > 1}
+    assert not again, f"{what} เปิดไฟล์ซ้ำ: {again}"
+
+
+@pytest.mark.parametrize("mode", MODELS)
+def test_statistics_page_opens_each_file_once(qapp, db, open_counts, monkeypatch, mode):
+    from View.app import MainWindow
+    from Controller.project_controller import ProjectController
+
+    win = MainWindow()
+    controller = ProjectController(win, mode)
+    win.login_view.loginSubmitted.emit("alice", "pass123")
+
+    open_counts.clear()
+    controller.show_statistics()
+    assert_opened_at_most_once(open_counts, "show_statistics")
+    assert win.statistics_view.tbl.rowCount() == len(controller._model.list_projects()) > 0
+
+    # อยู่หน้าสถิติแล้วมี pledge เข้ามา → หน้าถูกอัปเดตจากการแจ้งเปลี่ยน ก็ต้องไม่วนเปิดไฟล์เช่นกัน
+    model = controller._model
+    proj = model.list_projects()[0]
+    model.add_pledge("OPEN-1", "U001", proj.project_id, 10, when=datetime.combine(proj.deadline, time()))
+    open_counts.clear()   # นับเฉพาะตอนหน้าสถิติอัปเดต (ไม่นับการเขียน pledge)
+    built = []
+    rows = controller._statistics_rows
+    monkeypatch.setattr(controller, "_statistics_rows", lambda ids=None: built.append(ids) or rows(ids))
+    QTest.qWait(50)
+    assert built == [{proj.project_id}]   # สร้างแถวเฉพาะโครงการที่เปลี่ยน
+
+    # สรุปรวม / leaderboard ตามมาตามรอบของตัวเอง
+    QTest.qWait(controller.STATS_SUMMARY_INTERVAL_MS + 100)
+    assert_opened_at_most_once(open_counts, "statistics refresh")
+    total = sum(model.pledge_counts_by_project().values())
+    assert win.statistics_view.lbl_success.text() == f"สำเร็จ (pledges): {total}"
+    controller.shutdown()
+
+
+@pytest.mark.parametrize("mode", MODELS)
+def test_bulk_queries_open_each_file_once(qapp, db, open_counts, mode):
+    model = MODELS[mode](db)
+    ids = [p.project_id for p in model.list_projects()]
+    queries = {
+        "list_projects": model.list_projects,
+        "get_projects": lambda: model.get_projects(ids),
+        "tiers_by_project": model.tiers_by_project,
+        "pledge_counts_by_project": model.pledge_counts_by_project,
+        "funding_states": model.funding_states,
+    }
+    if hasattr(model, "goals_by_project"):
+        queries["goals_by_project"] = model.goals_by_project
+    for name, query in queries.items():
+        open_counts.clear()
+        query()
+        assert_opened_at_most_once(open_counts, name)
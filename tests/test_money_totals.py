@@ -0,0 +1,93 @@
+# tests/test_money_totals.py
+# เงินเป็นสตางค์ (int) ทั้งระบบ: ยอดของโครงการต้องตรงกับผลรวม pledge ทุกสตางค์ ไม่ว่าจะรับยอดมาในรูปไหน
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from Model.basic_model import BasicFundingModel
+from Model.money import format_cents
+from Model.stretch_model import StretchGoalFundingModel, StretchGoalDTO
+
+MODELS = {"basic": BasicFundingModel, "stretch": StretchGoalFundingModel}
+PROJECTS = ("71000001", "71000002", "71000003")
+
+
+def random_amount(rng: random.Random):
+    """ยอด pledge แบบสุ่มเป็นสตางค์ ส่งเข้า add_pledge ในรูปต่าง ๆ ที่ to_cents รับได้"""
+    form = rng.choice(("str", "decimal", "float", "int"))
+    if form == "int":   # จำนวนเต็มบาท
+        baht = rng.randint(1, 5_000)
+        return baht * 100, baht
+    cents = rng.randint(1, 5_000_00)
+    if form == "str":
+        return cents, format_cents(cents)
+    if form == "decimal":
+        return cents, Decimal(cents) / 100
+    return cents, cents / 100
+
+
+def pledged_cents(model, project_id):
+    """ผลรวม pledge ของโครงการ อ่านผ่าน pledges_for_project"""
+    records = model.pledges_for_project(project_id, 0, model.pledge_count(project_id))
+    return sum(r.amount_cents for r in records)
+
+
+@pytest.mark.parametrize("seed", (1, 2, 3))
+@pytest.mark.parametrize("mode", MODELS)
+def test_random_pledges_match_to_the_cent(qapp, tmp_path, mode, seed):
+    rng = random.Random(seed)
+    model = MODELS[mode](tmp_path)   # ฐานข้อมูลว่าง: โมเดลสร้างไฟล์ + header เอง
+    errors = []
+    model.errorOccurred.connect(errors.append)
+    for pid in PROJECTS:
+        model.create_project(pid, f"Random {pid}", "1000", date.today() + timedelta(days=30))
+        if mode == "stretch":   # ให้การปลดล็อก SG เขียนไฟล์ระหว่างทางด้วย
+            model.add_stretch_goals(pid, [
+                StretchGoalDTO(pid, f"SG{n}", n * 50_000, f"Goal {n}", False) for n in (1, 2, 3)
+            ])
+
+    expected = dict.fromkeys(PROJECTS, 0)
+    for i in range(300):
+        pid = rng.choice(PROJECTS)
+        cents, amount = random_amount(rng)
+        model.add_pledge(f"RND{seed}-{i:04d}", f"U{rng.randint(1, 20):03d}", pid, amount, when=datetime.now())
+        expected[pid] += cents
+    assert errors == []
+
+    # อ่านใหม่จากไฟล์ แล้วเทียบยอดกับผลรวม pledge ที่บันทึกไว้
+    for m in (model, MODELS[mode](tmp_path)):
+        if m is model:
+            m.reload()
+        for pid in PROJECTS:
+            assert m.get_project(pid).raised_cents == expected[pid] == pledged_cents(m, pid)
+        if mode == "stretch":
+            for pid in PROJECTS:
+                raised = m.get_project(pid).raised_cents
+                assert all(g.unlocked == (raised >= g.threshold_cents) for g in m.goals_by_project()[pid])
+
+
+def test_stretch_goals_built_from_baht(qapp, tmp_path):
+    # StretchGoalDTO รับ threshold เป็นบาท (int / float / str / Decimal) แล้วเก็บเป็นสตางค์
+    pid = "72000001"
+    model = StretchGoalFundingModel(tmp_path)
+    errors = []
+    model.errorOccurred.connect(errors.append)
+    model.create_project(pid, "Baht goals", 100, date.today() + timedelta(days=30))
+    model.add_stretch_goals(pid, [
+        StretchGoalDTO(pid, "SG1", 150, "int", False),
+        StretchGoalDTO(pid, "SG2", 150.1, "float", False),
+        StretchGoalDTO(pid, "SG3", "150.25", "str", False),
+        StretchGoalDTO(pid, "SG4", Decimal("200.99"), "decimal", False),
+    ])
+    assert errors == []
+    expected = {"SG1": 150_00, "SG2": 150_10, "SG3": 150_25, "SG4": 200_99}
+
+    model.add_pledge("B1", "U001", pid, "150.10", when=datetime.now())
+    for m in (model, StretchGoalFundingModel(tmp_path)):
+        goals = {g.sg_id: g for g in m.goals_by_project()[pid]}
+        assert {sg: g.threshold_cents for sg, g in goals.items()} == expected
+        assert goals["SG3"].threshold_amount == 150.25
+        # ยอด 150.10 ถึง SG1, SG2 พอดีสตางค์ แต่ยังไม่ถึง SG3
+        assert {g.sg_id for g in m.unlocked_goals(pid)} == {"SG1", "SG2"}
@@ -0,0 +1,22 @@
+# tests/test_pledge_store.py
+# pledges.csv ใช้ user_id ของ users.csv รหัสเดียว: ข้อมูลเก่าแบบ "u-<username>" ถูกแปลงด้วย migrate ไม่ใช่แก้ไฟล์ด้วยมือ
+from Model.basic_model import BasicFundingModel
+from Model.pledge_store import main
+
+
+def test_migrate_maps_legacy_user_ids_through_users_csv(qapp, db):
+    before = BasicFundingModel(db)
+    assert before.user_pledge_summary("U001").pledge_count == 0
+    assert before.user_pledge_summary("u-alice").pledge_count == 3
+    totals = {p.project_id: p.raised_cents for p in before.list_projects()}
+
+    assert main(["migrate", str(db)]) == 0
+    assert main(["migrate", str(db)]) == 0   # รันซ้ำได้ ไม่มีอะไรเปลี่ยน
+
+    after = BasicFundingModel(db)
+    alice = after.user_pledge_summary("U001")
+    assert alice.pledge_count == 3 and alice.total_cents == 1500_00
+    assert after.user_pledge_summary("U002").pledge_count == 3
+    assert after.user_pledge_summary("u-alice").pledge_count == 0
+    assert after.user_pledge_summary("u-chan").pledge_count > 0   # ไม่มีบัญชีใน users.csv → คงไว้
+    assert {p.project_id: p.raised_cents for p in after.list_projects()} == totals
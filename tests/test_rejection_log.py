@@ -0,0 +1,70 @@
+# tests/test_rejection_log.py
+# log การปฏิเสธต้องไม่ทำเหตุการณ์หาย (ปิดกลางบรรทัด / รหัสมีอักขระพิเศษของ CSV)
+# และความผิดพลาดของระบบตอน add_pledge ต้องไม่ถูกนับเป็นการปฏิเสธ
+from datetime import datetime
+
+import pytest
+
+from Model.basic_model import BasicFundingModel
+from Model.rejection_log import RejectionLog, REASON_EXPIRED, REASON_UNKNOWN_PROJECT
+from Model.stretch_model import StretchGoalFundingModel
+
+MODELS = {"basic": BasicFundingModel, "stretch": StretchGoalFundingModel}
+
+
+def test_partial_trailing_line_is_dropped_before_next_record(tmp_path):
+    log = RejectionLog(tmp_path)
+    log.record("P1", REASON_EXPIRED)
+    with (tmp_path / RejectionLog.LOG_NAME).open("ab") as f:
+        f.write(b"1700000000,P1,exp")   # เขียนไม่ครบ ไม่มี \n
+
+    reopened = RejectionLog(tmp_path)
+    assert reopened.count("P1") == 1
+    reopened.record("P2", REASON_EXPIRED)
+
+    again = RejectionLog(tmp_path)
+    assert again.count("P1") == 1
+    assert again.count("P2") == 1
+
+
+def test_project_id_with_csv_characters_round_trips(tmp_path):
+    log = RejectionLog(tmp_path)
+    log.record('a,"b"', REASON_UNKNOWN_PROJECT)
+    log.record("x\ny", REASON_UNKNOWN_PROJECT)
+    log.record("P1", REASON_EXPIRED)
+
+    reopened = RejectionLog(tmp_path)
+    assert reopened.by_project() == log.by_project()
+    assert reopened.count('a,"b"') == 1
+    assert reopened.count("P1") == 1
+
+
+@pytest.mark.parametrize("mode", MODELS)
+def test_write_failure_is_rolled_back_and_not_counted(qapp, db, monkeypatch, mode):
+    model = MODELS[mode](db)
+    errors, rejected = [], []
+    model.errorOccurred.connect(errors.append)
+    model.pledgeRejected.connect(lambda pid, code: rejected.append(code))
+    pid = "12345678"
+    before = model.get_project(pid)
+    spent = model.user_pledge_summary("U001").total_cents
+    files = {name: (db / name).read_bytes() for name in ("pledges.csv", "project.csv", "reward_tiers.csv")}
+
+    def disk_full(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(model, "_update_tier_quota", disk_full)
+    model.add_pledge("IO-1", "U001", pid, 150, when=datetime(2025, 1, 1), reward_tier_id="T1")
+
+    assert errors == ["disk full"] and rejected == []
+    assert model.get_project(pid).rejected_count == before.rejected_count
+    assert model.rejections_by_reason().get(pid, {}) == {}
+    assert model.pledge_count(pid) == model.snapshot().pledge_counts.get(pid, 0)
+    assert model.user_pledge_summary("U001").total_cents == spent
+    assert {name: (db / name).read_bytes() for name in files} == files
+
+    monkeypatch.undo()
+    model.add_pledge("IO-2", "U001", pid, 150, when=datetime(2025, 1, 1), reward_tier_id="T1")
+    reopened = MODELS[mode](db)
+    assert reopened.get_project(pid).raised_cents == before.raised_cents + 150_00
+    assert [p.pledge_id for p in reopened.pledges_for_project(pid, limit=1)] == ["IO-2"]
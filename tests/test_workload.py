@@ -0,0 +1,22 @@
+# tests/test_workload.py
+# trace ที่บันทึกจากโปรแกรมจริง (FUNDING_TRACE) ต้องถูกปิดตอน shutdown โดยไม่ทำเหตุการณ์ที่บันทึกไว้หาย
+import json
+
+from Model.workload import TRACE_ENV, OP_NAVIGATE
+
+
+def test_shutdown_closes_trace(qapp, db, tmp_path, monkeypatch):
+    from View.app import MainWindow
+    from Controller.project_controller import ProjectController
+
+    trace = tmp_path / "trace.jsonl"
+    monkeypatch.setenv(TRACE_ENV, str(trace))
+    win = MainWindow()
+    controller = ProjectController(win, "basic")
+    win.login_view.loginSubmitted.emit("alice", "pass123")
+    controller.show_statistics()
+    controller.shutdown()
+
+    assert controller._trace._f.closed
+    events = [json.loads(line) for line in trace.read_text(encoding="utf-8").splitlines()]
+    assert any(e["op"] == OP_NAVIGATE and e["page"] == "stats" for e in events)